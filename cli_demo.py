@@ -6,6 +6,24 @@ CLI Demo
 import sys
 import argparse
 from src.research_agent_workflow import run_research_agent
+from src.utils.metrics_callback import format_metrics_summary
+
+
+def print_report_event(event: dict):
+    """
+    리포트 작성 중인 본문을 터미널에 이어서 출력합니다. (run_research_agent의 on_event 콜백)
+    """
+    kind = event.get("event")
+
+    if kind == "report_start":
+        title = "리포트 작성" if event.get("mode") == "write" else "리포트 수정"
+        print("\n" + "-" * 60)
+        print(f"✍️ {title} (v{event.get('version', 1)}) - 실시간 출력")
+        print("-" * 60)
+    elif kind == "report_chunk":
+        print(event.get("delta", ""), end="", flush=True)
+    elif kind == "report_end":
+        print(f"\n\n({event.get('length', 0):,}자 작성 완료)")
 
 
 def main():
@@ -25,6 +43,12 @@ def main():
         help="리서치 주제 (예: 'AI 기술 동향 2024')"
     )
 
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="리포트 본문을 실시간으로 출력하지 않음"
+    )
+
     parser.add_argument(
         "-i", "--interactive",
         action="store_true",
@@ -49,7 +73,9 @@ def main():
 
     # Agent 실행
     try:
-        result = run_research_agent(topic)
+        result = run_research_agent(
+            topic, on_event=None if args.no_stream else print_report_event
+        )
 
         # 결과 출력
         print("\n" + "=" * 60)
@@ -61,6 +87,15 @@ def main():
         print(f"🔍 검색 반복: {result.get('iteration_count', 0)}회")
         print(f"📚 수집된 자료: {len(result.get('search_results', []))}개")
 
+        # 노드별 LLM 호출/토큰/지연 시간, 검색 통계
+        if result.get("run_metrics"):
+            print("\n" + "=" * 60)
+            print("⏱️ 실행 메트릭")
+            print("=" * 60)
+            print(format_metrics_summary(result["run_metrics"]))
+            if result.get("metrics_path"):
+                print(f"📁 메트릭 파일: {result['metrics_path']}")
+
         # 리포트 미리보기 (첫 500자)
         print("\n" + "=" * 60)
         print("📄 리포트 미리보기")
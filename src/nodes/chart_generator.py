@@ -54,7 +54,7 @@ def extract_chart_data(state: ResearchState) -> Dict:
     }
 
   # Step 3: chart_data가 없으면 → 최초 1회 추출
-  llm = get_llm(temperature=0.1)
+  llm = get_llm(temperature=0.1, cache_node="chart")
 
   prompt = ChatPromptTemplate.from_messages([
     ("system", "당신은 리포트에서 시각화 가능한 수치 데이터를 추출하는 전문가입니다."),
@@ -1,15 +1,123 @@
 """
 Information Evaluator Node
 수집된 정보의 충분성을 평가하는 노드
+
+저비용 조건을 통과하면 결과를 묶음으로 나누어 병렬로 자료별 평가(map)를 받고,
+자료별 평가를 모아 한 번의 호출로 충분성과 부족한 정보를 판단(reduce)합니다.
+자료별 평가는 상태(source_reviews)에 보관되어, 이전 반복에서 평가한 자료는 다시 보내지 않습니다.
+
+저비용 조건과 LLM 평가 사이에서 로컬 커버리지 점수(coverage)로 분명한 경우를 먼저 판정하고,
+어떤 단계에서 판정했는지는 evaluation_decision에 기록합니다.
 """
 
 
+import os
 from ..research_state import ResearchState
 from ..utils.llm_config import get_llm
+from ..utils.domain_feedback import record_reviews
+from ..utils.source_reviews import review_key
+from ..utils.run_metrics import incr
+from ..utils.coverage import COVERAGE_PRECHECK, score_coverage, describe_gaps
+from ..utils.source_formatter import SOURCE_TOKEN_BUDGETS, pack_sources
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 import json
 
+# 저비용 사전 조건 (LLM 호출 전 판정)
+MIN_RESULTS = 6
+MIN_ITERATIONS = 2
+MIN_AVG_TRUST = 0.5
+HIGH_TRUST_SCORE = 0.7
+MIN_HIGH_TRUST = 2
+
+# Map-Reduce LLM 평가 설정
+# - EVALUATION_MAX_SOURCES: 평가할 최대 자료 수 (신뢰도 상위)
+# - EVALUATION_CHUNK_SIZE: map 호출 하나에 넣을 자료 수
+# - EVALUATION_MAX_CONCURRENCY: 동시에 실행할 map 호출 수
+EVALUATION_MAX_SOURCES = int(os.getenv("EVALUATION_MAX_SOURCES", "100"))
+EVALUATION_CHUNK_SIZE = int(os.getenv("EVALUATION_CHUNK_SIZE", "8"))
+EVALUATION_MAX_CONCURRENCY = int(os.getenv("EVALUATION_MAX_CONCURRENCY", "4"))
+
+# 묶음 하나에 넣을 본문 토큰 예산 (자료마다 가장 관련 있는 문단부터 채움)
+EVALUATION_CHUNK_BUDGET = SOURCE_TOKEN_BUDGETS["evaluator"]
+
+
+class EvidenceStats:
+    """
+    저비용 평가 조건에 필요한 통계 (결과 수, 신뢰도 합계, 고신뢰 출처 수)
+
+    결과가 하나씩 들어올 때마다 add / replace로 갱신할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.trust_sum = 0.0
+        self.high_trust_count = 0
+
+    @classmethod
+    def from_results(cls, results) -> "EvidenceStats":
+        stats = cls()
+        for result in results or []:
+            stats.add(result)
+        return stats
+
+    @property
+    def avg_trust(self) -> float:
+        return self.trust_sum / self.count if self.count else 0.0
+
+    def add(self, result: dict) -> None:
+        trust_score = result.get("trust_score", 0)
+        self.count += 1
+        self.trust_sum += trust_score
+        self.high_trust_count += trust_score >= HIGH_TRUST_SCORE
+
+    def remove(self, result: dict) -> None:
+        trust_score = result.get("trust_score", 0)
+        self.count -= 1
+        self.trust_sum -= trust_score
+        self.high_trust_count -= trust_score >= HIGH_TRUST_SCORE
+
+    def replace(self, old: dict, new: dict) -> None:
+        """중복 결과가 더 높은 신뢰도의 사본으로 교체된 경우"""
+        self.remove(old)
+        self.add(new)
+
+
+def check_cheap_gates(stats: EvidenceStats, iteration_count: int, pending_max_results: int = 0):
+    """
+    LLM 호출 없이 판정할 수 있는 "insufficient" 조건을 확인합니다.
+
+    Args:
+        stats: 현재까지의 결과 통계
+        iteration_count: 검색 반복 횟수
+        pending_max_results: 아직 끝나지 않은 검색이 추가할 수 있는 최대 결과 수
+            0보다 크면, 남은 결과가 모두 최고 신뢰도(1.0)로 들어와도
+            조건을 통과할 수 없는 경우에만 insufficient로 판정합니다. (조기 판정용)
+            남은 결과로 바뀌지 않는 반복 횟수 조건은 이때 확인하지 않습니다.
+
+    Returns:
+        insufficient 판정 dict, 조건을 모두 통과하면 None
+    """
+    pending = pending_max_results
+
+    if stats.count + pending < MIN_RESULTS:
+        return {"evaluation": "insufficient", "evaluation_reason": "검색 결과가 부족합니다."}
+
+    # 반복 횟수 조건만으로 조기 판정하면 남은 검색 결과를 버리게 되므로 모든 검색이 끝난 뒤에만 확인
+    if not pending and iteration_count < MIN_ITERATIONS:
+        return {"evaluation": "insufficient", "evaluation_reason": "반복 횟수가 부족합니다."}
+
+    # 남은 결과가 기존 결과를 더 높은 신뢰도로 교체할 수도 있으므로 결과 수는 늘지 않는다고 보고 상한 계산
+    avg_trust_upper = min((stats.trust_sum + pending) / stats.count, 1.0) if stats.count else 0.0
+    if avg_trust_upper < MIN_AVG_TRUST:
+        return {"evaluation": "insufficient", "evaluation_reason": "신뢰도가 부족합니다."}
+
+    if stats.high_trust_count + pending < MIN_HIGH_TRUST:
+        return {"evaluation": "insufficient", "evaluation_reason": "고신뢰 출처가 부족합니다."}
+
+    return None
+
+
 def evaluate_information(state: ResearchState) -> dict:
     """
     LLM이 수집된 정보가 리포트 작성에 충분한지 평가합니다.
@@ -19,73 +127,254 @@ def evaluate_information(state: ResearchState) -> dict:
     - 반복 횟수가 2회 이상
     - TOPIC과의 연관성
     """
+    decision, results, stats, trace = _prepare_evaluation(state)
+    if decision:
+        return decision
+    return {**evaluate_with_llm(state, results, stats), "evaluation_decision": trace}
+
+
+async def aevaluate_information(state: ResearchState) -> dict:
+    """
+    evaluate_information의 비동기 버전 (app.ainvoke / app.astream 실행 시 사용)
+    """
+    decision, results, stats, trace = _prepare_evaluation(state)
+    if decision:
+        return decision
+    return {**await aevaluate_with_llm(state, results, stats), "evaluation_decision": trace}
+
+
+def decision_trace(iteration_count: int, path: str, coverage: dict = None) -> dict:
+    """
+    판정 경로 기록 (state.evaluation_decision)
+
+    Args:
+        path: "cheap_gate", "coverage", "llm", "llm_speculative" 중 하나
+        coverage: 커버리지 점수와 임계값 (score_coverage 결과)
+    """
+    return {"iteration": iteration_count, "path": path, "coverage": coverage}
+
+
+def check_coverage(state: ResearchState, results: list) -> tuple:
+    """
+    로컬 커버리지 점수로 판정이 분명한 경우를 LLM 없이 판정합니다.
+
+    Returns:
+        (판정 dict 또는 None(LLM 평가 필요), 커버리지 기록 또는 None(비활성화))
+    """
+    if not COVERAGE_PRECHECK:
+        return None, None
+
+    coverage = score_coverage(state["topic"], results)
+    print(
+        f"  📐 커버리지: {coverage['score']:.2f} (주제 {coverage['topic']:.2f}, "
+        + ", ".join(f"{name} {value:.2f}" for name, value in coverage["aspects"].items())
+        + f") → {coverage['decision']}"
+    )
+
+    iteration_count = state.get("iteration_count", 0)
+    if coverage["decision"] == "sufficient":
+        incr("evaluator.coverage_decisions")
+        return {
+            "evaluation": "sufficient",
+            "evaluation_reason": f"주제와 리포트 구성 관점이 모두 자료로 뒷받침됩니다. (커버리지 {coverage['score']:.2f})",
+            "evaluation_decision": decision_trace(iteration_count, "coverage", coverage),
+        }, coverage
+
+    if coverage["decision"] == "insufficient":
+        incr("evaluator.coverage_decisions")
+        missing_info, recommended_keywords = describe_gaps(state["topic"], coverage["weak_aspects"])
+        return {
+            "evaluation": "insufficient",
+            "evaluation_reason": f"주제와 관련된 자료가 부족합니다. (커버리지 {coverage['score']:.2f})",
+            "missing_info": missing_info,
+            "recommended_keywords": recommended_keywords,
+            "evaluation_decision": decision_trace(iteration_count, "coverage", coverage),
+        }, coverage
+
+    return None, coverage
+
+
+def _prepare_evaluation(state: ResearchState) -> tuple:
+    """
+    저비용 조건과 커버리지를 확인하고 LLM 평가 대상(신뢰도 상위 EVALUATION_MAX_SOURCES개)을 고릅니다.
 
-    topic = state["topic"]
-    search_scope = state.get("search_scope", "")
+    Returns:
+        (LLM 없이 내린 판정 dict 또는 None, 평가 대상 결과, 전체 통계, 판정 경로 기록)
+    """
     search_results = state.get("search_results", [])
     iteration_count = state.get("iteration_count", 0)
     
     print(f"\n[Info Evaluator] 정보 충분성 평가 중... (반복: {iteration_count})")
 
-    # 평균 신뢰도 계산
+    stats = EvidenceStats.from_results(search_results)
     if search_results:
-        total = sum(r.get("trust_score", 0) for r in search_results)
-        avg_trust = total / len(search_results)
-        print(f"  평균 신뢰도: {avg_trust:.2f}")
-    else:
-        avg_trust = 0.0    
+        print(f"  평균 신뢰도: {stats.avg_trust:.2f}")
 
     # 최소 조건 체크
-    if len(search_results) < 6:
-        return { "evaluation": "insufficient", "evaluation_reason": "검색 결과가 부족합니다."}
+    gate = check_cheap_gates(stats, iteration_count)
+    if gate:
+        if gate["evaluation_reason"] == "신뢰도가 부족합니다.":
+            print(f"  평균 신뢰도 부족: {stats.avg_trust:.2f}")
+        elif gate["evaluation_reason"] == "고신뢰 출처가 부족합니다.":
+            print(f"  고신뢰 출처 부족: {stats.high_trust_count}개")
+        trace = decision_trace(iteration_count, "cheap_gate")
+        return {**gate, "evaluation_decision": trace}, [], stats, trace
+
+    results = list(search_results)[:EVALUATION_MAX_SOURCES]
+    decision, coverage = check_coverage(state, results)
+    if decision:
+        return decision, results, stats, decision["evaluation_decision"]
+
+    return None, results, stats, decision_trace(iteration_count, "llm", coverage)
 
-    if iteration_count < 2:
-        return { "evaluation": "insufficient", "evaluation_reason": "반복 횟수가 부족합니다."}
-    
-    if avg_trust < 0.5:
-      print(f"  평균 신뢰도 부족: {avg_trust:.2f}")
-      return { "evaluation": "insufficient", "evaluation_reason": "신뢰도가 부족합니다."}
-    
-    if high_trust_count := len([r for r in search_results if r.get("trust_score", 0) >= 0.7]) < 2:
-      print(f"  고신뢰 출처 부족: {high_trust_count}개")
-      return { "evaluation": "insufficient", "evaluation_reason": "고신뢰 출처가 부족합니다."}
-
-    # LLM 초기화 (내용 평가용)
-    llm = get_llm(temperature=0.3)
-
-    # 검색 결과 요약 후 LLM에게 평가 요청
-    results_summary = "\n".join(
-        f"[{index+1}] [신뢰도: {result.get('trust_score', 0):.2f}] {result.get('title', 'No Title')}\n"
-        f"{result.get('content', '')[:200]}..."
-        for index, result in enumerate(search_results[:10])
-    )
 
-    # 평가 프롬프트 작성
+# === Map: 자료 묶음별 평가 ===
+
+def _split_reviewed(state: ResearchState, results: list) -> tuple:
+    """
+    이전 반복에서 이미 평가한 자료와 새로 평가할 자료를 나눕니다.
+
+    Returns:
+        (새로 평가할 결과 목록, 재사용할 평가 dict {canonical URL: 평가})
+    """
+    source_reviews = state.get("source_reviews") or {}
+    pending, known = [], {}
+    for result in results:
+        key = review_key(result)
+        if key in source_reviews:
+            known[key] = source_reviews[key]
+        else:
+            pending.append(result)
+    return pending, known
+
+
+def _map_chain():
     prompt = ChatPromptTemplate.from_messages([
         ("system", "당신은 한국어와 영어 자료의 품질을 통합적으로 분석하는 글로벌 리서치 전문가입니다."
-            "수집된 자료가 주제에 대해 심층 리포트를 쓰기에 질적으로 충분한지 판단해주세요."
+            "각 자료가 주제에 대한 심층 리포트의 근거로 얼마나 쓸모 있는지 개별적으로 평가해주세요."
             "특히 기술적 세부 사항이나 글로벌 통계는 영어권 전문 출처(Nature, IEEE, TechCrunch 등)의 자료를 매우 높게 평가하십시오."),
         ("user", """
             주제: {topic}
             검색 범위: {search_scope}
-            수집된 검색 결과 ({search_count}개, 평균 신뢰도: {avg_trust}):{results_summary}
+            평가할 자료:
+            {results_summary}
 
-            위 정보를 바탕으로, 리포트 작성에 충분한지 평가해주세요.
-            
-            참고:
-            - 평균 신뢰도 {avg_trust} 는 이미 검증됨
-            - 고신뢰 출처(0.7+)를 주요 근거로 우선
-            - 중신뢰 출처(0.3~0.6)는 보조 자료로 활용
-            - 저신뢰 출처만 있으면 insufficient
+            각 자료를 평가해주세요.
 
-            먼저 각 자료를 간단히 평가해주세요. 
-            
             평가 항목:
             - 주제 관련성(relevance): high, medium, low
             - 구체적인 데이터의 유무(quality): high, medium, low
             - 한줄 평가(comment)
 
-            그런 다음, 전체적인 정보의 충분성을 판단해주세요.
+            다음 JSON 형식으로만 답변해주세요:
+            {{
+                "individual_reviews": [
+                    {{
+                        "index": 자료 번호,
+                        "relevance": "high/medium/low",
+                        "quality": "high/medium/low",
+                        "comment": "한줄 평가"
+                    }}
+                ]
+            }}
+        """)
+    ])
+    return prompt | get_llm(temperature=0.3, cache_node="evaluator")
+
+
+def _map_inputs(state: ResearchState, results: list) -> tuple:
+    """
+    평가 대상을 EVALUATION_CHUNK_SIZE개씩 나누어 묶음별 프롬프트 입력을 만듭니다.
+
+    Returns:
+        (묶음 목록, 묶음별 입력 목록)
+    """
+    chunks = [results[i:i + EVALUATION_CHUNK_SIZE] for i in range(0, len(results), EVALUATION_CHUNK_SIZE)]
+    inputs = []
+    for chunk in chunks:
+        # 자료 번호로 평가를 되돌려 받으므로 모든 자료가 최소 한 문단씩 들어가도록 cover_all 사용
+        packed = {id(result): passages for result, passages in
+                  pack_sources(chunk, EVALUATION_CHUNK_BUDGET, query=state["topic"], cover_all=True)}
+        inputs.append({
+            "topic": state["topic"],
+            "search_scope": state.get("search_scope", ""),
+            "results_summary": "\n".join(
+                f"[{index+1}] [신뢰도: {result.get('trust_score', 0):.2f}] {result.get('title', 'No Title')}\n"
+                f"{' … '.join(packed.get(id(result), []))}"
+                for index, result in enumerate(chunk)
+            ),
+        })
+    return chunks, inputs
+
+
+def _collect_reviews(state: ResearchState, chunks: list, responses: list) -> dict:
+    """
+    묶음별 응답에서 자료별 평가를 모아 canonical URL 기준 dict로 반환합니다.
+    실패한 묶음은 건너뜁니다.
+    """
+    reviews = {}
+    iteration_count = state.get("iteration_count", 0)
+
+    for chunk, response in zip(chunks, responses):
+        if isinstance(response, Exception):
+            print(f"  ⚠️ 자료 묶음 평가 실패: {response}")
+            continue
+        try:
+            individual_reviews = _parse_json(response).get("individual_reviews", [])
+        except Exception as e:
+            print(f"  ⚠️ 자료 묶음 평가 파싱 실패: {e}")
+            continue
+        if not isinstance(individual_reviews, list):
+            continue
+
+        for review in individual_reviews:
+            try:
+                position = int(review.get("index", 0)) - 1
+            except (AttributeError, TypeError, ValueError):
+                continue
+            # 0이나 음수 번호가 뒤쪽 자료로 잘못 연결되지 않도록 범위를 직접 확인
+            if not 0 <= position < len(chunk):
+                continue
+            result = chunk[position]
+            reviews[review_key(result)] = {
+                "title": result.get("title", ""),
+                "url": result.get("url", ""),
+                "trust_score": result.get("trust_score", 0),
+                "relevance": review.get("relevance"),
+                "quality": review.get("quality"),
+                "comment": review.get("comment", ""),
+                "iteration": iteration_count,
+            }
+
+        # 자료별 품질 평가를 도메인별 학습 신뢰도로 누적 (DOMAIN_FEEDBACK_ENABLED일 때 이후 검색의 신뢰도 점수에 반영)
+        try:
+            record_reviews(chunk, individual_reviews)
+        except Exception as e:
+            print(f"  ⚠️ 도메인 평가 기록 실패: {e}")
+
+    return reviews
+
+
+# === Reduce: 자료별 평가를 모아 충분성 판단 ===
+
+def _reduce_chain():
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "당신은 한국어와 영어 자료의 품질을 통합적으로 분석하는 글로벌 리서치 전문가입니다."
+            "자료별 평가 결과를 종합하여 주제에 대해 심층 리포트를 쓰기에 질적으로 충분한지 판단해주세요."
+            "특히 기술적 세부 사항이나 글로벌 통계는 영어권 전문 출처(Nature, IEEE, TechCrunch 등)의 자료를 매우 높게 평가하십시오."),
+        ("user", """
+            주제: {topic}
+            검색 범위: {search_scope}
+            수집된 검색 결과 ({search_count}개, 평균 신뢰도: {avg_trust}) 중 평가된 자료 {review_count}개:
+            {reviews_summary}
+
+            위 자료별 평가를 바탕으로, 리포트 작성에 충분한지 평가해주세요.
+            
+            참고:
+            - 평균 신뢰도 {avg_trust} 는 이미 검증됨
+            - 고신뢰 출처(0.7+)를 주요 근거로 우선
+            - 중신뢰 출처(0.3~0.6)는 보조 자료로 활용
+            - 저신뢰 출처만 있으면 insufficient
 
             평가 기준:
             1. 고신뢰 출처가 2개 이상인가?
@@ -96,14 +385,6 @@ def evaluate_information(state: ResearchState) -> dict:
 
             다음 JSON 형식으로만 답변해주세요:
             {{
-                "individual_reviews": [
-                    {{
-                        "index": 자료 번호 (1부터 시작),
-                        "relevance": "high/medium/low",
-                        "quality": "high/medium/low",
-                        "comment": "한줄 평가"
-                    }}
-                ],
                 "is_sufficient": true 또는 false,
                 "reason": "평가 이유",
                 "missing_info": "부족한 정보 (있다면)",
@@ -112,31 +393,59 @@ def evaluate_information(state: ResearchState) -> dict:
 
             중요: recommended_keywords는 반드시 배열(리스트) 형식으로 제공해주세요. 문자열이 아닙니다!
         """)
-        ])
-    
-    # 평가 실행
-    chain = prompt | llm
-    response = chain.invoke({
-        "topic": topic,
-        "search_scope": search_scope,
-        "results_summary": results_summary,
-        "search_count": len(search_results),
-        "avg_trust": f"{avg_trust:.2f}"
-        })
-    
-    # 응답 파싱
+    ])
+    return prompt | get_llm(temperature=0.3, cache_node="evaluator")
+
+
+def _reduce_inputs(state: ResearchState, results: list, reviews: dict, stats: EvidenceStats) -> dict:
+    """
+    평가 대상 결과 순서(신뢰도 순)대로 자료별 평가를 한 줄씩 요약합니다.
+    신뢰도는 평가 당시 값이 아닌 현재 결과의 값을 사용합니다.
+    """
+    ordered = [
+        (result, reviews[key])
+        for result in results
+        if (key := review_key(result)) in reviews
+    ]
+    reviews_summary = "\n".join(
+        f"[{index+1}] [신뢰도: {result.get('trust_score', 0):.2f}] "
+        f"[관련성: {review.get('relevance')}, 구체성: {review.get('quality')}] "
+        f"{result.get('title', 'No Title')} - {review.get('comment', '')}"
+        for index, (result, review) in enumerate(ordered)
+    )
+    return {
+        "topic": state["topic"],
+        "search_scope": state.get("search_scope", ""),
+        "search_count": stats.count,
+        "avg_trust": f"{stats.avg_trust:.2f}",
+        "review_count": len(ordered),
+        "reviews_summary": reviews_summary,
+    }
+
+
+def _parse_json(response) -> dict:
+    content = response.content if hasattr(response, 'content') else str(response)
+    # JSON 추출 (마크다운 코드블록 제거)
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0]
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0]
+    return json.loads(content.strip())
+
+
+def _finish_evaluation(state: ResearchState, response, reviews: dict, stats: EvidenceStats) -> dict:
+    """
+    reduce 응답을 파싱하여 노드 반환값을 만듭니다. 실패하면 기본 조건으로 판정합니다.
+    """
+    iteration_count = state.get("iteration_count", 0)
+
     try:
-        content = response.content if hasattr(response, 'content') else str(response)
-        # JSON 추출 (마크다운 코드블록 제거)
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0]
-        
-        evaluation = json.loads(content.strip())
+        if isinstance(response, Exception):
+            raise response
+
+        evaluation = _parse_json(response)
         is_sufficient = evaluation.get("is_sufficient", False)
         reason = evaluation.get("reason", "")
-        individual_reviews = evaluation.get("individual_reviews", "")
 
         # recommended_keywords 검증 및 변환
         recommended_keywords = evaluation.get("recommended_keywords", [])
@@ -148,7 +457,6 @@ def evaluate_information(state: ResearchState) -> dict:
             # 리스트도 문자열도 아닌 경우
             recommended_keywords = []
 
-        print(f"\n[자료별 평가]\n{individual_reviews}")
         print(f"\n[종합 평가]")
         print(f"  평가 결과: {'충분' if is_sufficient else '부족'}")
         print(f"  이유: {reason}")
@@ -161,37 +469,85 @@ def evaluate_information(state: ResearchState) -> dict:
             "evaluation": "sufficient" if is_sufficient else "insufficient",
             "evaluation_reason": reason,
             "missing_info": evaluation.get("missing_info"),
-            "recommended_keywords": recommended_keywords
+            "recommended_keywords": recommended_keywords,
+            "source_reviews": reviews,
         }
         
     except Exception as e:
         print(f"  ⚠️ 평가 실패: {e}")
         # 실패시 기본 로직으로 폴백
-        if len(search_results) >= 6 or iteration_count >= 3:
+        if stats.count >= MIN_RESULTS or iteration_count >= 3:
             return {
                 "evaluation": "sufficient",
-                "evaluation_reason": "기본 조건 충족"
+                "evaluation_reason": "기본 조건 충족",
+                "source_reviews": reviews,
             }
         else:
             return {
                 "evaluation": "insufficient", 
-                "evaluation_reason": "자료 부족"
+                "evaluation_reason": "자료 부족",
+                "source_reviews": reviews,
             }
 
-    # result_count = len(search_results)
 
-    # print(f"\n[Info Evaluator] 정보 충분성 평가 중...")
-    # print(f"  수집된 자료: {result_count}개")
-    # print(f"  반복 횟수: {iteration_count}회")
+def _report_split(pending: list, known: dict, chunks: list) -> None:
+    print(
+        f"  🧩 신규 자료 {len(pending)}개를 {len(chunks)}개 묶음으로 평가 "
+        f"(기존 평가 재사용 {len(known)}개, 동시 {EVALUATION_MAX_CONCURRENCY}개)"
+    )
+    incr("evaluator.new_reviews", len(pending))
+    incr("evaluator.reused_reviews", len(known))
+
+
+def evaluate_with_llm(state: ResearchState, results: list, stats: EvidenceStats) -> dict:
+    """
+    새 자료만 묶음으로 나누어 병렬로 자료별 평가(map)를 받고,
+    기존 평가와 합쳐 한 번의 호출로 충분성을 판단(reduce)합니다.
+
+    Args:
+        state: 현재 상태 (topic, search_scope, iteration_count, source_reviews 사용)
+        results: 평가할 결과 (신뢰도 순)
+        stats: 전체 결과 통계 (결과 수, 평균 신뢰도)
 
-    # # 조건 체크
-    # if result_count >= 6 or iteration_count >= 2:
-    #     print(f"  충분한 정보 수집 완료 → 리포트 생성")
-    # else:
-    #     print(f"  추가 검색 필요")
+    Returns:
+        evaluation, evaluation_reason, missing_info, recommended_keywords, source_reviews(이번에 평가한 자료)
+    """
+    pending, known = _split_reviewed(state, results)
+    chunks, inputs = _map_inputs(state, pending)
+    _report_split(pending, known, chunks)
 
-    # # State를 변경하지 않으므로 빈 dict 반환
-    # return {}
+    responses = _map_chain().batch(
+        inputs, config={"max_concurrency": EVALUATION_MAX_CONCURRENCY}, return_exceptions=True
+    ) if inputs else []
+    reviews = _collect_reviews(state, chunks, responses)
+    print(f"  📋 자료별 평가 {len(reviews)}건")
+
+    try:
+        response = _reduce_chain().invoke(_reduce_inputs(state, results, {**known, **reviews}, stats))
+    except Exception as e:
+        response = e
+    return _finish_evaluation(state, response, reviews, stats)
+
+
+async def aevaluate_with_llm(state: ResearchState, results: list, stats: EvidenceStats) -> dict:
+    """
+    evaluate_with_llm의 비동기 버전 (map 단계는 abatch로 실행)
+    """
+    pending, known = _split_reviewed(state, results)
+    chunks, inputs = _map_inputs(state, pending)
+    _report_split(pending, known, chunks)
+
+    responses = await _map_chain().abatch(
+        inputs, config={"max_concurrency": EVALUATION_MAX_CONCURRENCY}, return_exceptions=True
+    ) if inputs else []
+    reviews = _collect_reviews(state, chunks, responses)
+    print(f"  📋 자료별 평가 {len(reviews)}건")
+
+    try:
+        response = await _reduce_chain().ainvoke(_reduce_inputs(state, results, {**known, **reviews}, stats))
+    except Exception as e:
+        response = e
+    return _finish_evaluation(state, response, reviews, stats)
 
 
 def should_continue(state: ResearchState) -> str:
@@ -1,9 +1,123 @@
+import os
+import re
 from typing import Dict
+from langgraph.config import get_stream_writer
 from src.research_state import ResearchState
 from src.utils.llm_config import get_llm
-from src.utils.source_formatter import format_sources
+from src.utils.source_formatter import SOURCE_TOKEN_BUDGETS, format_sources
+from src.utils.passage_index import PASSAGE_INDEX, get_passage_index, format_evidence
+from src.utils.coverage import ASPECTS
 from langchain_core.prompts import ChatPromptTemplate
 
+# 리포트 본문을 토큰 단위로 스트리밍할지 여부 (false면 chain.invoke로 한 번에 생성)
+REPORT_STREAMING = os.getenv("REPORT_STREAMING", "true").lower() not in ("0", "false", "no")
+
+# 섹션/피드백 항목마다 프롬프트에 넣을 근거 문단 수
+PASSAGE_TOP_K = int(os.getenv("PASSAGE_TOP_K", "6"))
+FEEDBACK_TOP_K = 3
+MAX_FEEDBACK_ITEMS = 6
+
+# 본문 섹션(리포트 구성 가이드 1~4)과 근거 검색에 쓸 관점 (5. 참고 자료는 인용 자료 목록으로 대체)
+REPORT_SECTIONS = {
+    "ko": [("1. 개요 및 요약", "overview"), ("2. 주요 현황 및 데이터 분석", "data"),
+           ("3. 심층 사례 분석", "cases"), ("4. 시사점 및 결론", "outlook")],
+    "en": [("1. Executive Summary", "overview"), ("2. Key Trends & Data Analysis", "data"),
+           ("3. In-depth Case Studies", "cases"), ("4. Strategic Implications & Conclusion", "outlook")],
+}
+
+
+def _section_sources(search_results, topic: str, report_language: str) -> str:
+    """
+    리포트 섹션마다 관련 문단 top-k를 찾아 섹션별 근거로 정리합니다.
+    여러 섹션에 걸리는 문단은 점수가 가장 높은 섹션에만 넣고, 근거를 찾지 못하면 전체 자료 묶음을 사용합니다.
+    """
+    if PASSAGE_INDEX:
+        index = get_passage_index(search_results)
+        sections = REPORT_SECTIONS.get(report_language, REPORT_SECTIONS["ko"])
+        candidates = [
+            index.search(f"{topic} {heading} {ASPECTS[aspect]['terms']}", PASSAGE_TOP_K * 2)
+            for heading, aspect in sections
+        ]
+
+        # 문단별로 점수가 가장 높은 섹션 (같으면 앞 섹션)
+        best = {}
+        for section, passages in enumerate(candidates):
+            for item in passages:
+                key = (id(item["result"]), item["position"])
+                if key not in best or item["score"] > best[key][0]:
+                    best[key] = (item["score"], section)
+
+        groups = [
+            (heading, [item for item in passages if best[(id(item["result"]), item["position"])][1] == section][:PASSAGE_TOP_K])
+            for section, ((heading, _), passages) in enumerate(zip(sections, candidates))
+        ]
+
+        evidence = format_evidence(search_results, groups, SOURCE_TOKEN_BUDGETS["writer"])
+        if evidence:
+            return evidence
+
+    return format_sources(search_results, "writer", query=topic)
+
+
+def _feedback_sources(search_results, topic: str, review_feedback: str) -> str:
+    """
+    리뷰 피드백 항목(줄 단위, 한 줄이면 문장 단위)마다 관련 문단 top-k를 찾아 정리합니다.
+    항목만으로 찾지 못하면 주제를 붙여 다시 찾고, 그래도 없으면 전체 자료 묶음을 사용합니다.
+    """
+    if PASSAGE_INDEX:
+        items = [line.strip(" -*•\t") for line in review_feedback.splitlines() if line.strip(" -*•\t")]
+        if len(items) <= 1:
+            items = [sentence for sentence in re.split(r"(?<=[.!?])\s+", review_feedback.strip()) if sentence]
+
+        index = get_passage_index(search_results)
+        groups = [
+            (item, index.search(item, FEEDBACK_TOP_K) or index.search(f"{topic} {item}", FEEDBACK_TOP_K))
+            for item in items[:MAX_FEEDBACK_ITEMS]
+        ]
+
+        evidence = format_evidence(search_results, groups, SOURCE_TOKEN_BUDGETS["editor"])
+        if evidence:
+            return evidence
+
+    return format_sources(search_results, "editor", query=f"{topic} {review_feedback}")
+
+
+def _run_chain(chain, inputs: Dict, mode: str, revision_count: int) -> str:
+    """
+    체인을 실행하고 리포트 본문을 반환합니다.
+
+    스트리밍 모드에서는 chain.stream으로 받은 조각을 LangGraph custom 스트림 이벤트로 전달합니다.
+    (app.stream(..., stream_mode="custom")으로 구독하지 않으면 이벤트는 버려집니다)
+
+    이벤트 형식:
+        {"event": "report_start", "mode": "write" | "revise", "version": 1}
+        {"event": "report_chunk", "delta": "...", "version": 1}
+        {"event": "report_end", "length": 12345, "version": 1}
+    """
+    if not REPORT_STREAMING:
+        response = chain.invoke(inputs)
+        return response.content if hasattr(response, "content") else str(response)
+
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        # 그래프 밖에서 노드를 직접 호출한 경우
+        writer = lambda _: None
+
+    version = revision_count + 1
+    writer({"event": "report_start", "mode": mode, "version": version})
+
+    response = None
+    for chunk in chain.stream(inputs):
+        response = chunk if response is None else response + chunk
+        delta = chunk.text if hasattr(chunk, "text") else str(chunk)
+        if delta:
+            writer({"event": "report_chunk", "delta": delta, "version": version})
+
+    content = "" if response is None else (response.content if hasattr(response, "content") else str(response))
+    writer({"event": "report_end", "length": len(content), "version": version})
+    return content
+
 
 # 리포트 내용 생성 및 수정
 def generate_report_content(state: ResearchState) -> Dict:
@@ -20,13 +134,13 @@ def generate_report_content(state: ResearchState) -> Dict:
 
     llm = get_llm(usage="generator")
     
-    # 검색 결과 정리
-    sources = format_sources(search_results)
-    
     # 리뷰 기반 수정
     if review_status == "needs_revision" and review_feedback:
         print(f"  [수정] 리포트 수정 중... (언어: {report_language})")
 
+        # 피드백 항목별 근거 문단만 포함 (이전 리포트도 함께 보내므로 editor 예산 사용)
+        sources = _feedback_sources(search_results, topic, review_feedback)
+
         system_prompts_editor = {
           "ko": "당신은 전문적인 리서치 리포트를 한글로 수정하는 편집가입니다. 리뷰어의 피드백을 반영하여 리포트를 개선합니다.",
           "en": "You are a professional editor who revises research reports in English. Improve the report by incorporating reviewer feedback."
@@ -66,14 +180,13 @@ def generate_report_content(state: ResearchState) -> Dict:
         ])
 
         chain = prompt_template | llm
-        response = chain.invoke({
+        content = _run_chain(chain, {
             "previous_report": previous_report,
             "review_feedback": review_feedback,
             "sources": sources
-        })
+        }, "revise", state.get("revision_count", 0))
 
         # 수정된 리포트 내용 반환
-        content = response.content if hasattr(response, "content") else str(response)
 
         return {
             "final_report": content
@@ -82,6 +195,8 @@ def generate_report_content(state: ResearchState) -> Dict:
     # 신규 리포트 생성    
     else:
         print(f"  [생성] 새로운 리포트 작성 중... (언어: {report_language})")
+
+        sources = _section_sources(search_results, topic, report_language)
         
         system_prompts_writer = {
           "ko": ("당신은 전문적인 리서치 리포트를 한글로 작성하는 전문가입니다."
@@ -163,12 +278,10 @@ def generate_report_content(state: ResearchState) -> Dict:
         ])
 
         chain = prompt_template | llm
-        response = chain.invoke({
+        content = _run_chain(chain, {
             "topic": topic,
             "sources": sources
-        })
-
-        content = response.content if hasattr(response, "content") else str(response)
+        }, "write", state.get("revision_count", 0))
 
         return {
             "final_report": content
@@ -0,0 +1,362 @@
+"""
+Pipelined Search → Evaluate Node
+검색과 정보 평가를 하나의 노드에서 겹쳐 실행하는 노드
+
+쿼리별 검색이 끝날 때마다 결과를 미리보기 저장소에 반영하고 저비용 조건(결과 수,
+평균 신뢰도, 고신뢰 출처 수)을 갱신합니다.
+- 남은 검색 결과가 모두 들어와도 조건을 통과할 수 없으면 LLM 없이 insufficient 판정
+  (아직 시작하지 않은 검색만 취소하고 이미 요청한 검색은 끝까지 기다려 결과를 반영합니다.
+  취소한 쿼리는 다음 반복에서 다시 검색할 수 있도록 쿼리 기록에 넣지 않음)
+  반복 횟수 조건은 남은 결과로 바뀌지 않으므로 조기 판정에 사용하지 않습니다.
+- 가장 느린 쿼리 하나만 남았고 조건을 통과하면, 그 쿼리를 기다리는 동안 LLM 평가를 먼저 시작
+  (로컬 커버리지 점수로 판정이 분명하면 LLM 평가를 시작하지 않고 마지막 쿼리를 기다림)
+
+마지막 쿼리가 LLM 평가 대상(상위 결과)을 바꾸지 않았거나 평가가 이미 "충분"이면
+먼저 시작한 평가를 그대로 사용하고, 그렇지 않으면 다시 평가합니다.
+다시 평가할 때는 먼저 받은 자료별 평가를 재사용하므로 마지막 쿼리의 새 자료만 LLM에 보냅니다.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional
+from ..research_state import ResearchState
+from ..utils.result_store import ResultStore
+from ..utils.search_provider import get_search_provider
+from ..utils.run_metrics import incr
+from .web_searcher import (
+    _select_queries,
+    _record_history,
+    _plan_queries,
+    _merge_results,
+    _in_plan_order,
+    _search_single_query,
+    _asearch_single_query,
+)
+from .info_evaluator import (
+    EvidenceStats,
+    check_cheap_gates,
+    check_coverage,
+    decision_trace,
+    evaluate_information,
+    evaluate_with_llm,
+    aevaluate_with_llm,
+    EVALUATION_MAX_SOURCES,
+)
+
+
+# 노드별 동시 검색 수 (web_searcher와 동일)
+PARALLEL_SEARCHES = 5
+
+
+class _PipelineTracker:
+    """
+    완료된 쿼리 결과를 반영하면서 조기 판정/선행 평가 시점을 결정
+    """
+
+    def __init__(self, state: ResearchState, plans: List[Dict]):
+        self.state = state
+        self.plans = plans
+        self.iteration = state.get("iteration_count", 0)
+        self.pending = {plan["query"]: plan["max_results"] for plan in plans}
+
+        # 상태의 저장소는 reducer가 갱신하므로 복사본에 미리 반영
+        existing = state.get("search_results") or []
+        self.preview = existing.copy() if isinstance(existing, ResultStore) else ResultStore(existing)
+        self.stats = EvidenceStats.from_results(self.preview)
+        self.results_by_query: Dict[str, List[Dict]] = {}
+
+        self.decision: Optional[Dict] = None
+        self.speculative_window: Optional[List[Dict]] = None
+        self.speculative_coverage: Optional[Dict] = None
+
+        # LLM으로 다시 평가할 때 기록할 판정 경로 (resolve에서 설정)
+        self.trace: Dict = decision_trace(self.iteration, "llm")
+
+    def on_query_done(self, query: str, results: List[Dict]) -> Optional[str]:
+        """
+        쿼리 하나의 결과를 반영합니다.
+
+        Returns:
+            "early": LLM 없이 insufficient로 확정
+            "speculate": 남은 쿼리를 기다리지 않고 LLM 평가를 시작할 시점
+            None: 계속 대기
+        """
+        self.pending.pop(query, None)
+        self.results_by_query[query] = results
+
+        for result in results:
+            existing = self.preview.find(result)
+            if self.preview.add(result):
+                if existing is None:
+                    self.stats.add(result)
+                else:
+                    self.stats.replace(existing, result)
+
+        if self.decision is not None or self.speculative_window is not None or not self.pending:
+            return None
+
+        gate = check_cheap_gates(self.stats, self.iteration, sum(self.pending.values()))
+        if gate:
+            self.decision = {**gate, "evaluation_decision": decision_trace(self.iteration, "cheap_gate")}
+            print(f"  ⚡ 조기 판정: {gate['evaluation_reason']} (남은 쿼리 {len(self.pending)}개)")
+            incr("pipeline.early_decisions")
+            return "early"
+
+        if len(self.pending) == 1 and check_cheap_gates(self.stats, self.iteration) is None:
+            window = self.preview.top_n(EVALUATION_MAX_SOURCES)
+            # 커버리지로 판정이 분명하면 LLM 선행 평가를 시작하지 않음 (resolve에서 다시 확인)
+            coverage_decision, coverage = check_coverage(self.state, window)
+            if coverage_decision is not None:
+                return None
+
+            self.speculative_window = window
+            self.speculative_coverage = coverage
+            print(f"  ⚡ 마지막 쿼리 대기 중 평가 시작: '{next(iter(self.pending))}'")
+            return "speculate"
+
+        return None
+
+    @property
+    def collected(self) -> List[Dict]:
+        """상태에 반영할 결과 (완료 순서와 무관하게 검색 계획 순서)"""
+        return _in_plan_order(self.plans, self.results_by_query)
+
+    def resolve(self, speculative: Optional[Dict]) -> Optional[Dict]:
+        """
+        모든 검색이 끝난 뒤 최종 판정을 반환합니다.
+        LLM 평가를 다시 해야 하면 None을 반환합니다.
+        """
+        if self.decision is not None:
+            return self.decision
+
+        gate = check_cheap_gates(self.stats, self.iteration)
+        if gate:
+            gate = {**gate, "evaluation_decision": decision_trace(self.iteration, "cheap_gate")}
+            if speculative is not None:
+                incr("pipeline.speculative_discarded")
+                # 판정은 버려도 자료별 평가는 다음 반복에서 재사용
+                return {**gate, "source_reviews": speculative.get("source_reviews") or {}}
+            return gate
+
+        window = self.preview.top_n(EVALUATION_MAX_SOURCES)
+
+        if speculative is not None:
+            unchanged = [id(r) for r in window] == [id(r) for r in self.speculative_window]
+
+            if unchanged or speculative.get("evaluation") == "sufficient":
+                incr("pipeline.speculative_used")
+                return {
+                    **speculative,
+                    "evaluation_decision": decision_trace(self.iteration, "llm_speculative", self.speculative_coverage),
+                }
+
+        coverage_decision, coverage = check_coverage(self.state, window)
+        if coverage_decision is not None:
+            if speculative is not None:
+                incr("pipeline.speculative_discarded")
+            return self.merge_reviews(coverage_decision, speculative)
+
+        if speculative is not None:
+            print("  🔄 마지막 쿼리가 평가 대상을 바꾸어 다시 평가합니다.")
+            incr("pipeline.speculative_discarded")
+
+        self.trace = decision_trace(self.iteration, "llm", coverage)
+        return None
+
+    def reevaluation_state(self, speculative: Optional[Dict]) -> ResearchState:
+        """
+        다시 평가할 때 사용할 상태 (선행 평가에서 받은 자료별 평가를 포함하여 새 자료만 평가)
+        """
+        if not speculative or not speculative.get("source_reviews"):
+            return self.state
+        return {
+            **self.state,
+            "source_reviews": {**(self.state.get("source_reviews") or {}), **speculative["source_reviews"]},
+        }
+
+    @staticmethod
+    def merge_reviews(decision: Dict, speculative: Optional[Dict]) -> Dict:
+        """다시 평가한 판정에 선행 평가의 자료별 평가를 합쳐 반환"""
+        if not speculative or not speculative.get("source_reviews"):
+            return decision
+        return {
+            **decision,
+            "source_reviews": {**speculative["source_reviews"], **(decision.get("source_reviews") or {})},
+        }
+
+
+def _report_abandoned(abandoned: List[str]) -> None:
+    """조기 판정으로 시작 전에 취소한 쿼리 (검색하지 않았으므로 쿼리 기록에도 넣지 않음)"""
+    if abandoned:
+        print(f"  ⏹️ 남은 쿼리 {len(abandoned)}개 취소")
+        incr("pipeline.abandoned_queries", len(abandoned))
+
+
+def _fallback(state: ResearchState, history_update: Dict) -> Optional[Dict]:
+    """검색할 쿼리가 없으면 일반 평가만 수행"""
+    if not state.get("search_queries"):
+        print("[Web Searcher] 검색 쿼리가 없습니다.")
+        return evaluate_information(state)
+    return {**history_update, **evaluate_information(state)}
+
+
+def search_and_evaluate(state: ResearchState) -> dict:
+    """
+    검색 결과가 쿼리별로 도착하는 대로 평가를 진행하는 search + evaluate 노드
+    """
+    if not state.get("search_queries"):
+        return _fallback(state, {})
+
+    queries, history_update = _select_queries(state)
+    if not queries:
+        print("[Web Searcher] 새로 검색할 쿼리가 없습니다. (모두 중복)")
+        return _fallback(state, history_update)
+
+    print(f"\n[Search → Evaluate] 🚀 파이프라인 검색/평가 실행 중... ({len(queries)}개 쿼리)")
+    plans, plan_update = _plan_queries(state, queries)
+
+    provider = get_search_provider()
+    tracker = _PipelineTracker(state, plans)
+    speculative_future = None
+    searched = set()
+
+    # 선행 평가용 작업자 1개를 추가로 확보
+    executor = ThreadPoolExecutor(max_workers=min(len(plans), PARALLEL_SEARCHES) + 1)
+    try:
+        pending = {
+            executor.submit(contextvars.copy_context().run, _search_single_query, plan, provider): plan["query"]
+            for plan in plans
+        }
+
+        # 조기 판정 뒤에도 이미 시작한 검색은 비용이 들었으므로 끝까지 받아서 반영
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                query = pending.pop(future)
+                try:
+                    _, results, _, ok = future.result()
+                except Exception as e:
+                    print(f"    ⚠️ 쿼리 '{query}' 처리 실패: {e}")
+                    results, ok = [], False
+                if ok:
+                    searched.add(query)
+
+                signal = tracker.on_query_done(query, results)
+                if signal == "early":
+                    # 시작 전인 검색만 취소 (실행 중인 future는 cancel()이 실패)
+                    for waiting in [f for f in pending if f.cancel()]:
+                        del pending[waiting]
+                elif signal == "speculate":
+                    speculative_future = executor.submit(
+                        contextvars.copy_context().run,
+                        evaluate_with_llm,
+                        tracker.state,
+                        tracker.speculative_window,
+                        EvidenceStats.from_results(tracker.preview),
+                    )
+
+        speculative = speculative_future.result() if speculative_future else None
+
+    finally:
+        # 노드가 반환한 뒤에 검색 스레드가 남아 다음 노드와 섞이지 않도록 실행 중인 작업은 기다림
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    _report_abandoned(list(tracker.pending))
+    history_update = {**history_update, **_record_history(state, queries, searched)}
+
+    print(f"\n[Info Evaluator] 정보 충분성 평가 (반복: {tracker.iteration}, 평균 신뢰도: {tracker.stats.avg_trust:.2f})")
+    decision = tracker.resolve(speculative)
+    if decision is None:
+        decision = tracker.merge_reviews(evaluate_with_llm(
+            tracker.reevaluation_state(speculative), tracker.preview.top_n(EVALUATION_MAX_SOURCES), tracker.stats
+        ), speculative)
+        decision["evaluation_decision"] = tracker.trace
+
+    return {**_merge_results(state, tracker.collected), **history_update, **plan_update, **decision}
+
+
+async def asearch_and_evaluate(state: ResearchState) -> dict:
+    """
+    search_and_evaluate의 비동기 버전 (app.ainvoke / app.astream 실행 시 사용)
+    """
+    if not state.get("search_queries"):
+        return await asyncio.to_thread(_fallback, state, {})
+
+    queries, history_update = _select_queries(state)
+    if not queries:
+        print("[Web Searcher] 새로 검색할 쿼리가 없습니다. (모두 중복)")
+        return await asyncio.to_thread(_fallback, state, history_update)
+
+    print(f"\n[Search → Evaluate] 🚀 파이프라인 비동기 검색/평가 실행 중... ({len(queries)}개 쿼리)")
+    plans, plan_update = _plan_queries(state, queries)
+
+    provider = get_search_provider()
+    tracker = _PipelineTracker(state, plans)
+    speculative_task = None
+    searched = set()
+
+    # 동기 버전의 작업자 수와 같게 노드별 동시 검색 수를 제한하여, 조기 판정 시 시작 전인 검색을 구분
+    search_slots = asyncio.Semaphore(min(len(plans), PARALLEL_SEARCHES))
+    started = set()
+
+    async def search(plan: Dict) -> tuple:
+        async with search_slots:
+            started.add(plan["query"])
+            return await _asearch_single_query(plan, provider)
+
+    pending = {asyncio.ensure_future(search(plan)): plan["query"] for plan in plans}
+    cancelled = []
+
+    try:
+        # 조기 판정 뒤에도 이미 시작한 검색은 비용이 들었으므로 끝까지 받아서 반영
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                query = pending.pop(task)
+                try:
+                    _, results, _, ok = task.result()
+                except Exception as e:
+                    print(f"    ⚠️ 쿼리 '{query}' 처리 실패: {e}")
+                    results, ok = [], False
+                if ok:
+                    searched.add(query)
+
+                signal = tracker.on_query_done(query, results)
+                if signal == "early":
+                    # 시작 전인 검색만 취소
+                    for waiting in [t for t, q in pending.items() if q not in started]:
+                        del pending[waiting]
+                        waiting.cancel()
+                        cancelled.append(waiting)
+                elif signal == "speculate":
+                    speculative_task = asyncio.ensure_future(aevaluate_with_llm(
+                        tracker.state,
+                        tracker.speculative_window,
+                        EvidenceStats.from_results(tracker.preview),
+                    ))
+
+        speculative = await speculative_task if speculative_task else None
+
+    finally:
+        # 노드 자체가 취소된 경우에는 남은 작업도 취소하고, 취소가 끝날 때까지 기다려 작업이 남지 않게 함
+        leftovers = [*pending, *cancelled]
+        if speculative_task is not None and not speculative_task.done():
+            leftovers.append(speculative_task)
+        for task in leftovers:
+            task.cancel()
+        if leftovers:
+            await asyncio.gather(*leftovers, return_exceptions=True)
+
+    _report_abandoned(list(tracker.pending))
+    history_update = {**history_update, **_record_history(state, queries, searched)}
+
+    print(f"\n[Info Evaluator] 정보 충분성 평가 (반복: {tracker.iteration}, 평균 신뢰도: {tracker.stats.avg_trust:.2f})")
+    decision = tracker.resolve(speculative)
+    if decision is None:
+        decision = tracker.merge_reviews(await aevaluate_with_llm(
+            tracker.reevaluation_state(speculative), tracker.preview.top_n(EVALUATION_MAX_SOURCES), tracker.stats
+        ), speculative)
+        decision["evaluation_decision"] = tracker.trace
+
+    return {**_merge_results(state, tracker.collected), **history_update, **plan_update, **decision}
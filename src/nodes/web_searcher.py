@@ -3,10 +3,20 @@ Web Searcher Node
 웹 검색을 수행하는 노드
 """
 
+import asyncio
+import contextvars
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from ..research_state import ResearchState
-from ..utils.search_client import get_tavily_client
-from ..utils.domain_trust import get_domain_score
+from ..utils.search_client import get_tavily_pool_stats, asearch, search_with_resilience
+from ..utils.search_provider import get_search_provider
+from ..utils.domain_trust import score_urls
+from ..utils.search_cache import get_search_cache, make_search_cache_key
+from ..utils.query_dedup import filter_redundant_queries
+from ..utils.content_dedup import dedupe_results
+from ..utils.result_store import ResultStore, merge_search_results
+from ..utils.search_policy import plan_search
+from ..utils.resilience import CircuitOpenError
+from ..utils.run_metrics import get_run_metrics, incr
 
 EXCLUDE_DOMAINS = [
     "kmong.com",
@@ -19,99 +29,352 @@ EXCLUDE_DOMAINS = [
     "interpark.com",
 ]
 
-def _search_single_query(query: str, tavily) -> tuple:
+def _parse_response(response: dict) -> tuple:
+    """
+    Tavily 응답을 파싱하고 신뢰도 점수로 2차 필터링
+
+    Returns:
+        tuple: (results_list, filtered_count)
+    """
+    items = response.get("results", [])
+
+    # 응답 전체를 한 번에 점수화 (도메인 중복 조회 제거)
+    scores, _ = score_urls(item.get("url", "") for item in items)
+    keep = scores > 0.25
+    filtered_count = int((~keep).sum())
+
+    results = []
+    for item, trust_score, kept in zip(items, scores.tolist(), keep.tolist()):
+        if not kept:
+            print(f"   ⚠️ 2차 필터링: {item.get('url', '')} (점수: {trust_score})")
+            continue
+
+        results.append({
+            "title": item.get("title", ""),
+            "url": item.get("url", ""),
+            "content": item.get("content", ""),
+            "trust_score": trust_score
+        })
+
+    total = len(response.get('results', []))
+    collected = total - filtered_count
+    print(f"    → {total}개 검색, {collected}개 수집, {filtered_count}개 제외")
+
+    return results, filtered_count
+
+
+def _search_single_query(plan: dict, provider) -> tuple:
     """
     단일 쿼리를 검색하고 결과를 반환 (병렬 처리용)
 
+    Args:
+        plan: 검색 계획 {"query", "search_depth", "max_results", "reason"}
+
     Returns:
-        tuple: (query, results_list, filtered_count)
+        tuple: (query, results_list, filtered_count, searched)
+            searched: 검색이 실제로 응답했는지 여부 (실패/시간 초과/서킷 차단이면 False)
     """
-    print(f"  🔍 검색: {query}")
+    query = plan["query"]
+    print(f"  🔍 검색: {query} ({plan['search_depth']}, {plan['max_results']}개)")
     results = []
     filtered_count = 0
+    searched = False
 
     try:
-        # Tavily 검색 실행
-        response = tavily.search(
-            query=query,
-            max_results=3,
-            search_depth="advanced",
-            exclude_domains=EXCLUDE_DOMAINS
+        # 캐시 조회 (동일 쿼리 + 검색 옵션)
+        cache = get_search_cache() if provider.cacheable else None
+        cache_key = make_search_cache_key(
+            query, plan["max_results"], plan["search_depth"], EXCLUDE_DOMAINS, provider.name
         )
+        response = cache.get(cache_key) if cache else None
+
+        if response is not None:
+            print(f"    💾 캐시 사용: {query}")
+            incr("search.cache_hits")
+        else:
+            # 검색 실행 (Tavily 또는 로컬 제공자, 제한 시간/재시도/서킷 브레이커 적용)
+            response = search_with_resilience(
+                query=query,
+                client=provider,
+                max_results=plan["max_results"],
+                search_depth=plan["search_depth"],
+                exclude_domains=EXCLUDE_DOMAINS
+            )
+            if cache:
+                cache.set(cache_key, {"results": response.get("results", [])})
+
+        results, filtered_count = _parse_response(response)
+        searched = True
+
+    except CircuitOpenError:
+        print(f"    ⛔ 검색 차단 (서킷 열림): {query} → 기존 결과로 진행")
+    except TimeoutError:
+        print(f"    ⚠️ 검색 시간 초과: {query}")
+    except Exception as e:
+        print(f"    ⚠️ 검색 실패: {e}")
 
-        # 결과 파싱 및 필터링
-        for item in response.get("results", []):
-            url = item.get("url", "")
-            trust_score = get_domain_score(url)
+    return (query, results, filtered_count, searched)
 
-            if trust_score <= 0.25:
-                filtered_count += 1
-                print(f"   ⚠️ 2차 필터링: {url} (점수: {trust_score})")
-                continue
 
-            results.append({
-                "title": item.get("title", ""),
-                "url": item.get("url", ""),
-                "content": item.get("content", ""),
-                "trust_score": trust_score
-            })
+async def _asearch_single_query(plan: dict, provider) -> tuple:
+    """
+    단일 쿼리를 비동기로 검색 (전역 동시 실행 제한 + 요청별 타임아웃 적용)
+
+    Args:
+        plan: 검색 계획 {"query", "search_depth", "max_results", "reason"}
 
-        total = len(response.get('results', []))
-        collected = total - filtered_count
-        print(f"    → {total}개 검색, {collected}개 수집, {filtered_count}개 제외")
+    Returns:
+        tuple: (query, results_list, filtered_count, searched)
+    """
+    query = plan["query"]
+    print(f"  🔍 검색: {query} ({plan['search_depth']}, {plan['max_results']}개)")
+    results = []
+    filtered_count = 0
+    searched = False
 
+    try:
+        cache = get_search_cache() if provider.cacheable else None
+        cache_key = make_search_cache_key(
+            query, plan["max_results"], plan["search_depth"], EXCLUDE_DOMAINS, provider.name
+        )
+        response = cache.get(cache_key) if cache else None
+
+        if response is not None:
+            print(f"    💾 캐시 사용: {query}")
+            incr("search.cache_hits")
+        else:
+            response = await asearch(
+                query=query,
+                client=provider,
+                max_results=plan["max_results"],
+                search_depth=plan["search_depth"],
+                exclude_domains=EXCLUDE_DOMAINS
+            )
+            if cache:
+                cache.set(cache_key, {"results": response.get("results", [])})
+
+        results, filtered_count = _parse_response(response)
+        searched = True
+
+    except CircuitOpenError:
+        print(f"    ⛔ 검색 차단 (서킷 열림): {query} → 기존 결과로 진행")
+    except asyncio.TimeoutError:
+        print(f"    ⚠️ 검색 시간 초과: {query}")
     except Exception as e:
         print(f"    ⚠️ 검색 실패: {e}")
 
-    return (query, results, filtered_count)
+    return (query, results, filtered_count, searched)
+
+
+def _plan_queries(state: ResearchState, queries: list) -> tuple:
+    """
+    쿼리별 검색 깊이/결과 수를 결정하고 결정 내역을 기록
+
+    Returns:
+        tuple: (검색 계획 리스트, 상태 업데이트 dict)
+    """
+    iteration = state.get("iteration_count", 0)
+    plans = [plan_search(query, state) for query in queries]
+
+    print(f"  🧭 검색 계획 ({iteration}차)")
+    for plan in plans:
+        print(f"    - '{plan['query']}': {plan['search_depth']}, {plan['max_results']}개 ← {plan['reason']}")
+
+    plan_log = list(state.get("search_plans") or [])
+    plan_log.extend({"iteration": iteration, **plan} for plan in plans)
+
+    return plans, {"search_plans": plan_log}
+
+
+def _select_queries(state: ResearchState) -> tuple:
+    """
+    이전 반복에서 검색한 쿼리와 거의 같은 쿼리를 제외
+
+    쿼리 기록(query_history)은 검색이 끝난 뒤 _record_history로 갱신합니다.
+
+    Returns:
+        tuple: (검색할 쿼리 리스트, 상태 업데이트 dict(skipped_queries))
+    """
+    queries = state.get("search_queries", [])
+    history = state.get("query_history") or []
+    iteration = state.get("iteration_count", 0)
+
+    kept, skipped = filter_redundant_queries(queries, history)
+
+    if skipped:
+        print(f"  ⏭️ 중복 쿼리 {len(skipped)}개 제외 ({iteration}차)")
+        for item in skipped:
+            print(f"    - '{item['query']}' ≈ '{item['similar_to']}' (유사도: {item['similarity']})")
+
+    skipped_log = list(state.get("skipped_queries") or [])
+    skipped_log.append({
+        "iteration": iteration,
+        "skipped_count": len(skipped),
+        "skipped": skipped,
+    })
+
+    return kept, {"skipped_queries": skipped_log}
+
+
+def _record_history(state: ResearchState, queries: list, searched) -> dict:
+    """
+    검색이 실제로 응답한 쿼리만 쿼리 기록에 추가합니다. (쿼리 순서 유지)
+    실패/시간 초과/서킷 차단/취소된 쿼리는 다음 반복에서 다시 검색할 수 있도록 기록하지 않습니다.
+    """
+    history = state.get("query_history") or []
+    failed = [query for query in queries if query not in searched]
+    if failed:
+        print(f"  ↩️ 검색되지 않은 쿼리 {len(failed)}개는 기록하지 않음: {failed}")
+    return {"query_history": history + [query for query in queries if query in searched]}
+
+
+def _in_plan_order(plans: list, results_by_query: dict) -> list:
+    """
+    쿼리별 결과를 완료 순서가 아닌 검색 계획 순서로 이어 붙입니다.
+    (같은 신뢰도 결과의 순서와 프롬프트가 스레드 타이밍에 따라 달라지지 않도록 - 기록/재생 재현성)
+    """
+    return [result for plan in plans for result in results_by_query.get(plan["query"], [])]
+
+
+def _merge_results(state: ResearchState, new_results: list) -> dict:
+    """
+    이번 검색에서 새로 수집한 결과만 반환
+
+    기존 결과와의 병합, 중복 제거(URL 정규화 + SimHash), 신뢰도 정렬은
+    search_results reducer(ResultStore)가 새 항목만 삽입하는 방식으로 처리합니다.
+    """
+    # 배치 내부 중복은 미리 제거하여 상태로 넘기는 항목 수를 줄임
+    new_results = dedupe_results(new_results)
+
+    existing_results = state.get("search_results") or []
+    if isinstance(existing_results, ResultStore):
+        new_count = sum(1 for res in new_results if not existing_results.contains(res))
+    else:
+        new_count = len(new_results)
+
+    print(f"신규 검색 결과 {new_count}개 병합 (기존 {len(existing_results)}개)")
+
+    cache = get_search_cache()
+    if cache:
+        stats = cache.stats()
+        print(f"  💾 검색 캐시: 적중 {stats['hits']}회, 미스 {stats['misses']}회, 저장 {stats['size']}개")
+
+    pool_stats = get_tavily_pool_stats()
+    if pool_stats["requests"]:
+        print(f"  🔗 연결 재사용률: {pool_stats['connection_reuse_rate']:.0%} "
+              f"(요청 {pool_stats['requests']}회, 핸드셰이크 {pool_stats['handshakes']}회)")
+
+    metrics = get_run_metrics()
+    if metrics:
+        counters = metrics.summary()["counters"]
+        retries, timeouts = counters.get("search.retries", 0), counters.get("search.timeouts", 0)
+        if retries or timeouts:
+            print(f"  🔁 검색 재시도 {retries:.0f}회, 시간 초과 {timeouts:.0f}회 (누적)")
+
+    return {
+        "search_results": new_results
+    }
+
 
 def search_web(state: ResearchState) -> dict:
     """
     생성된 검색 쿼리로 웹 검색을 수행하고, 광고 및 신뢰도가 낮은 사이트를 필터링 (병렬 처리)
-    1단계: Tavily API에서 광고 도메인 제외
+    1단계: 검색 제공자(Tavily 등)에서 광고 도메인 제외
     2단계: score로 추가 필터링
     """
 
-    queries = state.get("search_queries", [])
+    if not state.get("search_queries"):
+        print("[Web Searcher] 검색 쿼리가 없습니다.")
+        return {}
+
+    queries, history_update = _select_queries(state)
 
     if not queries:
-        print("[Web Searcher] 검색 쿼리가 없습니다.")
-        return {"search_results": state.get("search_results", [])}
+        print("[Web Searcher] 새로 검색할 쿼리가 없습니다. (모두 중복)")
+        return history_update
 
     print(f"\n[Web Searcher] 🚀 병렬 웹 검색 실행 중... ({len(queries)}개 쿼리)")
+    plans, plan_update = _plan_queries(state, queries)
 
-    # Tavily 클라이언트 초기화
-    tavily = get_tavily_client()
-    all_results = []
+    # 검색 제공자 (기본값: Tavily, 프로세스 전역 연결 재사용)
+    provider = get_search_provider()
+    results_by_query = {}
+    searched = set()
 
     # 병렬 처리로 모든 쿼리 검색
     with ThreadPoolExecutor(max_workers=min(len(queries), 5)) as executor:
-        # 모든 쿼리를 동시에 제출
+        # 모든 쿼리를 동시에 제출 (실행 메트릭 contextvar를 작업 스레드로 전달)
         future_to_query = {
-            executor.submit(_search_single_query, query, tavily): query
-            for query in queries
+            executor.submit(contextvars.copy_context().run, _search_single_query, plan, provider): plan["query"]
+            for plan in plans
         }
 
         # 완료되는 대로 결과 수집
         for future in as_completed(future_to_query):
             try:
-                query, results, filtered_count = future.result()
-                all_results.extend(results)
+                query, results, filtered_count, ok = future.result()
+                results_by_query[query] = results
+                if ok:
+                    searched.add(query)
             except Exception as e:
                 query = future_to_query[future]
                 print(f"    ⚠️ 쿼리 '{query}' 처리 실패: {e}")
 
-    # 기존 결과와 병합 및 중복 제거
-    existing_results = state.get("search_results", [])
-    raw_merged = existing_results + all_results
-    unique_urls = {res['url'] : res for res in raw_merged}
-    merged_results = list(unique_urls.values())
-    merged_results.sort(key=lambda x: x.get("trust_score", 0), reverse=True)
+    all_results = _in_plan_order(plans, results_by_query)
+
+    return {
+        **_merge_results(state, all_results),
+        **history_update,
+        **_record_history(state, queries, searched),
+        **plan_update,
+    }
+
+
+async def asearch_web(state: ResearchState) -> dict:
+    """
+    search_web의 비동기 버전 (app.ainvoke / app.astream 실행 시 사용)
+
+    노드마다 스레드 풀을 만드는 대신, 프로세스 전역 검색 슬롯(search_client)을 공유하여
+    동시에 실행되는 여러 리서치 작업의 Tavily 요청 수를 함께 제한합니다.
+    """
+
+    if not state.get("search_queries"):
+        print("[Web Searcher] 검색 쿼리가 없습니다.")
+        return {}
+
+    queries, history_update = _select_queries(state)
+
+    if not queries:
+        print("[Web Searcher] 새로 검색할 쿼리가 없습니다. (모두 중복)")
+        return history_update
+
+    print(f"\n[Web Searcher] 🚀 비동기 웹 검색 실행 중... ({len(queries)}개 쿼리)")
+    plans, plan_update = _plan_queries(state, queries)
+
+    provider = get_search_provider()
+    all_results = []
+    searched = set()
+
+    # 노드가 취소되면 gather가 진행 중인 모든 검색 태스크를 함께 취소
+    outcomes = await asyncio.gather(
+        *(_asearch_single_query(plan, provider) for plan in plans),
+        return_exceptions=True
+    )
 
-    print(f"총 {len(merged_results)}개 검색 결과 정렬 및 병합 완료")
+    for query, outcome in zip(queries, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"    ⚠️ 쿼리 '{query}' 처리 실패: {outcome}")
+            continue
+        _, results, _, ok = outcome
+        all_results.extend(results)
+        if ok:
+            searched.add(query)
 
     return {
-        "search_results": merged_results
+        **_merge_results(state, all_results),
+        **history_update,
+        **_record_history(state, queries, searched),
+        **plan_update,
     }
 
 # 검증하기
@@ -129,8 +392,8 @@ if __name__ == "__main__":
           }
         ]
     }
-    final_state = search_web(test_state)
-    results = final_state.get("search_results", [])
+    update = search_web(test_state)
+    results = merge_search_results(test_state["search_results"], update.get("search_results"))
 
     print(f"최종 수집 결과: {len(results)}개")
 
@@ -3,22 +3,33 @@ Research Agent Workflow (LangGraph)
 메인 워크플로우를 정의하고 실행하는 모듈입니다.
 """
 
-from typing import Literal
+import os
+from typing import Callable, Dict, Literal, Optional
 from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableLambda
 from src.research_state import ResearchState
 from src.nodes.query_generator import generate_queries
-from src.nodes.web_searcher import search_web
-from src.nodes.info_evaluator import evaluate_information
+from src.nodes.web_searcher import search_web, asearch_web
+from src.nodes.info_evaluator import evaluate_information, aevaluate_information
+from src.nodes.search_evaluator import search_and_evaluate, asearch_and_evaluate
 from src.nodes.report_file_generator import generate_report_file
 from src.nodes.report_content_generator import generate_report_content
 from src.nodes.report_reviewer import review_report
 from src.nodes.chart_generator import extract_chart_data
+from src.utils.replay import use_cassette
+from src.utils.run_metrics import track_run_metrics, RunMetrics
+from src.utils.metrics_callback import MetricsCallbackHandler, write_metrics_summary
 
 
-def create_research_workflow() -> StateGraph:
+def create_research_workflow(pipelined: Optional[bool] = None) -> StateGraph:
     """
     LangGraph 워크플로우를 생성합니다.
 
+    Args:
+        pipelined: True면 search와 evaluate를 하나의 search_and_evaluate 노드로 합쳐,
+                   쿼리별 검색이 끝나는 대로 평가를 진행합니다.
+                   None이면 RESEARCH_PIPELINED_SEARCH 환경 변수를 따릅니다. (기본값: false)
+
     워크플로우 구조:
     1. generate_queries
     2. search
@@ -34,9 +45,21 @@ def create_research_workflow() -> StateGraph:
     workflow = StateGraph(ResearchState)
 
     # === 노드 추가 ===
+    if pipelined is None:
+        pipelined = os.getenv("RESEARCH_PIPELINED_SEARCH", "false").lower() in ("1", "true", "yes")
+
     workflow.add_node("generate_queries", generate_queries)
-    workflow.add_node("search", search_web)
-    workflow.add_node("evaluate", evaluate_information)
+    if pipelined:
+        workflow.add_node(
+            "search_and_evaluate",
+            RunnableLambda(search_and_evaluate, afunc=asearch_and_evaluate, name="search_and_evaluate"),
+        )
+    else:
+        # invoke/stream에서는 search_web, ainvoke/astream에서는 asearch_web 실행
+        workflow.add_node("search", RunnableLambda(search_web, afunc=asearch_web, name="search"))
+        workflow.add_node(
+            "evaluate", RunnableLambda(evaluate_information, afunc=aevaluate_information, name="evaluate")
+        )
     workflow.add_node("generate_report", generate_report_file)
     workflow.add_node("generate_report_content", generate_report_content)
     workflow.add_node("review_report", review_report)
@@ -47,11 +70,16 @@ def create_research_workflow() -> StateGraph:
     # 시작: generate_queries
     workflow.set_entry_point("generate_queries")
 
-    workflow.add_edge("generate_queries", "search")
-    workflow.add_edge("search", "evaluate")
+    if pipelined:
+        workflow.add_edge("generate_queries", "search_and_evaluate")
+        evaluate_node = "search_and_evaluate"
+    else:
+        workflow.add_edge("generate_queries", "search")
+        workflow.add_edge("search", "evaluate")
+        evaluate_node = "evaluate"
 
     # 검색 충분성 판단 분기
-    workflow.add_conditional_edges( "evaluate", should_continue_searching,  
+    workflow.add_conditional_edges( evaluate_node, should_continue_searching,  
       { "continue": "generate_queries", "finish": "generate_report_content", }
     )
 
@@ -114,28 +142,25 @@ def should_continue_searching(state: ResearchState) -> Literal["continue", "fini
     return "continue"
 
 
-def run_research_agent(topic: str, author: str = "김사원", report_language: str = "ko") -> dict:
+def create_initial_state(topic: str, author: str = "김사원", report_language: str = "ko") -> ResearchState:
     """
-    Research Agent를 실행합니다.
-
-    Args:
-        topic: 리서치 주제
-        report_language: 리포트 언어 ("ko" 또는 "en")
-
-    Returns:
-        최종 상태(State) 딕셔너리
+    워크플로우 실행을 위한 초기 상태를 생성합니다.
     """
 
-    # 초기 상태 설정
-    initial_state: ResearchState = {
+    return {
         "topic": topic,
         "author": author,
         "search_scope": None,
         "report_language": report_language,
         "search_queries": [],
+        "query_history": [],
+        "skipped_queries": [],
+        "search_plans": [],
         "search_results": [],
         "evaluation": None,
         "evaluation_reason": None,
+        "source_reviews": {},
+        "evaluation_decision": None,
         "iteration_count": 0,
         "final_report": None,
         "output_path": None,
@@ -145,14 +170,122 @@ def run_research_agent(topic: str, author: str = "김사원", report_language: s
         "review_status": None,
         "revision_count": 0,
         "chart_paths": [],
+        "run_metrics": None,
+        "metrics_path": None,
     }
 
+
+def _metrics_config(metrics: RunMetrics) -> dict:
+    """노드별 LLM 호출/노드 실행 시간을 기록하는 콜백을 포함한 실행 설정"""
+    return {"callbacks": [MetricsCallbackHandler(metrics)]}
+
+
+def _attach_run_metrics(final_state: dict, metrics: RunMetrics) -> dict:
+    """
+    실행 메트릭 요약을 최종 상태에 넣고, 리포트 옆(outputs/)에 JSON으로 저장합니다.
+    """
+    final_state["run_metrics"] = metrics.summary()
+    try:
+        final_state["metrics_path"] = write_metrics_summary(
+            final_state["run_metrics"], final_state.get("output_path"), final_state.get("topic", "")
+        )
+    except OSError as e:
+        print(f"⚠️ 실행 메트릭 저장 실패: {e}")
+    return final_state
+
+
+def run_research_agent(
+    topic: str,
+    author: str = "김사원",
+    report_language: str = "ko",
+    replay_mode: Optional[str] = None,
+    cassette_path: Optional[str] = None,
+    on_event: Optional[Callable[[Dict], None]] = None,
+) -> dict:
+    """
+    Research Agent를 실행합니다.
+
+    Args:
+        topic: 리서치 주제
+        report_language: 리포트 언어 ("ko" 또는 "en")
+        replay_mode: 검색/LLM 호출 기록 및 재생 모드 ("off", "record", "replay")
+                     None이면 REPLAY_MODE 환경 변수를 따름
+        cassette_path: 기록/재생에 사용할 카세트 파일 경로
+        on_event: 노드가 보내는 custom 스트림 이벤트(리포트 작성 조각 등)를 받을 콜백
+
+    Returns:
+        최종 상태(State) 딕셔너리
+    """
+
+    # 초기 상태 설정
+    initial_state = create_initial_state(topic, author, report_language)
+
     # 워크플로우 생성 및 컴파일
     workflow = create_research_workflow()
     app = workflow.compile()
 
-    final_state = app.invoke(initial_state)
-    return final_state
+    with use_cassette(replay_mode, cassette_path), track_run_metrics() as metrics:
+        if on_event is None:
+            final_state = app.invoke(initial_state, config=_metrics_config(metrics))
+        else:
+            # custom 이벤트는 콜백으로 전달하고, 마지막 values 이벤트를 최종 상태로 사용
+            final_state = None
+            for mode, payload in app.stream(
+                initial_state, config=_metrics_config(metrics), stream_mode=["custom", "values"]
+            ):
+                if mode == "custom":
+                    on_event(payload)
+                else:
+                    final_state = payload
+
+    # 실행 메트릭 (노드별 LLM 토큰/지연 시간, 검색 재시도/시간 초과/서킷 차단 횟수 등)
+    return _attach_run_metrics(final_state, metrics)
+
+
+async def arun_research_agent(
+    topic: str,
+    author: str = "김사원",
+    report_language: str = "ko",
+    replay_mode: Optional[str] = None,
+    cassette_path: Optional[str] = None,
+    on_event: Optional[Callable[[Dict], None]] = None,
+) -> dict:
+    """
+    Research Agent를 비동기로 실행합니다.
+
+    검색 노드가 비동기 경로(asearch_web)로 실행되어, 같은 이벤트 루프에서
+    동시에 실행되는 여러 리서치 작업이 하나의 Tavily 동시 요청 제한을 공유합니다.
+
+    Args:
+        topic: 리서치 주제
+        report_language: 리포트 언어 ("ko" 또는 "en")
+        replay_mode: 검색/LLM 호출 기록 및 재생 모드 ("off", "record", "replay")
+        cassette_path: 기록/재생에 사용할 카세트 파일 경로
+        on_event: 노드가 보내는 custom 스트림 이벤트(리포트 작성 조각 등)를 받을 콜백
+
+    Returns:
+        최종 상태(State) 딕셔너리
+    """
+
+    initial_state = create_initial_state(topic, author, report_language)
+
+    workflow = create_research_workflow()
+    app = workflow.compile()
+
+    with use_cassette(replay_mode, cassette_path), track_run_metrics() as metrics:
+        if on_event is None:
+            final_state = await app.ainvoke(initial_state, config=_metrics_config(metrics))
+        else:
+            final_state = None
+            async for mode, payload in app.astream(
+                initial_state, config=_metrics_config(metrics), stream_mode=["custom", "values"]
+            ):
+                if mode == "custom":
+                    on_event(payload)
+                else:
+                    final_state = payload
+
+    return _attach_run_metrics(final_state, metrics)
 
 
 # def detect_language(topic: str) -> Literal["ko", "en"]:
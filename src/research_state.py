@@ -3,7 +3,9 @@ Research State 정의
 LangGraph에서 사용할 상태(State) 스키마
 """
 
-from typing import TypedDict, List, Dict, Optional, Literal
+from typing import TypedDict, List, Dict, Optional, Literal, Annotated
+from .utils.result_store import merge_search_results
+from .utils.source_reviews import merge_source_reviews
 
 
 class ResearchState(TypedDict):
@@ -24,8 +26,20 @@ class ResearchState(TypedDict):
     # 생성된 검색 쿼리 리스트
     search_queries: List[str]
 
+    # 실제로 검색한 쿼리 이력 (반복 간 중복 쿼리 제외용)
+    query_history: List[str]
+
+    # 반복별 중복으로 제외된 쿼리 기록
+    # 형식: [{"iteration": 2, "skipped_count": 1, "skipped": [{"query", "similar_to", "similarity"}]}]
+    skipped_queries: List[Dict]
+
+    # 쿼리별 검색 깊이/결과 수 결정 기록 (적응형 검색 정책)
+    # 형식: [{"iteration", "query", "search_depth", "max_results", "reason"}]
+    search_plans: List[Dict]
+
     # 웹 검색 결과 (누적)
-    search_results: List[Dict[str, str]]
+    # 노드는 새 결과만 반환하고, reducer가 중복 제거 후 신뢰도 순으로 삽입 (ResultStore)
+    search_results: Annotated[List[Dict], merge_search_results]
 
     # 검색 반복 횟수 (무한 루프 방지)
     iteration_count: int
@@ -36,6 +50,14 @@ class ResearchState(TypedDict):
     # 리서치 결과 요약 및 평가
     evaluation: Optional[str]
     evaluation_reason: Optional[str]
+
+    # 자료별 LLM 평가 (canonical URL → 평가), 노드는 새로 평가한 자료만 반환
+    # 형식: {"https://...": {"title", "url", "trust_score", "relevance", "quality", "comment", "iteration"}}
+    source_reviews: Annotated[Dict[str, Dict], merge_source_reviews]
+
+    # 마지막 충분성 판정 경로 (저비용 조건 / 커버리지 / LLM)
+    # 형식: {"iteration": 2, "path": "coverage", "coverage": {"score", "topic", "aspects", "decision", "thresholds", ...}}
+    evaluation_decision: Optional[Dict]
     # source_reliability: Optional[str]
 
     # 출력 파일 경로 (PDF)
@@ -51,3 +73,10 @@ class ResearchState(TypedDict):
     review_feedback: Optional[str]
     review_status: Optional[str]  # "approved", "needs_revision", "error"
     revision_count: Optional[int]
+
+    # 실행 메트릭 요약 (run_research_agent 종료 시 기록)
+    # 형식: {"counters": {"search.retries": 1, "llm.evaluate.input_tokens": 1200, ...}, "timings": {...}}
+    run_metrics: Optional[Dict]
+
+    # 실행 메트릭 JSON 파일 경로 (리포트 옆 <이름>.metrics.json)
+    metrics_path: Optional[str]
@@ -0,0 +1,199 @@
+"""
+검색 결과 중복 제거
+URL 정규화와 본문 SimHash 지문으로 사실상 같은 문서를 하나로 합칩니다.
+
+- URL 변형: 모바일/데스크톱 호스트(m.blog vs blog), www, 추적 파라미터(utm_* 등), 프래그먼트
+- 본문 변형: 통신사 기사 전재, 미러 사이트 등 내용이 거의 같은 문서
+"""
+
+import hashlib
+import re
+from typing import Dict, Hashable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# 의미 없는 호스트 접두어 (모바일/데스크톱 변형)
+HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+# 추적용 쿼리 파라미터 (클릭 ID, 분석 도구 파라미터만)
+# ref, source, from 등은 사이트에 따라 다른 페이지를 가리키는 경우가 있어 제거하지 않음
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "ref_src", "spm", "_ga", "_gl", "yclid",
+}
+
+SIMHASH_BITS = 64
+
+# 해밍 거리가 이 값 이하이면 같은 문서로 간주
+SIMHASH_MAX_DISTANCE = 3
+
+# 지문 비교에 필요한 최소 토큰 수 (너무 짧은 스니펫은 URL로만 판별)
+SIMHASH_MIN_TOKENS = 8
+
+# 64비트를 16비트씩 4개 구간으로 나눔: 거리 3 이하인 두 지문은 적어도 한 구간이 일치
+_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    같은 문서를 가리키는 URL 변형들을 하나의 표준 URL로 변환합니다.
+    """
+    if not url:
+        return ""
+
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+
+    changed = True
+    while changed:
+        changed = False
+        for prefix in HOST_PREFIXES:
+            if host.startswith(prefix) and host.count(".") > 1:
+                host = host[len(prefix):]
+                changed = True
+
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+
+    path = parsed.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    # http/https는 같은 문서로 취급
+    return urlunparse(("https", host, path, "", urlencode(query), ""))
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    본문의 64비트 SimHash 지문을 계산합니다. (단어 2-gram 기준)
+    토큰이 너무 적으면 None을 반환합니다.
+    """
+    tokens = _tokens(text or "")
+    if len(tokens) < SIMHASH_MIN_TOKENS:
+        return None
+
+    weights = [0] * SIMHASH_BITS
+    for i in range(len(tokens) - 1):
+        feature = f"{tokens[i]} {tokens[i + 1]}".encode("utf-8")
+        value = int.from_bytes(hashlib.blake2b(feature, digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def fingerprint_result(result: Dict) -> Dict:
+    """
+    검색 결과에 canonical_url과 content_hash를 채워 반환합니다. (이미 있으면 재계산하지 않음)
+    """
+    if "canonical_url" not in result:
+        result["canonical_url"] = canonicalize_url(result.get("url", ""))
+    if "content_hash" not in result:
+        result["content_hash"] = simhash(result.get("content", ""))
+    return result
+
+
+class NearDuplicateIndex:
+    """
+    canonical_url과 SimHash 지문으로 중복 후보를 찾는 색인
+
+    지문을 구간(band)별로 색인하여 후보만 비교하므로 항목 수에 거의 선형으로 동작합니다.
+    항목은 호출자가 정한 키(key)로 식별합니다.
+    """
+
+    def __init__(self):
+        self._url_index: Dict[str, Hashable] = {}
+        self._band_index: List[Dict[int, List[Hashable]]] = [{} for _ in range(_BANDS)]
+        self._fingerprints: Dict[Hashable, Optional[int]] = {}
+
+    def find(self, result: Dict) -> Optional[Hashable]:
+        """중복으로 판단되는 기존 항목의 키를 반환합니다. 없으면 None."""
+        key = self._url_index.get(result["canonical_url"])
+        if key is not None:
+            return key
+
+        fingerprint = result["content_hash"]
+        if fingerprint is None:
+            return None
+
+        for band in range(_BANDS):
+            band_key = fingerprint >> (band * _BAND_BITS) & _BAND_MASK
+            for candidate in self._band_index[band].get(band_key, []):
+                other = self._fingerprints.get(candidate)
+                if other is not None and hamming_distance(fingerprint, other) <= SIMHASH_MAX_DISTANCE:
+                    return candidate
+        return None
+
+    def copy(self) -> "NearDuplicateIndex":
+        """독립적으로 갱신할 수 있는 복사본을 반환합니다."""
+        clone = NearDuplicateIndex()
+        clone._url_index = dict(self._url_index)
+        clone._band_index = [{band_key: list(keys) for band_key, keys in band.items()} for band in self._band_index]
+        clone._fingerprints = dict(self._fingerprints)
+        return clone
+
+    def add(self, result: Dict, key: Hashable) -> None:
+        """
+        항목을 색인합니다. 같은 키로 다시 추가하면 지문이 교체되고,
+        이전 URL은 계속 같은 키를 가리킵니다.
+        """
+        self._url_index[result["canonical_url"]] = key
+
+        fingerprint = result["content_hash"]
+        previous = self._fingerprints.get(key)
+        if fingerprint is None:
+            if previous is None:
+                self._fingerprints[key] = None
+            return
+
+        self._fingerprints[key] = fingerprint
+        for band in range(_BANDS):
+            band_key = fingerprint >> (band * _BAND_BITS) & _BAND_MASK
+            self._band_index[band].setdefault(band_key, []).append(key)
+
+
+def dedupe_results(results: List[Dict]) -> List[Dict]:
+    """
+    URL 변형과 본문 근접 중복을 제거합니다. 중복 그룹에서는 trust_score가 높은 쪽을 유지합니다.
+
+    Returns:
+        중복이 제거된 결과 리스트 (입력 순서 유지)
+    """
+    kept: List[Dict] = []
+    index = NearDuplicateIndex()
+
+    for result in results:
+        fingerprint_result(result)
+        duplicate = index.find(result)
+
+        if duplicate is None:
+            kept.append(result)
+            index.add(result, len(kept) - 1)
+            continue
+
+        # 더 신뢰도 높은 사본으로 교체
+        if result.get("trust_score", 0) > kept[duplicate].get("trust_score", 0):
+            kept[duplicate] = result
+            index.add(result, duplicate)
+
+    return kept
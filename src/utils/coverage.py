@@ -0,0 +1,168 @@
+"""
+정보 충분성 사전 판정 (커버리지 점수)
+주제와 리포트 구성 관점(개요, 데이터, 사례, 전망)이 수집된 자료에 얼마나 담겨 있는지를
+BM25 방식으로 로컬에서 계산합니다. 판정이 분명한 경우에는 LLM 평가를 건너뜁니다.
+
+- 자료 × 용어 빈도 행렬을 NumPy 배열로 만들어 한 번에 계산합니다.
+  (질의 용어만 열로 쓰므로 행렬이 작아 희소 행렬 없이 dense 배열로 충분합니다)
+- 용어별 BM25 tf 성분 s = min(tf·(k1+1) / (tf + k1·길이보정), 1)
+  (평균 길이 자료에 한 번 나오면 1, 긴 자료에 드물게 나오면 1보다 작음)
+- 주제 일치도: 주제 용어의 idf 가중 평균 s
+- 관점 일치도: 관점 용어 중 하나라도 나오면 높아지는 확률적 OR, 1 - Π(1 - s)
+- 관점 커버리지: 주제와 일치하는 자료의 (신뢰도 × 관점 일치도) 합을 ASPECT_TARGET으로 나눈 값 (최대 1)
+
+환경 변수:
+    COVERAGE_PRECHECK: "false"이면 사전 판정 비활성화 (기본값: true)
+    COVERAGE_SUFFICIENT: 이 값 이상이고 모든 관점이 절반 이상 채워지면 sufficient (기본값: 0.85)
+    COVERAGE_INSUFFICIENT: 이 값 이하이면 insufficient (기본값: 0.3)
+"""
+
+import os
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+from dotenv import load_dotenv
+
+from .text_tokenizer import tokenize
+
+load_dotenv()
+
+COVERAGE_PRECHECK = os.getenv("COVERAGE_PRECHECK", "true").lower() not in ("0", "false", "no")
+COVERAGE_SUFFICIENT = float(os.getenv("COVERAGE_SUFFICIENT", "0.85"))
+COVERAGE_INSUFFICIENT = float(os.getenv("COVERAGE_INSUFFICIENT", "0.3"))
+
+K1 = 1.5
+B = 0.75
+
+# 자료가 주제와 일치한다고 볼 최소 주제 일치도
+TOPIC_MATCH = 0.35
+
+# 관점 하나를 "다 채웠다"고 볼 (신뢰도 × 일치도) 합 (고신뢰 자료 2~3개 분량)
+ASPECT_TARGET = 2.0
+
+# sufficient 판정 시 모든 관점이 넘어야 하는 최소 커버리지
+MIN_ASPECT_COVERAGE = 0.5
+
+# 리포트 구성(report_content_generator)에 대응하는 관점과 판별 용어 (한국어/영어)
+ASPECTS = {
+    "overview": {
+        "label": "개요/배경",
+        "keyword": "개요",
+        "terms": "개요 정의 배경 의미 중요성 원리 overview definition background introduction concept",
+    },
+    "data": {
+        "label": "현황/데이터",
+        "keyword": "통계",
+        "terms": "현황 동향 통계 데이터 수치 시장 규모 성장률 점유율 trend statistics data market size growth share percent billion",
+    },
+    "cases": {
+        "label": "사례",
+        "keyword": "사례",
+        "terms": "사례 기업 기관 적용 도입 활용 프로젝트 case study company adoption deployment implementation example",
+    },
+    "outlook": {
+        "label": "시사점/전망",
+        "keyword": "전망",
+        "terms": "시사점 전망 과제 전략 한계 리스크 미래 outlook forecast future challenges strategy risk implications",
+    },
+}
+
+
+def _saturation(documents: List[List[str]], terms: List[str]) -> tuple:
+    """
+    자료 × 용어 BM25 tf 성분 행렬(0~1로 자름)과 용어별 idf 벡터를 반환합니다.
+    """
+    column = {term: index for index, term in enumerate(terms)}
+    tf = np.zeros((len(documents), len(terms)), dtype=np.float64)
+    lengths = np.zeros(len(documents), dtype=np.float64)
+
+    for row, tokens in enumerate(documents):
+        lengths[row] = len(tokens)
+        for term, frequency in Counter(tokens).items():
+            position = column.get(term)
+            if position is not None:
+                tf[row, position] = frequency
+
+    document_count = len(documents)
+    document_frequency = (tf > 0).sum(axis=0)
+    idf = np.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    length_norm = 1 - B + B * lengths / (lengths.mean() or 1.0)
+    saturation = np.minimum(tf * (K1 + 1) / (tf + K1 * length_norm[:, None]), 1.0)
+    return saturation, idf
+
+
+def score_coverage(topic: str, results: List[Dict]) -> Dict:
+    """
+    수집된 자료의 주제/관점 커버리지를 계산하고 판정합니다.
+
+    Args:
+        topic: 리서치 주제
+        results: 검색 결과 (title, content, trust_score 사용)
+
+    Returns:
+        {"score": 전체 커버리지(0~1), "topic": 주제 커버리지, "aspects": {관점: 커버리지},
+         "weak_aspects": [커버리지가 낮은 관점], "decision": "sufficient" | "insufficient" | "uncertain",
+         "thresholds": {...}}
+    """
+    thresholds = {"sufficient": COVERAGE_SUFFICIENT, "insufficient": COVERAGE_INSUFFICIENT}
+    topic_terms = sorted(set(tokenize(topic)))
+
+    if not results or not topic_terms:
+        return {"score": 0.0, "topic": 0.0, "aspects": {}, "weak_aspects": list(ASPECTS),
+                "decision": "insufficient" if not results else "uncertain", "thresholds": thresholds}
+
+    aspect_terms = {name: sorted(set(tokenize(aspect["terms"])) - set(topic_terms)) for name, aspect in ASPECTS.items()}
+    terms = topic_terms + sorted({term for values in aspect_terms.values() for term in values})
+    column = {term: index for index, term in enumerate(terms)}
+
+    documents = [tokenize(f"{result.get('title', '')} {result.get('content', '')}") for result in results]
+    trust = np.array([result.get("trust_score", 0.5) for result in results], dtype=np.float64)
+    saturation, idf = _saturation(documents, terms)
+
+    # 주제 일치도: 주제 용어의 idf 가중 평균
+    topic_columns = [column[term] for term in topic_terms]
+    topic_idf = idf[topic_columns]
+    topic_match = saturation[:, topic_columns] @ topic_idf / (topic_idf.sum() or 1.0)
+    on_topic = topic_match >= TOPIC_MATCH
+
+    # 관점 일치도: 관점 용어의 확률적 OR
+    coverage = {"topic": float(min((trust * topic_match).sum() / ASPECT_TARGET, 1.0))}
+    for name, values in aspect_terms.items():
+        columns = [column[term] for term in values]
+        aspect_match = 1 - np.exp(np.log1p(-np.minimum(saturation[:, columns], 0.999)).sum(axis=1))
+        coverage[name] = float(min((trust * aspect_match * on_topic).sum() / ASPECT_TARGET, 1.0))
+
+    score = float(np.mean(list(coverage.values())))
+    aspects = {name: round(coverage[name], 3) for name in ASPECTS}
+    weak_aspects = [name for name in ASPECTS if coverage[name] < MIN_ASPECT_COVERAGE]
+
+    if score >= COVERAGE_SUFFICIENT and not weak_aspects and coverage["topic"] >= MIN_ASPECT_COVERAGE:
+        decision = "sufficient"
+    elif score <= COVERAGE_INSUFFICIENT:
+        decision = "insufficient"
+    else:
+        decision = "uncertain"
+
+    return {
+        "score": round(score, 3),
+        "topic": round(coverage["topic"], 3),
+        "aspects": aspects,
+        "weak_aspects": weak_aspects,
+        "on_topic_sources": int(on_topic.sum()),
+        "decision": decision,
+        "thresholds": thresholds,
+    }
+
+
+def describe_gaps(topic: str, weak_aspects: List[str]) -> tuple:
+    """
+    커버리지가 낮은 관점으로 missing_info 문장과 추천 키워드를 만듭니다.
+
+    Returns:
+        (missing_info, recommended_keywords)
+    """
+    names = weak_aspects or list(ASPECTS)
+    missing_info = "자료가 부족한 관점: " + ", ".join(ASPECTS[name]["label"] for name in names)
+    return missing_info, [f"{topic} {ASPECTS[name]['keyword']}" for name in names]
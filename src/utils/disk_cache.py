@@ -0,0 +1,127 @@
+"""
+SQLite 기반 디스크 캐시
+TTL 만료와 크기 제한(LRU) 퇴출을 지원하는 간단한 키-값 캐시입니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class DiskCache:
+    """
+    JSON 직렬화 가능한 값을 SQLite 파일에 저장하는 캐시
+
+    - ttl_seconds가 지난 항목은 조회 시 만료 처리됩니다.
+    - max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+    - 같은 파일을 여러 프로세스가 공유할 수 있습니다 (WAL 모드).
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 86400, max_entries: int = 5000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed_at)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        캐시에서 값을 조회합니다. 없거나 만료되었으면 None을 반환합니다.
+        """
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self._misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self._hits += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        값을 저장하고, 최대 크기를 넘으면 LRU 순서로 퇴출합니다.
+        """
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+
+            count = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE key IN ("
+                    " SELECT key FROM cache_entries ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._evictions += overflow
+
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """모든 항목을 삭제합니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        현재 프로세스 기준 적중/미스 카운터와 저장된 항목 수를 반환합니다.
+        """
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": size,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,224 @@
+"""
+도메인별 학습 신뢰도 (Domain Feedback)
+정보 평가 LLM이 자료마다 매긴 quality 평가를 도메인별로 누적하여,
+규칙 기반 점수(domain_trust)에 데이터 기반 보정값으로 반영합니다.
+
+relevance는 주제에 따라 달라지는 값이므로 반영하지 않습니다.
+(한 주제에서 관련 없던 도메인이 다른 주제에서 불이익을 받지 않도록)
+학습 점수를 쓰면 같은 입력이라도 실행마다 결과가 달라질 수 있으므로 명시적으로 켠 경우에만 사용합니다.
+
+- 평가는 반감기(half-life) 지수 감쇠 가중 평균으로 집계되어 최근 평가일수록 크게 반영됩니다.
+- 평가가 쌓일수록(가중치 합이 클수록) 규칙 점수보다 학습 점수 쪽으로 이동하며,
+  반영 비율은 최대 DOMAIN_FEEDBACK_MAX_BLEND까지로 제한됩니다.
+
+환경 변수:
+    DOMAIN_FEEDBACK_ENABLED: "true"이면 활성화 (기본값: false)
+    DOMAIN_FEEDBACK_PATH: SQLite 파일 경로 (기본값: .cache/domain_feedback.sqlite3)
+    DOMAIN_FEEDBACK_HALF_LIFE_DAYS: 평가 반감기(일) (기본값: 30)
+    DOMAIN_FEEDBACK_MAX_BLEND: 학습 점수 최대 반영 비율 (기본값: 0.6)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from .replay import get_cassette
+
+load_dotenv()
+
+# LLM 평가 등급 → 점수
+RATING_SCORES = {"high": 1.0, "medium": 0.5, "low": 0.0}
+
+# 가중치 합이 이 값일 때 최대 반영 비율의 절반만큼 반영
+PRIOR_STRENGTH = 2.0
+
+# 메모리 사본을 디스크에서 다시 읽는 주기(초) (다른 프로세스의 기록 반영)
+REFRESH_INTERVAL = 30.0
+
+
+def review_score(review: Dict) -> Optional[float]:
+    """
+    individual_reviews 항목 하나의 quality 등급을 0~1 점수로 변환합니다. 등급이 없으면 None.
+    (relevance는 주제별 값이므로 도메인 신뢰도에 섞지 않음)
+    """
+    return RATING_SCORES.get(str(review.get("quality", "")).strip().lower())
+
+
+class DomainFeedbackStore:
+    """
+    도메인별 감쇠 가중 평균 평가 점수를 SQLite에 저장합니다.
+
+    조회는 주기적으로 갱신되는 메모리 사본에서 수행하므로 검색 결과마다 디스크를 읽지 않습니다.
+    """
+
+    def __init__(self, path: str, half_life_days: float = 30.0, max_blend: float = 0.6):
+        self.path = path
+        self.half_life = half_life_days * 86400
+        self.max_blend = max_blend
+
+        self._lock = threading.Lock()
+        self._rows: Dict[str, Tuple[float, float, float]] = {}
+        self._loaded_at = 0.0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            # 이전 버전의 domain_feedback 테이블은 relevance가 섞인 점수라 읽지 않음
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS domain_quality ("
+                " domain TEXT PRIMARY KEY,"
+                " weighted_sum REAL NOT NULL,"
+                " weight REAL NOT NULL,"
+                " review_count INTEGER NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def _decay(self, age_seconds: float) -> float:
+        return 0.5 ** (max(age_seconds, 0.0) / self.half_life) if self.half_life > 0 else 1.0
+
+    def record(self, domain: str, score: float, now: Optional[float] = None) -> None:
+        """도메인에 평가 점수 하나를 반영합니다."""
+        self.record_many([(domain, score)], now)
+
+    def record_many(self, ratings: List[Tuple[str, float]], now: Optional[float] = None) -> None:
+        """
+        (도메인, 점수) 목록을 한 트랜잭션으로 반영합니다.
+        """
+        now = now or time.time()
+
+        with self._lock:
+            for domain, score in ratings:
+                row = self._conn.execute(
+                    "SELECT weighted_sum, weight, review_count, updated_at FROM domain_quality WHERE domain = ?",
+                    (domain,),
+                ).fetchone()
+
+                if row is None:
+                    weighted_sum, weight, review_count = score, 1.0, 1
+                else:
+                    decay = self._decay(now - row[3])
+                    weighted_sum = row[0] * decay + score
+                    weight = row[1] * decay + 1.0
+                    review_count = row[2] + 1
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO domain_quality"
+                    " (domain, weighted_sum, weight, review_count, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (domain, weighted_sum, weight, review_count, now),
+                )
+                self._rows[domain] = (weighted_sum, weight, now)
+            self._conn.commit()
+
+    def _refresh(self) -> None:
+        if time.monotonic() - self._loaded_at < REFRESH_INTERVAL:
+            return
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT domain, weighted_sum, weight, updated_at FROM domain_quality"
+            ).fetchall()
+            self._rows = {domain: (weighted_sum, weight, updated_at) for domain, weighted_sum, weight, updated_at in rows}
+            self._loaded_at = time.monotonic()
+
+    def learned_score(self, domain: str) -> Optional[Tuple[float, float]]:
+        """
+        도메인의 (학습 점수, 현재 시점 기준 감쇠된 가중치 합)을 반환합니다. 평가가 없으면 None.
+        """
+        self._refresh()
+        row = self._rows.get(domain)
+        if row is None:
+            return None
+
+        weighted_sum, weight, updated_at = row
+        return weighted_sum / weight, weight * self._decay(time.time() - updated_at)
+
+    def blend(self, domain: str, rule_score: float) -> float:
+        """
+        규칙 점수에 학습 점수를 섞은 값을 반환합니다.
+        """
+        learned = self.learned_score(domain)
+        if learned is None:
+            return rule_score
+
+        score, weight = learned
+        blend = self.max_blend * weight / (weight + PRIOR_STRENGTH)
+        return round((1 - blend) * rule_score + blend * score, 4)
+
+    def stats(self) -> Dict:
+        self._refresh()
+        return {"domains": len(self._rows)}
+
+
+_store: Optional[DomainFeedbackStore] = None
+_store_lock = threading.Lock()
+
+
+def get_domain_feedback_store() -> Optional[DomainFeedbackStore]:
+    """
+    프로세스 전역 도메인 평가 저장소를 반환합니다. 비활성화된 경우 None을 반환합니다.
+
+    기록/재생 모드에서는 실행 결과가 재현되도록 학습 점수를 읽거나 기록하지 않습니다.
+    """
+    global _store
+
+    if os.getenv("DOMAIN_FEEDBACK_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return None
+
+    if get_cassette() is not None:
+        return None
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DomainFeedbackStore(
+                    path=os.getenv("DOMAIN_FEEDBACK_PATH", ".cache/domain_feedback.sqlite3"),
+                    half_life_days=float(os.getenv("DOMAIN_FEEDBACK_HALF_LIFE_DAYS", "30")),
+                    max_blend=float(os.getenv("DOMAIN_FEEDBACK_MAX_BLEND", "0.6")),
+                )
+    return _store
+
+
+def record_reviews(window: List[Dict], individual_reviews) -> int:
+    """
+    정보 평가 LLM의 individual_reviews 중 quality 등급을 도메인별로 기록합니다.
+
+    Args:
+        window: LLM에게 보여준 결과 목록 (review의 index는 1부터 시작)
+        individual_reviews: [{"index", "relevance", "quality", "comment"}, ...]
+
+    Returns:
+        기록한 평가 수
+    """
+    store = get_domain_feedback_store()
+    if store is None or not isinstance(individual_reviews, list):
+        return 0
+
+    # 순환 import 방지 (domain_trust가 이 모듈을 사용)
+    from .domain_trust import extract_domain
+
+    ratings = []
+    for review in individual_reviews:
+        if not isinstance(review, dict):
+            continue
+        try:
+            position = int(review.get("index", 0)) - 1
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= position < len(window):
+            continue
+
+        score = review_score(review)
+        domain = extract_domain(window[position].get("url", ""))
+        if score is not None and domain:
+            ratings.append((domain, score))
+
+    if ratings:
+        store.record_many(ratings)
+    return len(ratings)
@@ -0,0 +1,204 @@
+"""
+도메인 신뢰도 규칙 파일과 바이너리 스냅샷
+규칙 테이블을 코드 밖의 파일(JSON/YAML/CSV)로 관리하고, 조회용 바이너리 스냅샷으로 컴파일합니다.
+
+스냅샷은 정렬된 접미사 키 + 점수 배열로 이루어져 mmap으로 열어 이진 탐색하므로,
+여러 워커 프로세스가 파일을 다시 파싱하지 않고 운영체제 페이지 캐시의 한 사본을 공유합니다.
+스냅샷은 임시 파일에 쓴 뒤 os.replace로 교체하므로 읽는 쪽은 항상 완전한 파일만 봅니다.
+
+규칙 파일 형식:
+    JSON / YAML:
+        {"domain_scores": {"nature.com": 0.9, ".edu": 1.0, "blog": 0.3},
+         "ad_keywords": ["shop", "coupon"]}
+    CSV (헤더 필수):
+        kind,pattern,score
+        domain,nature.com,0.9
+        ad,coupon,
+"""
+
+import csv
+import json
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+# magic, 형식 버전, 예약, 원본 mtime_ns, 원본 크기, 접미사 규칙 수, 키 영역 길이, 메타데이터 길이
+_HEADER = struct.Struct("<4sHHqqIII")
+_MAGIC = b"DTS1"
+_VERSION = 1
+
+
+def load_rules(path: str) -> Tuple[Dict[str, float], List[str]]:
+    """
+    규칙 파일을 읽습니다. 확장자로 형식을 판단합니다. (.json, .yaml/.yml, .csv)
+
+    Returns:
+        (domain_scores, ad_keywords)
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".csv":
+        domain_scores, ad_keywords = {}, []
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                kind = (row.get("kind") or "").strip().lower()
+                pattern = (row.get("pattern") or "").strip()
+                if not pattern:
+                    continue
+                if kind == "ad":
+                    ad_keywords.append(pattern)
+                elif kind == "domain":
+                    domain_scores[pattern] = float(row["score"])
+                else:
+                    raise ValueError(f"알 수 없는 규칙 종류입니다: {kind} ({path})")
+        return _validate(domain_scores, ad_keywords, path)
+
+    with open(path, encoding="utf-8") as f:
+        if extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("YAML 규칙 파일을 읽으려면 PyYAML이 필요합니다: pip install pyyaml") from e
+            data = yaml.safe_load(f) or {}
+        elif extension == ".json":
+            data = json.load(f)
+        else:
+            raise ValueError(f"지원하지 않는 규칙 파일 형식입니다: {path}")
+
+    return _validate(data.get("domain_scores") or {}, data.get("ad_keywords") or [], path)
+
+
+def _validate(domain_scores: Dict, ad_keywords: List, path: str) -> Tuple[Dict[str, float], List[str]]:
+    scores = {}
+    for rule, score in domain_scores.items():
+        score = float(score)
+        if not 0.0 <= score <= 1.0:
+            raise ValueError(f"신뢰도 점수는 0~1 범위여야 합니다: {rule}={score} ({path})")
+        scores[str(rule).strip().lower()] = score
+    return scores, [str(keyword).lower() for keyword in ad_keywords if keyword]
+
+
+def suffix_key(rule: str) -> str:
+    """접미사 규칙을 뒤집은 라벨 키로 변환합니다. ("news.naver.com" → "com.naver.news")"""
+    return ".".join(reversed([label for label in rule.lower().split(".") if label]))
+
+
+def write_snapshot(domain_scores: Dict[str, float], ad_keywords: List[str], snapshot_path: str,
+                   source_mtime_ns: int = 0, source_size: int = 0) -> None:
+    """
+    규칙을 바이너리 스냅샷으로 컴파일하여 원자적으로 저장합니다.
+    """
+    suffix_rules = {}
+    keyword_scores = {}
+    for rule, score in domain_scores.items():
+        if "." in rule:
+            suffix_rules[suffix_key(rule).encode("utf-8")] = score
+        elif rule:
+            keyword_scores[rule] = score
+
+    keys = sorted(suffix_rules)
+    blob = b"".join(keys)
+    offsets = [0]
+    for key in keys:
+        offsets.append(offsets[-1] + len(key))
+
+    meta = json.dumps({"keyword_scores": keyword_scores, "ad_keywords": ad_keywords}, ensure_ascii=False).encode("utf-8")
+
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".domain_trust_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, 0, source_mtime_ns, source_size, len(keys), len(blob), len(meta)))
+            f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+            f.write(struct.pack(f"<{len(keys)}d", *(suffix_rules[key] for key in keys)))
+            f.write(blob)
+            f.write(meta)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, snapshot_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class RulesSnapshot:
+    """
+    mmap으로 연 규칙 스냅샷 (읽기 전용)
+    """
+
+    def __init__(self, snapshot_path: str):
+        self.path = snapshot_path
+
+        with open(snapshot_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, mtime_ns, size, count, blob_length, meta_length = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"도메인 신뢰도 스냅샷 형식이 아닙니다: {snapshot_path}")
+
+        self.source_mtime_ns = mtime_ns
+        self.source_size = size
+        self.count = count
+
+        self._offsets_at = _HEADER.size
+        self._scores_at = self._offsets_at + 4 * (count + 1)
+        self._blob_at = self._scores_at + 8 * count
+        meta_at = self._blob_at + blob_length
+
+        meta = json.loads(self._mm[meta_at:meta_at + meta_length].decode("utf-8"))
+        self.keyword_scores: Dict[str, float] = meta["keyword_scores"]
+        self.ad_keywords: List[str] = meta["ad_keywords"]
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """스냅샷이 현재 규칙 파일로 만들어졌는지 확인합니다."""
+        return self.source_mtime_ns == stat.st_mtime_ns and self.source_size == stat.st_size
+
+    def _key(self, position: int) -> bytes:
+        start, end = struct.unpack_from("<II", self._mm, self._offsets_at + 4 * position)
+        return self._mm[self._blob_at + start:self._blob_at + end]
+
+    def suffix_score(self, key: str) -> Optional[float]:
+        """
+        뒤집은 라벨 키("com.naver")의 점수를 이진 탐색으로 찾습니다. 없으면 None.
+        """
+        target = key.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.count and self._key(low) == target:
+            return struct.unpack_from("<d", self._mm, self._scores_at + 8 * low)[0]
+        return None
+
+
+def default_snapshot_path(rules_path: str) -> str:
+    return os.getenv("DOMAIN_TRUST_SNAPSHOT") or rules_path + ".snapshot"
+
+
+def load_snapshot(rules_path: str, snapshot_path: Optional[str] = None) -> RulesSnapshot:
+    """
+    규칙 파일의 스냅샷을 엽니다. 스냅샷이 없거나 규칙 파일보다 오래되었으면 다시 컴파일합니다.
+    """
+    snapshot_path = snapshot_path or default_snapshot_path(rules_path)
+    stat = os.stat(rules_path)
+
+    if os.path.exists(snapshot_path):
+        try:
+            snapshot = RulesSnapshot(snapshot_path)
+            if snapshot.matches(stat):
+                return snapshot
+        except (ValueError, struct.error):
+            pass
+
+    domain_scores, ad_keywords = load_rules(rules_path)
+    write_snapshot(domain_scores, ad_keywords, snapshot_path, stat.st_mtime_ns, stat.st_size)
+    print(f"  🗂️ 도메인 신뢰도 스냅샷 생성: {snapshot_path} (규칙 {len(domain_scores)}개)")
+    return RulesSnapshot(snapshot_path)
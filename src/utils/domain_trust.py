@@ -1,5 +1,41 @@
+"""
+도메인 신뢰도 점수
+규칙 테이블(DOMAIN_SCORES)을 색인으로 컴파일하여 URL의 신뢰도를 계산합니다.
+
+규칙 종류:
+- 점이 있는 규칙 ("naver.com", "go.kr", ".edu"): 라벨 단위 접미사 일치
+  → 뒤집은 라벨 트라이(suffix trie)로 조회
+- 점이 없는 규칙 ("blog"): 도메인 라벨에 포함된 키워드
+  → 하나의 정규식으로 조회
+
+여러 규칙이 일치하면 가장 깊은(왼쪽) 라벨까지 일치한 규칙이 우선합니다.
+(예: "news.naver.com" 0.8 > "naver.com" 0.6, "blog.naver.com"의 "blog" 0.3 > "naver.com" 0.6)
+같은 깊이면 접미사 규칙, 그다음 더 긴 키워드가 우선하므로 규칙 순서와 무관하게 결과가 같습니다.
+
+환경 변수:
+    DOMAIN_TRUST_RULES: 규칙 파일 경로 (JSON/YAML/CSV, 형식은 domain_rules 참고)
+        설정하면 아래 내장 테이블 대신 파일의 규칙을 바이너리 스냅샷으로 컴파일해 사용하고,
+        파일이 바뀌면 프로세스 재시작 없이 다시 읽습니다.
+    DOMAIN_TRUST_SNAPSHOT: 스냅샷 경로 (기본값: <규칙 파일>.snapshot)
+    DOMAIN_TRUST_RELOAD_INTERVAL: 규칙 파일 변경 확인 주기(초) (기본값: 2)
+
+DOMAIN_FEEDBACK_ENABLED를 켜면 get_domain_score / score_urls는 규칙 점수에 정보 평가 LLM의
+도메인별 누적 품질 평가(domain_feedback)를 섞은 값을 반환합니다. (DomainTrustIndex.score는 규칙 점수만 사용)
+"""
+
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 from urllib.parse import urlparse
 
+import numpy as np
+
+from .domain_rules import RulesSnapshot, load_snapshot, suffix_key
+from .domain_feedback import get_domain_feedback_store
+
 DOMAIN_SCORES= {
 # --- 저신뢰/상업적 도메인 (0.2 ~ 0.4) ---
     "11st.co.kr": 0.2,
@@ -60,26 +96,224 @@ def extract_domain(url):
     domain = domain.lower().replace("www.", "")
     return domain
 
+DEFAULT_SCORE = 0.5
+
+# 광고성 URL 감점 비율
+AD_PENALTY = 0.5
+
+# 트라이 노드에서 점수를 저장하는 키 (라벨로 쓰일 수 없는 값)
+_SCORE = ""
+
+
+class DomainTrustIndex:
+    """
+    도메인 규칙과 광고 키워드를 컴파일한 조회용 색인
+
+    조회는 URL 길이에 비례하며, 도메인별 기본 점수는 LRU 캐시에 보관합니다.
+    """
+
+    def __init__(self, domain_scores: Dict[str, float], ad_keywords: Iterable[str], cache_size: int = 4096):
+        self._trie: Dict = {}
+        self._snapshot: Optional[RulesSnapshot] = None
+        self._keyword_scores: Dict[str, float] = {}
+
+        for rule, score in domain_scores.items():
+            rule = rule.strip().lower()
+            if "." in rule:
+                node = self._trie
+                for label in reversed([label for label in rule.split(".") if label]):
+                    node = node.setdefault(label, {})
+                node[_SCORE] = score
+            elif rule:
+                self._keyword_scores[rule] = score
+
+        self._keyword_pattern = self._compile(self._keyword_scores)
+        self._ad_pattern = self._compile(ad_keywords)
+
+        self.score_domain = lru_cache(maxsize=cache_size)(self._score_domain)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: RulesSnapshot, cache_size: int = 4096) -> "DomainTrustIndex":
+        """
+        mmap 스냅샷 기반 색인 (접미사 규칙은 트라이 대신 스냅샷에서 이진 탐색)
+        """
+        index = cls(snapshot.keyword_scores, snapshot.ad_keywords, cache_size)
+        index._snapshot = snapshot
+        return index
+
+    def _suffix_matches(self, labels) -> Iterator[Tuple[int, float]]:
+        """일치하는 접미사 규칙의 (깊이, 점수)"""
+        if self._snapshot is not None:
+            for depth in range(1, len(labels) + 1):
+                score = self._snapshot.suffix_score(suffix_key(".".join(labels[-depth:])))
+                if score is not None:
+                    yield depth, score
+            return
+
+        node = self._trie
+        for depth, label in enumerate(reversed(labels), 1):
+            node = node.get(label)
+            if node is None:
+                return
+            if _SCORE in node:
+                yield depth, node[_SCORE]
+
+    @staticmethod
+    def _compile(keywords: Iterable[str]) -> Optional[re.Pattern]:
+        # 긴 키워드를 먼저 두어 같은 위치에서는 더 긴 키워드가 일치하도록 함
+        keywords = sorted({keyword.lower() for keyword in keywords if keyword}, key=lambda k: (-len(k), k))
+        if not keywords:
+            return None
+        return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+    def _score_domain(self, domain: str) -> float:
+        """
+        도메인의 기본 신뢰도 점수 (광고 감점 전)
+        """
+        labels = [label for label in domain.split(".") if label]
+
+        # (일치 깊이, 접미사 규칙 여부, 키워드 길이, 점수)
+        best: Tuple[int, int, int, float] = (0, 0, 0, DEFAULT_SCORE)
+
+        for depth, score in self._suffix_matches(labels):
+            best = max(best, (depth, 1, 0, score))
+
+        if self._keyword_pattern is not None:
+            for depth, label in enumerate(reversed(labels), 1):
+                for match in self._keyword_pattern.finditer(label):
+                    keyword = match.group()
+                    best = max(best, (depth, 0, len(keyword), self._keyword_scores[keyword]))
+
+        return best[3]
+
+    def is_ad(self, url: str) -> bool:
+        """URL에 광고성 키워드가 포함되어 있는지 확인합니다."""
+        return self._ad_pattern is not None and self._ad_pattern.search(url.lower()) is not None
+
+    def score(self, url: str, adjust: Optional[Callable[[str, float], float]] = None) -> float:
+        """
+        URL의 최종 신뢰도 점수 (광고성 URL은 감점)
+
+        Args:
+            adjust: (도메인, 규칙 점수) → 보정 점수 함수 (광고 감점 전에 적용)
+        """
+        domain = extract_domain(url)
+        base_score = self.score_domain(domain)
+        if adjust is not None:
+            base_score = adjust(domain, base_score)
+        if self.is_ad(url):
+            base_score = base_score * AD_PENALTY
+        return base_score
+
+    def score_many(self, urls, adjust: Optional[Callable[[str, float], float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        여러 URL을 한 번에 점수화합니다. 같은 도메인은 한 번만 조회합니다.
+
+        Returns:
+            (scores: float64 배열, is_ad: bool 배열)
+        """
+        urls = list(urls)
+        if not urls:
+            return np.zeros(0, dtype=np.float64), np.zeros(0, dtype=bool)
+
+        domains, inverse = np.unique([extract_domain(url) for url in urls], return_inverse=True)
+        base_scores = np.fromiter(
+            (
+                adjust(domain, self.score_domain(domain)) if adjust is not None else self.score_domain(domain)
+                for domain in domains.tolist()
+            ),
+            dtype=np.float64,
+            count=len(domains),
+        )
+
+        is_ad = np.fromiter((self.is_ad(url) for url in urls), dtype=bool, count=len(urls))
+        scores = base_scores[inverse] * np.where(is_ad, AD_PENALTY, 1.0)
+        return scores, is_ad
+
+
+_builtin_index = DomainTrustIndex(DOMAIN_SCORES, AD_KEYWORDS)
+
+# 규칙 파일 기반 색인 상태 (교체는 참조 대입 한 번으로 원자적으로 수행)
+_file_index: Optional[DomainTrustIndex] = None
+_file_state: Tuple = (None, None, None)  # (경로, mtime_ns, 크기)
+_checked_at = 0.0
+_reload_lock = threading.Lock()
+
+
+def reload_domain_rules(path: Optional[str] = None) -> DomainTrustIndex:
+    """
+    규칙 파일을 (필요하면 스냅샷으로 컴파일하여) 다시 읽고 색인을 교체합니다.
+
+    Args:
+        path: 규칙 파일 경로 (기본값: DOMAIN_TRUST_RULES 환경 변수)
+    """
+    global _file_index, _file_state, _checked_at
+
+    path = path or os.getenv("DOMAIN_TRUST_RULES")
+    if not path:
+        return _builtin_index
+
+    with _reload_lock:
+        stat = os.stat(path)
+        index = DomainTrustIndex.from_snapshot(load_snapshot(path))
+        _file_index = index
+        _file_state = (path, stat.st_mtime_ns, stat.st_size)
+        _checked_at = time.monotonic()
+
+    print(f"  🔄 도메인 신뢰도 규칙 로드: {path}")
+    return index
+
+
+def get_domain_trust_index() -> DomainTrustIndex:
+    """
+    현재 도메인 신뢰도 색인을 반환합니다.
+
+    DOMAIN_TRUST_RULES가 설정되어 있으면 DOMAIN_TRUST_RELOAD_INTERVAL마다 파일 변경을 확인하고,
+    바뀌었으면 새 색인으로 교체합니다. 규칙 파일을 읽지 못하면 기존 색인을 계속 사용합니다.
+    """
+    global _checked_at
+
+    path = os.getenv("DOMAIN_TRUST_RULES")
+    if not path:
+        return _builtin_index
+
+    interval = float(os.getenv("DOMAIN_TRUST_RELOAD_INTERVAL", "2"))
+    index = _file_index
+    if index is not None and _file_state[0] == path and time.monotonic() - _checked_at < interval:
+        return index
+
+    try:
+        stat = os.stat(path)
+        _checked_at = time.monotonic()
+        if index is not None and _file_state == (path, stat.st_mtime_ns, stat.st_size):
+            return index
+        return reload_domain_rules(path)
+    except (OSError, ValueError) as e:
+        print(f"  ⚠️ 도메인 신뢰도 규칙 로드 실패: {e}")
+        return index or _builtin_index
+
+
+def _learned_adjuster() -> Optional[Callable[[str, float], float]]:
+    """도메인별 학습 신뢰도가 활성화되어 있으면 보정 함수를 반환합니다."""
+    store = get_domain_feedback_store()
+    return store.blend if store is not None else None
+
+
 # 추출한 도메인 신뢰도 점수 계산
 def get_domain_score(url):
-    domain = extract_domain(url)
-
-    base_score = 0.5
-
-    if domain in DOMAIN_SCORES:
-        base_score = DOMAIN_SCORES[domain]
-    else:
-        for key, score in DOMAIN_SCORES.items():
-            if key in domain:
-                base_score = score
-                break
-    
-    url_lower = url.lower()
-    for keyword in AD_KEYWORDS:
-        if keyword in url_lower:
-            base_score = base_score * 0.5
-            break
-    return base_score
+    return get_domain_trust_index().score(url, _learned_adjuster())
+
+
+def score_urls(urls) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    URL 목록의 신뢰도 점수와 광고 여부를 배열로 반환합니다.
+    (get_domain_score를 URL마다 호출한 결과와 같음, 학습 신뢰도 보정 포함)
+
+    Example:
+        scores, is_ad = score_urls(urls)
+        keep = scores > 0.25
+    """
+    return get_domain_trust_index().score_many(urls, _learned_adjuster())
 
 # 검증하기
 if __name__ == "__main__":
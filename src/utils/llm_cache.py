@@ -0,0 +1,121 @@
+"""
+LLM 응답 캐시
+입력만으로 결과가 정해지는 저온(temperature) 호출의 응답을 디스크에 재사용합니다.
+(같은 주제를 다시 실행하거나 실패한 실행을 재개할 때 차트 추출/리포트 검토/정보 평가 비용 절감)
+
+LangChain BaseCache 구현이므로 모델 생성 시 cache=로 전달하면
+모델 설정 문자열(모델명, 온도 등)과 렌더링된 프롬프트 메시지의 해시를 키로 조회합니다.
+노드별로 명시적으로 켠 경우에만 사용합니다.
+
+환경 변수:
+    LLM_CACHE_NODES: 캐시를 사용할 노드 목록, 쉼표 구분 (chart, reviewer, evaluator / 기본값: 없음)
+    LLM_CACHE_PATH: SQLite 파일 경로 (기본값: .cache/llm_cache.sqlite3)
+    LLM_CACHE_TTL: 유효 시간(초) (기본값: 604800)
+    LLM_CACHE_MAX_ENTRIES: 최대 저장 항목 수 (기본값: 2000)
+"""
+
+import hashlib
+import os
+import threading
+from typing import Any, Optional, Sequence
+
+from dotenv import load_dotenv
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+from .disk_cache import DiskCache
+from .replay import get_cassette
+from .run_metrics import incr
+
+load_dotenv()
+
+# 캐시를 켤 수 있는 노드 이름
+CACHEABLE_NODES = ("chart", "reviewer", "evaluator")
+
+_cache: Optional["LLMResponseCache"] = None
+_cache_lock = threading.Lock()
+
+
+def make_llm_cache_key(prompt: str, llm_string: str) -> str:
+    """
+    모델 설정 문자열과 직렬화된 프롬프트로 캐시 키를 생성합니다.
+    """
+    raw = llm_string + "\x00" + prompt
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache(BaseCache):
+    """
+    DiskCache(SQLite, TTL, LRU 퇴출)에 채팅 모델 응답을 저장하는 LangChain 캐시
+
+    캐시된 응답은 토큰을 사용하지 않으므로 usage_metadata를 제외하고 저장합니다.
+    """
+
+    def __init__(self, store: DiskCache):
+        self.store = store
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        entries = self.store.get(make_llm_cache_key(prompt, llm_string))
+        if entries is None:
+            incr("llm_cache.misses")
+            return None
+
+        incr("llm_cache.hits")
+        generations = []
+        for entry in entries:
+            if entry.get("message") is not None:
+                message = messages_from_dict([entry["message"]])[0]
+                generations.append(ChatGeneration(message=message, generation_info=entry.get("generation_info")))
+            else:
+                generations.append(Generation(text=entry["text"], generation_info=entry.get("generation_info")))
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        entries = []
+        for generation in return_val:
+            entry = {"text": generation.text, "generation_info": generation.generation_info, "message": None}
+            if isinstance(generation, ChatGeneration):
+                message = generation.message
+                if getattr(message, "usage_metadata", None) is not None:
+                    message = message.model_copy(update={"usage_metadata": None})
+                entry["message"] = message_to_dict(message)
+            entries.append(entry)
+
+        self.store.set(make_llm_cache_key(prompt, llm_string), entries)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+
+def enabled_llm_cache_nodes() -> set:
+    """LLM_CACHE_NODES에 지정된 노드 이름 집합을 반환합니다."""
+    raw = os.getenv("LLM_CACHE_NODES", "")
+    return {name.strip().lower() for name in raw.split(",") if name.strip()}
+
+
+def get_llm_cache(node: Optional[str]) -> Optional[LLMResponseCache]:
+    """
+    노드에서 사용할 LLM 응답 캐시를 반환합니다. 해당 노드가 켜져 있지 않으면 None을 반환합니다.
+
+    기록/재생 모드에서는 모든 호출이 카세트를 거치도록 캐시를 사용하지 않습니다.
+
+    Args:
+        node: "chart", "reviewer", "evaluator" 중 하나 (None이면 캐시 미사용)
+    """
+    global _cache
+
+    if node is None or node not in enabled_llm_cache_nodes():
+        return None
+
+    if get_cassette() is not None:
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache(DiskCache(
+                    path=os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3"),
+                    ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "604800")),
+                    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000")),
+                ))
+    return _cache
@@ -1,17 +1,42 @@
 """
 LLM 설정 및 초기화
 Google Gemini 모델을 설정합니다.
+
+생성한 모델은 (usage, model, temperature)별로 레지스트리에 보관하여 재사용하고,
+같은 API 키를 쓰는 모델끼리는 하나의 google-genai 클라이언트(HTTP 연결 풀)를 공유합니다.
+LLM_CACHE_NODES로 켠 노드의 모델에는 응답 캐시(llm_cache)가 연결됩니다.
 """
 
 import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
+from .replay import get_cassette, CassetteChatModel
+from .rate_limiter import get_llm_rate_limiter
+from .llm_cache import get_llm_cache
 
 # 환경 변수 로드
 load_dotenv()
 
+# (usage, model_name, temperature, 캐시 노드) → 채팅 모델
+_llm_registry: Dict[Tuple[str, str, float, Optional[str]], object] = {}
+_registry_lock = threading.Lock()
+
+# API 키 → 공유 google-genai 클라이언트
+_shared_clients: Dict[str, object] = {}
+
+# 노드에서 사용하는 (usage, temperature) 조합 (warm_llm_clients 기본값)
+WARM_LLM_SPECS = [
+    ("default", 0.7),   # query_generator (1차)
+    ("default", 0.5),   # query_generator (2차)
+    ("default", 0.3),   # query_generator (3차), info_evaluator
+    ("default", 0.1),   # chart_generator
+    ("generator", None),  # report_content_generator
+]
 
-def get_llm(usage: str = "default", model_name: str = None, temperature: float = None):
+
+def get_llm(usage: str = "default", model_name: str = None, temperature: float = None, cache_node: str = None):
     """
     용도(usage)에 따라 최적화된 LLM 인스턴스를 반환합니다.
 
@@ -19,6 +44,7 @@ def get_llm(usage: str = "default", model_name: str = None, temperature: float =
         usage: "generator(리포트 작성)", "reviewer(리포트 검토)", "default"
         model_name: 모델 이름 (기본값: 환경변수 또는 gemini-2.5-flash-lite)
         temperature: 온도 설정 (기본값: 환경변수 또는 0.7)
+        cache_node: 응답 캐시를 사용할 노드 이름 ("chart", "reviewer", "evaluator" / LLM_CACHE_NODES에 포함된 경우만 적용)
 
     Returns:
         ChatGoogleGenerativeAI 인스턴스
@@ -45,6 +71,69 @@ def get_llm(usage: str = "default", model_name: str = None, temperature: float =
         env_temp = os.getenv("TEMPERATURE")
         temperature = float(env_temp) if env_temp is not None else selected_config["temperature"]
 
+    return _get_registered_llm(usage, model_name, temperature, cache_node)
+
+
+def _get_registered_llm(usage: str, model_name: str, temperature: float, cache_node: str = None):
+    """
+    레지스트리에서 모델을 찾고, 없으면 생성하여 등록합니다.
+    기록/재생 모드에서는 카세트가 바뀔 수 있으므로 등록하지 않습니다.
+    """
+    if get_cassette() is not None:
+        return _create_llm(model_name, temperature)
+
+    # 캐시를 쓰는 모델과 쓰지 않는 모델은 별도로 등록
+    cache = get_llm_cache(cache_node)
+    key = (usage, model_name, float(temperature), cache_node if cache is not None else None)
+    llm = _llm_registry.get(key)
+    if llm is not None:
+        return llm
+
+    with _registry_lock:
+        llm = _llm_registry.get(key)
+        if llm is None:
+            llm = _create_llm(model_name, temperature, cache)
+            _llm_registry[key] = llm
+    return llm
+
+
+def warm_llm_clients(specs: Optional[Iterable[Tuple[str, Optional[float]]]] = None) -> int:
+    """
+    노드에서 사용할 모델을 미리 생성합니다. (앱 시작 시 호출)
+
+    Args:
+        specs: (usage, temperature) 목록 (기본값: WARM_LLM_SPECS + 리뷰어 모델)
+
+    Returns:
+        레지스트리에 등록된 모델 수
+    """
+    for usage, temperature in specs if specs is not None else WARM_LLM_SPECS:
+        get_llm(usage=usage, temperature=temperature)
+
+    if specs is None:
+        get_reviewr_llm()
+
+    return len(_llm_registry)
+
+
+def clear_llm_registry() -> None:
+    """레지스트리를 비웁니다. (API 키나 모델 설정을 바꾼 뒤 사용)"""
+    with _registry_lock:
+        _llm_registry.clear()
+        _shared_clients.clear()
+
+
+def _create_llm(model_name: str, temperature: float, cache=None):
+    """
+    ChatGoogleGenerativeAI를 생성합니다.
+    기록/재생 모드가 활성화되어 있으면 카세트 래퍼를 반환합니다.
+    """
+    cassette = get_cassette()
+
+    # 재생 모드: 실제 모델과 API 키 없이 카세트에서 응답
+    if cassette and cassette.mode == "replay":
+        return CassetteChatModel(cassette=cassette, model_name=model_name, temperature=temperature)
+
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         raise ValueError(
@@ -52,13 +141,24 @@ def get_llm(usage: str = "default", model_name: str = None, temperature: float =
             ".env 파일에 GOOGLE_API_KEY를 추가해주세요."
         )
 
-    # LLM 초기화
+    # LLM 초기화 (모델별 토큰 버킷으로 동시 실행 중인 리서치 작업 간 요청 속도 공유)
     llm = ChatGoogleGenerativeAI(
         model=model_name,
         temperature=temperature,
         google_api_key=api_key,
+        rate_limiter=get_llm_rate_limiter(model_name),
+        cache=cache,
     )
 
+    # 같은 API 키의 모델끼리 HTTP 연결 풀 공유 (google-genai Client는 모델과 무관하고 스레드 안전)
+    shared_client = _shared_clients.setdefault(api_key, llm.client)
+    if shared_client is not llm.client:
+        llm.client = shared_client
+
+    # 기록 모드: 실제 호출 결과를 카세트에 저장
+    if cassette:
+        return CassetteChatModel(cassette=cassette, inner=llm, model_name=model_name, temperature=temperature)
+
     return llm
 
 
@@ -66,18 +166,7 @@ def get_reviewr_llm():
     """
       리뷰어 전용 LLM
     """
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "GOOGLE_API_KEY가 설정되지 않았습니다. "
-            ".env 파일에 GOOGLE_API_KEY를 추가해주세요."
-        )
-
-    return ChatGoogleGenerativeAI (
-        model="gemini-2.5-flash-lite",
-        temperature=0.1,
-        google_api_key=api_key,
-    )
+    return _get_registered_llm("reviewer", "gemini-2.5-flash-lite", 0.1, cache_node="reviewer")
         
 
 # 사용 예시:
@@ -0,0 +1,220 @@
+"""
+LLM / 노드 메트릭 콜백
+LangChain 콜백으로 노드별 LLM 호출 수, 입력/출력 토큰, 추정 비용, 지연 시간과
+노드 실행 시간을 실행 메트릭(run_metrics)에 기록하고, 실행 요약을 JSON으로 저장합니다.
+
+노드 이름은 LangGraph가 하위 실행에 전달하는 metadata["langgraph_node"]에서 가져옵니다.
+검색 호출 수/응답 크기는 search_client에서 같은 실행 메트릭에 기록합니다.
+
+기록되는 이름:
+    llm.<node>.calls / input_tokens / output_tokens / cost_usd / errors (카운터)
+    llm.<node>.latency, node.<node> (타이밍)
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from .run_metrics import RunMetrics
+
+# 모델별 100만 토큰당 가격 (USD, 입력/출력) - 목록에 없는 모델은 0으로 계산
+MODEL_PRICES_PER_1M = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+}
+
+
+def estimate_cost(model_name: str, input_tokens: int, output_tokens: int) -> float:
+    """토큰 수로 호출 비용(USD)을 추정합니다."""
+    model_name = (model_name or "").split("/")[-1]
+    input_price, output_price = MODEL_PRICES_PER_1M.get(model_name, (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def _usage_from_result(response: LLMResult) -> Tuple[int, int]:
+    """응답의 usage_metadata(없으면 llm_output)에서 (입력, 출력) 토큰 수를 합산합니다."""
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+
+    if not input_tokens and not output_tokens and response.llm_output:
+        usage = response.llm_output.get("usage_metadata") or response.llm_output.get("token_usage") or {}
+        input_tokens = usage.get("input_tokens", usage.get("prompt_tokens", 0))
+        output_tokens = usage.get("output_tokens", usage.get("completion_tokens", 0))
+
+    return input_tokens, output_tokens
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    LLM 호출과 LangGraph 노드 실행을 RunMetrics에 기록하는 콜백 핸들러
+
+    비동기 실행에서는 콜백이 다른 스레드에서 호출될 수 있으므로
+    contextvar 대신 생성 시 받은 RunMetrics에 직접 기록합니다.
+    """
+
+    def __init__(self, metrics: RunMetrics):
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._llm_runs: Dict[UUID, Tuple[str, str, float]] = {}
+        self._node_runs: Dict[UUID, Tuple[str, float]] = {}
+
+    # === LLM 호출 ===
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, *, run_id: UUID,
+                            metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node", "other")
+        params = kwargs.get("invocation_params") or {}
+        model_name = params.get("model") or params.get("model_name") or ""
+        with self._lock:
+            self._llm_runs[run_id] = (node, model_name, time.perf_counter())
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts, *, run_id: UUID,
+                     metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        self.on_chat_model_start(serialized, prompts, run_id=run_id, metadata=metadata, **kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            run = self._llm_runs.pop(run_id, None)
+        if run is None:
+            return
+
+        node, model_name, started = run
+        input_tokens, output_tokens = _usage_from_result(response)
+
+        self.metrics.observe(f"llm.{node}.latency", time.perf_counter() - started)
+        self.metrics.incr(f"llm.{node}.calls")
+        self.metrics.incr(f"llm.{node}.input_tokens", input_tokens)
+        self.metrics.incr(f"llm.{node}.output_tokens", output_tokens)
+        self.metrics.incr(f"llm.{node}.cost_usd", estimate_cost(model_name, input_tokens, output_tokens))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            run = self._llm_runs.pop(run_id, None)
+        if run is not None:
+            self.metrics.incr(f"llm.{run[0]}.errors")
+
+    # === 노드 실행 ===
+
+    def on_chain_start(self, serialized: Dict[str, Any], inputs, *, run_id: UUID,
+                       metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # 노드 안의 체인(프롬프트 | LLM 등)은 제외하고 노드 자체의 실행만 기록
+        if node is None or kwargs.get("name") != node:
+            return
+        with self._lock:
+            self._node_runs[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            run = self._node_runs.pop(run_id, None)
+        if run is not None:
+            self.metrics.observe(f"node.{run[0]}", time.perf_counter() - run[1])
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self.on_chain_end(None, run_id=run_id)
+
+
+def summarize_by_node(summary: Dict) -> Dict:
+    """
+    RunMetrics.summary() 결과를 노드별 LLM 통계와 검색 통계로 정리합니다.
+
+    Returns:
+        {"nodes": {node: {"calls", "input_tokens", "output_tokens", "cost_usd", "latency", "duration"}},
+         "totals": {...}, "search": {"calls", "bytes", "cache_hits", "latency"}}
+    """
+    counters = summary.get("counters", {})
+    timings = summary.get("timings", {})
+    nodes: Dict[str, Dict] = {}
+
+    for name, value in counters.items():
+        if name.startswith("llm.") and name.count(".") == 2:
+            _, node, field = name.split(".")
+            nodes.setdefault(node, {})[field] = round(value, 6) if field == "cost_usd" else int(value)
+
+    for name, stats in timings.items():
+        if name.startswith("llm.") and name.endswith(".latency"):
+            nodes.setdefault(name[len("llm."):-len(".latency")], {})["latency"] = stats
+        elif name.startswith("node."):
+            nodes.setdefault(name[len("node."):], {})["duration"] = stats
+
+    totals = {
+        field: sum(node.get(field, 0) for node in nodes.values())
+        for field in ("calls", "input_tokens", "output_tokens", "cost_usd")
+    }
+    totals["cost_usd"] = round(totals["cost_usd"], 6)
+
+    search = {
+        "calls": int(counters.get("search.calls", 0)),
+        "bytes": int(counters.get("search.bytes", 0)),
+        "cache_hits": int(counters.get("search.cache_hits", 0)),
+        "latency": timings.get("search.latency"),
+    }
+    return {"nodes": nodes, "totals": totals, "search": search}
+
+
+def write_metrics_summary(summary: Dict, output_path: Optional[str] = None, topic: str = "") -> str:
+    """
+    실행 메트릭 요약을 JSON 파일로 저장합니다.
+
+    Args:
+        summary: RunMetrics.summary() 결과
+        output_path: 리포트 파일 경로 (같은 위치에 <이름>.metrics.json으로 저장, 없으면 outputs/)
+        topic: 리서치 주제
+
+    Returns:
+        저장한 파일 경로
+    """
+    if output_path:
+        path = os.path.splitext(output_path)[0] + ".metrics.json"
+    else:
+        os.makedirs("outputs", exist_ok=True)
+        path = f"outputs/run_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+    payload = {
+        "topic": topic,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        **summarize_by_node(summary),
+        "raw": summary,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def format_metrics_summary(summary: Dict) -> str:
+    """CLI 출력용 노드별 메트릭 표를 만듭니다."""
+    report = summarize_by_node(summary)
+    lines = [
+        f"{'노드':<26}{'호출':>5}{'입력 토큰':>11}{'출력 토큰':>11}"
+        f"{'LLM p50':>9}{'LLM p95':>9}{'노드(s)':>9}{'비용($)':>10}"
+    ]
+
+    for node, stats in sorted(report["nodes"].items()):
+        latency = stats.get("latency") or {}
+        duration = stats.get("duration") or {}
+        lines.append(
+            f"{node:<26}{stats.get('calls', 0):>5}{stats.get('input_tokens', 0):>11}{stats.get('output_tokens', 0):>11}"
+            f"{latency.get('p50', 0):>9.2f}{latency.get('p95', 0):>9.2f}{duration.get('total', 0):>9.2f}"
+            f"{stats.get('cost_usd', 0):>10.4f}"
+        )
+
+    totals, search = report["totals"], report["search"]
+    lines.append(
+        f"{'합계':<26}{totals['calls']:>5}{totals['input_tokens']:>11}{totals['output_tokens']:>11}"
+        f"{'':>27}{totals['cost_usd']:>10.4f}"
+    )
+    lines.append(
+        f"검색: {search['calls']}회, {search['bytes'] / 1024:.1f} KB 수신, 캐시 사용 {search['cache_hits']}회"
+    )
+    return "\n".join(lines)
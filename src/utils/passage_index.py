@@ -0,0 +1,262 @@
+"""
+문단 단위 로컬 검색 색인
+수집된 자료의 본문을 문단(split_passages)으로 나누어 BM25 역색인을 만들고,
+리포트 섹션 제목이나 리뷰 피드백 항목마다 관련 문단 top-k를 찾습니다.
+리포트 생성/수정 프롬프트에 전체 자료 대신 섹션별 근거만 넣기 위해 사용합니다.
+
+- 색인은 ResultStore마다 한 번 만들어 저장소(derived_cache)에 두고,
+  저장소 version이 바뀌면 새로 들어온 결과만 추가하고 교체/제거된 결과는 뺍니다.
+- 점수 = BM25 × (0.5 + 0.5 × 신뢰도)
+- PASSAGE_INDEX_HASHING을 켜면 해시 벡터(글자 3-gram, 부호 해싱) 코사인 유사도를 더합니다.
+  (조사/어미 때문에 단어가 정확히 일치하지 않는 한국어 질의 보완용)
+
+환경 변수:
+    PASSAGE_INDEX: "false"이면 섹션별 근거 대신 전체 자료 묶음(format_sources) 사용 (기본값: true)
+    PASSAGE_INDEX_HASHING: "true"이면 해시 벡터 유사도 사용 (기본값: false)
+"""
+
+import math
+import os
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+from .source_formatter import split_passages
+from .text_tokenizer import tokenize, estimate_tokens
+
+load_dotenv()
+
+PASSAGE_INDEX = os.getenv("PASSAGE_INDEX", "true").lower() not in ("0", "false", "no")
+PASSAGE_INDEX_HASHING = os.getenv("PASSAGE_INDEX_HASHING", "false").lower() in ("1", "true", "yes")
+
+K1 = 1.2
+B = 0.75
+
+# 해시 벡터 차원 수와 최종 점수에서의 가중치
+HASH_DIM = 2 ** 12
+HASH_WEIGHT = 0.3
+
+_CACHE_KEY = ("passage_index",)
+_registry_lock = threading.Lock()
+
+
+def _hash_vector(text: str) -> np.ndarray:
+    """
+    글자 3-gram을 HASH_DIM 차원으로 부호 해싱한 L2 정규화 벡터를 반환합니다.
+    (hash()는 실행마다 달라지므로 crc32 사용)
+    """
+    vector = np.zeros(HASH_DIM, dtype=np.float32)
+    normalized = " ".join(tokenize(text))
+    grams = Counter(normalized[i:i + 3] for i in range(max(len(normalized) - 2, 0)))
+
+    for gram, frequency in grams.items():
+        hashed = zlib.crc32(gram.encode("utf-8"))
+        vector[hashed % HASH_DIM] += (1.0 if hashed & 0x80000000 else -1.0) * (1 + math.log(frequency))
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class PassageIndex:
+    """
+    검색 결과 문단의 BM25 역색인 (선택적으로 해시 벡터 포함)
+
+    결과 dict 자체를 보관하므로 신뢰도는 검색 시점의 값을 사용합니다.
+    """
+
+    def __init__(self, hashing: bool = PASSAGE_INDEX_HASHING):
+        self.hashing = hashing
+        self.version: Optional[int] = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+        self._results: Dict[int, Dict] = {}              # id(결과) -> 결과
+        self._passage_ids: Dict[int, List[int]] = {}     # id(결과) -> 문단 id 목록
+        self._passages: Dict[int, tuple] = {}            # 문단 id -> (id(결과), 문단 번호, 문단)
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._postings: Dict[str, Dict[int, int]] = {}   # 용어 -> {문단 id: 빈도}
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._matrix: Optional[tuple] = None             # (문단 id 목록, 해시 벡터 행렬), 색인이 바뀌면 다시 만듦
+
+    def __len__(self) -> int:
+        return len(self._passages)
+
+    def _add_result(self, result: Dict) -> None:
+        key = id(result)
+        self._results[key] = result
+        self._passage_ids[key] = []
+
+        for position, passage in enumerate(split_passages(result.get("content", ""))):
+            passage_id = self._next_id
+            self._next_id += 1
+            tokens = tokenize(passage)
+
+            self._passage_ids[key].append(passage_id)
+            self._passages[passage_id] = (key, position, passage)
+            self._lengths[passage_id] = len(tokens)
+            self._total_length += len(tokens)
+            for term, frequency in Counter(tokens).items():
+                self._postings.setdefault(term, {})[passage_id] = frequency
+            if self.hashing:
+                self._vectors[passage_id] = _hash_vector(passage)
+                self._matrix = None
+
+    def _remove_result(self, key: int) -> None:
+        for passage_id in self._passage_ids.pop(key, []):
+            _, _, passage = self._passages.pop(passage_id)
+            self._total_length -= self._lengths.pop(passage_id)
+            self._vectors.pop(passage_id, None)
+            self._matrix = None
+            for term in set(tokenize(passage)):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(passage_id, None)
+                    if not postings:
+                        del self._postings[term]
+        self._results.pop(key, None)
+
+    def sync(self, results: List[Dict]) -> int:
+        """
+        색인을 검색 결과 목록과 맞춥니다. (새 결과 추가, 없어진 결과 제거)
+
+        Returns:
+            새로 색인한 결과 수
+        """
+        version = getattr(results, "version", None)
+        with self._lock:
+            if version is not None and version == self.version:
+                return 0
+
+            current = {id(result): result for result in results}
+            for key in [key for key in self._results if key not in current]:
+                self._remove_result(key)
+
+            added = 0
+            for key, result in current.items():
+                if key not in self._results:
+                    self._add_result(result)
+                    added += 1
+
+            self.version = version
+            return added
+
+    def search(self, query: str, k: int = 5) -> List[Dict]:
+        """
+        질의와 관련된 문단 top-k를 반환합니다.
+
+        Args:
+            query: 섹션 제목, 리뷰 피드백 항목 등
+            k: 반환할 문단 수
+
+        Returns:
+            [{"result", "position", "passage", "score"}] (점수 내림차순, 같은 점수는 색인 순서)
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._passages)
+            if not count or not terms:
+                return []
+
+            average_length = self._total_length / count or 1.0
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for passage_id, frequency in postings.items():
+                    norm = 1 - B + B * self._lengths[passage_id] / average_length
+                    scores[passage_id] = scores.get(passage_id, 0.0) + idf * frequency * (K1 + 1) / (frequency + K1 * norm)
+
+            if self.hashing and scores:
+                # BM25를 0~1로 맞춘 뒤 해시 벡터 유사도를 더함 (BM25 후보가 없으면 건너뜀)
+                top = max(scores.values())
+                if self._matrix is None:
+                    passage_ids = list(self._vectors)
+                    self._matrix = (passage_ids, np.stack([self._vectors[passage_id] for passage_id in passage_ids]))
+                passage_ids, matrix = self._matrix
+                similarities = matrix @ _hash_vector(query)
+                for passage_id, similarity in zip(passage_ids, similarities):
+                    scores[passage_id] = (1 - HASH_WEIGHT) * scores.get(passage_id, 0.0) / top + HASH_WEIGHT * max(float(similarity), 0.0)
+
+            ranked = []
+            for passage_id, score in scores.items():
+                key, position, passage = self._passages[passage_id]
+                if score <= 0:
+                    continue
+                result = self._results[key]
+                ranked.append((score * (0.5 + 0.5 * result.get("trust_score", 0.5)), passage_id, result, position, passage))
+
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [
+            {"result": result, "position": position, "passage": passage, "score": round(score, 4)}
+            for score, _, result, position, passage in ranked[:k]
+        ]
+
+
+def get_passage_index(search_results: List[Dict]) -> PassageIndex:
+    """
+    검색 결과의 문단 색인을 반환합니다.
+
+    ResultStore면 저장소에 둔 색인을 재사용하고 바뀐 부분만 갱신합니다.
+    일반 list면 매번 새로 만듭니다.
+    """
+    cache = getattr(search_results, "derived_cache", None)
+    if cache is None:
+        index = PassageIndex()
+    else:
+        with _registry_lock:
+            index = cache.get(_CACHE_KEY)
+            if index is None:
+                index = cache[_CACHE_KEY] = PassageIndex()
+
+    added = index.sync(search_results)
+    if added:
+        print(f"  [색인] 문단 색인 갱신: 자료 {added}개 추가 (전체 문단 {len(index)}개)")
+    return index
+
+
+def format_evidence(search_results: List[Dict], groups: List[tuple], budget: int) -> str:
+    """
+    질의 묶음(섹션, 피드백 항목 등)별 근거 문단과, 인용된 자료 목록을 프롬프트용 문자열로 만듭니다.
+    자료 번호는 검색 결과 목록에서의 순서를 사용하므로 모든 묶음에서 같은 자료는 같은 번호입니다.
+
+    Args:
+        search_results: 검색 결과
+        groups: [(묶음 제목, 근거 문단 목록(PassageIndex.search 결과))]
+        budget: 근거 문단 토큰 예산 (묶음별로 나누어 쓰고, 넘치는 하위 문단은 제외 / 인용 자료 목록은 별도)
+
+    Returns:
+        프롬프트에 넣을 문자열 (근거 문단이 하나도 없으면 "")
+    """
+    numbers = {id(result): index + 1 for index, result in enumerate(search_results)}
+    per_group = budget // max(len(groups), 1)
+    cited: Dict[int, Dict] = {}
+    sections = []
+
+    for heading, passages in groups:
+        lines, used = [], estimate_tokens(heading)
+        for item in passages:
+            line = f"- [{numbers[id(item['result'])]}] {item['passage']}"
+            cost = estimate_tokens(line)
+            if used + cost > per_group:
+                continue
+            lines.append(line)
+            used += cost
+            cited[numbers[id(item['result'])]] = item["result"]
+        if lines:
+            sections.append(f"### {heading}\n" + "\n".join(lines))
+
+    if not sections:
+        return ""
+
+    source_list = "\n".join(
+        f"[{number}] {result.get('title', 'No Title')} - {result.get('url', 'N/A')}"
+        for number, result in sorted(cited.items())
+    )
+    return "[Evidence]\n" + "\n\n".join(sections) + "\n\n[Sources]\n" + source_list
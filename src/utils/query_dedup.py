@@ -0,0 +1,79 @@
+"""
+검색 쿼리 중복 판별
+이전 반복에서 이미 검색한 쿼리와 거의 같은 쿼리를 문자 n-gram Jaccard 유사도로 걸러냅니다.
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from .search_cache import normalize_query
+
+# 이 값 이상이면 같은 쿼리로 간주 (0~1)
+QUERY_DEDUP_THRESHOLD = float(os.getenv("QUERY_DEDUP_THRESHOLD", "0.75"))
+
+
+def query_shingles(query: str, n: int = 3) -> Set[str]:
+    """
+    정규화된 쿼리의 문자 n-gram 집합을 반환합니다.
+    한국어(띄어쓰기 편차가 큼)와 영어 모두에서 동작하도록 공백과 구두점을 제거한 뒤 자릅니다.
+    """
+    text = re.sub(r"[\W_]+", "", normalize_query(query))
+
+    if len(text) <= n:
+        return {text} if text else set()
+
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """두 집합의 Jaccard 유사도"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def filter_redundant_queries(
+    queries: List[str],
+    history: List[str],
+    threshold: Optional[float] = None,
+) -> Tuple[List[str], List[Dict]]:
+    """
+    이전에 검색한 쿼리(history) 및 같은 배치 안의 앞선 쿼리와 거의 같은 쿼리를 제외합니다.
+
+    Args:
+        queries: 이번 반복에서 생성된 쿼리
+        history: 이전 반복까지 실제로 검색한 쿼리
+        threshold: 중복 판정 기준 유사도 (기본값: QUERY_DEDUP_THRESHOLD)
+
+    Returns:
+        tuple: (검색할 쿼리 리스트, 제외된 쿼리 정보 리스트)
+    """
+    if threshold is None:
+        threshold = QUERY_DEDUP_THRESHOLD
+
+    seen = [(q, query_shingles(q)) for q in history]
+    kept = []
+    skipped = []
+
+    for query in queries:
+        shingles = query_shingles(query)
+        best_match, best_score = None, 0.0
+
+        for previous, previous_shingles in seen:
+            score = jaccard(shingles, previous_shingles)
+            if score > best_score:
+                best_match, best_score = previous, score
+
+        if best_match is not None and best_score >= threshold:
+            skipped.append({
+                "query": query,
+                "similar_to": best_match,
+                "similarity": round(best_score, 3),
+            })
+            continue
+
+        kept.append(query)
+        seen.append((query, shingles))
+
+    return kept, skipped
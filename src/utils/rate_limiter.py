@@ -0,0 +1,261 @@
+"""
+토큰 버킷 요청 속도 제한 (Rate Limiter)
+검색 제공자별, LLM 모델별로 초당 요청 수를 제한합니다.
+
+한도를 넘으면 실패하지 않고 토큰이 찰 때까지 대기(queue)하며,
+대기 시간은 현재 실행의 메트릭(run_metrics)에 기록됩니다.
+
+환경 변수:
+    RATE_LIMIT_STORE: 버킷 상태를 저장할 SQLite 파일 경로
+        설정하면 같은 파일을 쓰는 여러 워커 프로세스가 한도를 공유합니다.
+        (기본값: 비어 있음 → 프로세스 내부에서만 공유)
+    RATE_LIMIT_TAVILY_RPM: Tavily 분당 요청 수 (기본값: 0 = 제한 없음, 예: 요금제 한도에 맞춰 100)
+    RATE_LIMIT_LLM_RPM: LLM 모델별 분당 요청 수 (기본값: 0 = 제한 없음, 예: 60)
+        모델별로 RATE_LIMIT_LLM_RPM__GEMINI_2_5_FLASH 처럼 덮어쓸 수 있습니다.
+    RATE_LIMIT_BURST: 순간적으로 허용할 최대 요청 수 (기본값: 5)
+
+기본값은 모두 제한 없음이며, 429 응답을 받거나 여러 워커가 한 키를 공유할 때 명시적으로 켭니다.
+"""
+
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from langchain_core.rate_limiters import BaseRateLimiter
+from .run_metrics import incr, observe
+
+load_dotenv()
+
+# 기본 분당 요청 수 (0 = 제한 없음, 환경 변수로 켬)
+DEFAULT_PROVIDER_RPM = "0"
+DEFAULT_LLM_RPM = "0"
+DEFAULT_BURST = "5"
+
+
+class TokenBucket:
+    """
+    프로세스 내부 토큰 버킷
+
+    초당 rate개씩 토큰이 채워지고, 최대 capacity개까지 쌓입니다.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+        self._acquired = 0
+        self._waited = 0
+        self._total_wait = 0.0
+
+    def _take(self, tokens: float) -> float:
+        """
+        토큰을 가져옵니다. 성공하면 0, 부족하면 토큰이 찰 때까지 남은 시간(초)을 반환합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    async def _atake(self, tokens: float) -> float:
+        """_take의 비동기 버전 (메모리 버킷은 잠금 구간이 짧아 이벤트 루프에서 바로 실행)"""
+        return self._take(tokens)
+
+    def _record(self, waited: float) -> None:
+        with self._lock:
+            self._acquired += 1
+            if waited > 0:
+                self._waited += 1
+                self._total_wait += waited
+
+        if waited > 0:
+            incr(f"rate_limit.{self.name}.throttled")
+            observe(f"rate_limit.{self.name}.wait", waited)
+
+    def acquire(self, tokens: float = 1, blocking: bool = True) -> bool:
+        """
+        토큰을 얻을 때까지 대기합니다.
+
+        Args:
+            tokens: 필요한 토큰 수
+            blocking: False면 기다리지 않고 즉시 성공 여부를 반환
+
+        Returns:
+            토큰을 얻었으면 True
+        """
+        started = time.monotonic()
+        waited = False
+        while True:
+            wait_seconds = self._take(tokens)
+            if wait_seconds <= 0:
+                self._record(time.monotonic() - started if waited else 0.0)
+                return True
+            if not blocking:
+                return False
+            waited = True
+            time.sleep(wait_seconds)
+
+    async def aacquire(self, tokens: float = 1, blocking: bool = True) -> bool:
+        """acquire의 비동기 버전 (이벤트 루프를 막지 않고 대기)"""
+        started = time.monotonic()
+        waited = False
+        while True:
+            wait_seconds = await self._atake(tokens)
+            if wait_seconds <= 0:
+                self._record(time.monotonic() - started if waited else 0.0)
+                return True
+            if not blocking:
+                return False
+            waited = True
+            await asyncio.sleep(wait_seconds)
+
+    def stats(self) -> Dict:
+        """획득 횟수, 대기한 횟수, 누적 대기 시간을 반환합니다."""
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "capacity": self.capacity,
+                "acquired": self._acquired,
+                "throttled": self._waited,
+                "total_wait_seconds": round(self._total_wait, 3),
+            }
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """
+    SQLite 파일에 상태를 저장하는 토큰 버킷
+
+    같은 파일을 사용하는 여러 프로세스가 하나의 한도를 공유합니다.
+    (BEGIN IMMEDIATE로 채우기-가져오기를 원자적으로 처리)
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float, path: str):
+        super().__init__(name, rate, capacity)
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                " name TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+
+    def _take(self, tokens: float) -> float:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 프로세스 간에 비교 가능한 벽시계 시간 사용
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at FROM rate_buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+
+                available = self.capacity
+                if row is not None:
+                    available = min(self.capacity, row[0] + max(now - row[1], 0) * self.rate)
+
+                wait_seconds = 0.0
+                if available >= tokens:
+                    available -= tokens
+                else:
+                    wait_seconds = (tokens - available) / self.rate
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (self.name, available, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return wait_seconds
+
+    async def _atake(self, tokens: float) -> float:
+        # 다른 프로세스가 쓰기 잠금을 잡고 있으면 BEGIN IMMEDIATE가 대기하므로 이벤트 루프 밖에서 실행
+        return await asyncio.to_thread(self._take, tokens)
+
+
+class BucketRateLimiter(BaseRateLimiter):
+    """
+    LangChain 채팅 모델의 rate_limiter 인자로 넘길 수 있는 어댑터
+    """
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        return self.bucket.acquire(blocking=blocking)
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        return await self.bucket.aacquire(blocking=blocking)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _get_bucket(name: str, requests_per_minute: float) -> Optional[TokenBucket]:
+    """이름별 프로세스 전역 버킷을 반환합니다. 분당 요청 수가 0 이하이면 None."""
+    if requests_per_minute <= 0:
+        return None
+
+    with _buckets_lock:
+        bucket = _buckets.get(name)
+        if bucket is None:
+            rate = requests_per_minute / 60
+            capacity = max(float(os.getenv("RATE_LIMIT_BURST", DEFAULT_BURST)), 1.0)
+            store = os.getenv("RATE_LIMIT_STORE")
+            if store:
+                bucket = SQLiteTokenBucket(name, rate, capacity, store)
+            else:
+                bucket = TokenBucket(name, rate, capacity)
+            _buckets[name] = bucket
+        return bucket
+
+
+def get_search_rate_limiter(provider_name: str = "tavily") -> Optional[TokenBucket]:
+    """
+    검색 제공자별 토큰 버킷을 반환합니다. (제한이 없으면 None)
+    """
+    rpm = os.getenv(f"RATE_LIMIT_{provider_name.upper()}_RPM", DEFAULT_PROVIDER_RPM)
+    return _get_bucket(f"search.{provider_name}", float(rpm))
+
+
+def get_llm_rate_limiter(model_name: str) -> Optional[BucketRateLimiter]:
+    """
+    LLM 모델별 rate limiter를 반환합니다. (제한이 없으면 None)
+    """
+    env_suffix = re.sub(r"[^A-Z0-9]", "_", model_name.upper())
+    rpm = os.getenv(f"RATE_LIMIT_LLM_RPM__{env_suffix}", os.getenv("RATE_LIMIT_LLM_RPM", DEFAULT_LLM_RPM))
+
+    bucket = _get_bucket(f"llm.{model_name}", float(rpm))
+    return BucketRateLimiter(bucket) if bucket else None
+
+
+def get_rate_limit_stats() -> Dict[str, Dict]:
+    """버킷별 획득/대기 통계를 반환합니다."""
+    with _buckets_lock:
+        buckets = list(_buckets.values())
+    return {bucket.name: bucket.stats() for bucket in buckets}
@@ -0,0 +1,311 @@
+"""
+검색/LLM 호출 기록 및 재생 (Record / Replay)
+Tavily 검색과 Gemini 호출의 요청/응답을 카세트 파일(JSONL)에 기록하고,
+재생 모드에서는 네트워크 없이 파일에서 응답을 돌려줍니다.
+
+네트워크 변동 없이 파이프라인 자체(상태 병합, 파싱, 차트, PDF)의 오버헤드를
+재현 가능하게 측정하기 위한 용도입니다.
+
+환경 변수:
+    REPLAY_MODE: "off" | "record" | "replay" (기본값: off)
+    REPLAY_CASSETTE: 카세트 파일 경로 (기본값: cassettes/default.jsonl)
+    REPLAY_LATENCY: 재생 시 지연 시뮬레이션
+        - "0": 지연 없음 (기본값)
+        - "recorded": 기록된 실제 소요 시간만큼 대기
+        - 숫자: 호출마다 고정 시간(초) 대기
+
+주의: 활성 카세트는 프로세스 전역이므로, 한 프로세스에서 서로 다른 카세트로
+여러 리서치를 동시에 실행하는 것은 지원하지 않습니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from dotenv import load_dotenv
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+load_dotenv()
+
+REPLAY_MODES = ("off", "record", "replay")
+
+
+class CassetteMissError(LookupError):
+    """재생 모드에서 기록되지 않은 요청이 들어온 경우"""
+
+
+class Cassette:
+    """
+    요청/응답 기록 파일
+
+    같은 요청이 여러 번 기록되었다면 재생 시 기록된 순서대로 돌려주고,
+    모두 소진되면 마지막 응답을 반복합니다.
+    """
+
+    def __init__(self, path: str, mode: str, latency: str = "0"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"지원하지 않는 카세트 모드입니다: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict]] = {}
+        self._cursor: Dict[str, int] = {}
+
+        if mode == "replay":
+            self._load()
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # 기록 모드는 새 파일로 시작
+            open(path, "w", encoding="utf-8").close()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"카세트 파일이 없습니다: {self.path}")
+
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                self._entries.setdefault(entry["key"], []).append(entry)
+
+    @staticmethod
+    def make_key(kind: str, request: Dict) -> str:
+        raw = json.dumps({"kind": kind, "request": request}, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _delay(self, entry: Dict) -> float:
+        if self.latency in ("", "0", None):
+            return 0.0
+        if self.latency == "recorded":
+            return float(entry.get("elapsed", 0.0))
+        return float(self.latency)
+
+    def lookup(self, kind: str, request: Dict) -> Dict:
+        """
+        기록된 응답 항목을 반환합니다. (지연 시뮬레이션은 호출자가 sleep_for로 처리)
+
+        Raises:
+            CassetteMissError: 기록되지 않은 요청
+        """
+        key = self.make_key(kind, request)
+
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMissError(f"카세트에 기록되지 않은 {kind} 요청입니다: {json.dumps(request, ensure_ascii=False, default=str)[:200]}")
+
+            position = self._cursor.get(key, 0)
+            entry = entries[min(position, len(entries) - 1)]
+            self._cursor[key] = position + 1
+
+        return entry
+
+    def sleep_for(self, entry: Dict) -> None:
+        delay = self._delay(entry)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def asleep_for(self, entry: Dict) -> None:
+        delay = self._delay(entry)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, kind: str, request: Dict, response: Any, elapsed: float) -> None:
+        """요청/응답 한 쌍을 파일에 추가합니다."""
+        entry = {
+            "kind": kind,
+            "key": self.make_key(kind, request),
+            "request": request,
+            "response": response,
+            "elapsed": round(elapsed, 4),
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+
+        with self._lock:
+            self._entries.setdefault(entry["key"], []).append(entry)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+_active_cassette: Optional[Cassette] = None
+_env_checked = False
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    현재 활성화된 카세트를 반환합니다. 없으면 REPLAY_MODE 환경 변수를 확인합니다.
+    """
+    global _active_cassette, _env_checked
+
+    if _active_cassette is not None or _env_checked:
+        return _active_cassette
+
+    with _cassette_lock:
+        if not _env_checked:
+            mode = os.getenv("REPLAY_MODE", "off").lower()
+            if mode in ("record", "replay"):
+                _active_cassette = Cassette(
+                    path=os.getenv("REPLAY_CASSETTE", "cassettes/default.jsonl"),
+                    mode=mode,
+                    latency=os.getenv("REPLAY_LATENCY", "0"),
+                )
+            _env_checked = True
+
+    return _active_cassette
+
+
+@contextmanager
+def use_cassette(mode: Optional[str], path: Optional[str] = None, latency: Optional[str] = None) -> Iterator[Optional[Cassette]]:
+    """
+    블록 안에서 지정한 모드의 카세트를 활성화합니다.
+    mode가 None이면 환경 변수 설정을 그대로 사용합니다.
+
+    Example:
+        with use_cassette("replay", "cassettes/ai_trend.jsonl", latency="recorded"):
+            app.invoke(initial_state)
+    """
+    global _active_cassette, _env_checked
+
+    if mode is None:
+        yield get_cassette()
+        return
+
+    if mode not in REPLAY_MODES:
+        raise ValueError(f"replay_mode는 {REPLAY_MODES} 중 하나여야 합니다: {mode}")
+
+    with _cassette_lock:
+        previous, previous_checked = _active_cassette, _env_checked
+        _active_cassette = None if mode == "off" else Cassette(
+            path=path or os.getenv("REPLAY_CASSETTE", "cassettes/default.jsonl"),
+            mode=mode,
+            latency=latency if latency is not None else os.getenv("REPLAY_LATENCY", "0"),
+        )
+        _env_checked = True
+
+    try:
+        yield _active_cassette
+    finally:
+        with _cassette_lock:
+            _active_cassette, _env_checked = previous, previous_checked
+
+
+class CassetteSearchClient:
+    """
+    Tavily 클라이언트와 같은 search/asearch 인터페이스로 카세트를 기록/재생합니다.
+    재생 모드에서는 실제 클라이언트(와 API 키)가 필요 없습니다.
+    """
+
+    def __init__(self, cassette: Cassette, inner: Any = None):
+        self.cassette = cassette
+        self.inner = inner
+
+    def search(self, query: str, **params) -> Dict:
+        request = {"query": query, **params}
+
+        if self.cassette.mode == "replay":
+            entry = self.cassette.lookup("search", request)
+            self.cassette.sleep_for(entry)
+            return entry["response"]
+
+        started = time.perf_counter()
+        response = self.inner.search(query=query, **params)
+        self.cassette.record("search", request, response, time.perf_counter() - started)
+        return response
+
+    async def asearch(self, query: str, **params) -> Dict:
+        request = {"query": query, **params}
+
+        if self.cassette.mode == "replay":
+            entry = self.cassette.lookup("search", request)
+            await self.cassette.asleep_for(entry)
+            return entry["response"]
+
+        started = time.perf_counter()
+        response = await self.inner.asearch(query=query, **params)
+        self.cassette.record("search", request, response, time.perf_counter() - started)
+        return response
+
+
+class CassetteChatModel(BaseChatModel):
+    """
+    채팅 모델 호출을 카세트로 기록/재생하는 래퍼
+
+    prompt | llm 체인에 그대로 사용할 수 있으며,
+    요청 키는 (모델, 온도, 렌더링된 메시지)로 결정됩니다.
+    """
+
+    cassette: Any
+    inner: Optional[BaseChatModel] = None
+    model_name: str = ""
+    temperature: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    def _request(self, messages: List[BaseMessage]) -> Dict:
+        return {
+            "model": self.model_name,
+            "temperature": self.temperature,
+            "messages": [{"type": m.type, "content": m.content} for m in messages],
+        }
+
+    @staticmethod
+    def _to_result(response: Dict) -> ChatResult:
+        message = AIMessage(
+            content=response.get("content", ""),
+            usage_metadata=response.get("usage_metadata"),
+            response_metadata=response.get("response_metadata") or {},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @staticmethod
+    def _to_response(message: BaseMessage) -> Dict:
+        return {
+            "content": message.content,
+            "usage_metadata": getattr(message, "usage_metadata", None),
+            "response_metadata": getattr(message, "response_metadata", {}),
+        }
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        request = self._request(messages)
+
+        if self.cassette.mode == "replay":
+            entry = self.cassette.lookup("llm", request)
+            self.cassette.sleep_for(entry)
+            return self._to_result(entry["response"])
+
+        started = time.perf_counter()
+        message = self.inner.invoke(messages, stop=stop, **kwargs)
+        response = self._to_response(message)
+        self.cassette.record("llm", request, response, time.perf_counter() - started)
+        return self._to_result(response)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        request = self._request(messages)
+
+        if self.cassette.mode == "replay":
+            entry = self.cassette.lookup("llm", request)
+            await self.cassette.asleep_for(entry)
+            return self._to_result(entry["response"])
+
+        started = time.perf_counter()
+        message = await self.inner.ainvoke(messages, stop=stop, **kwargs)
+        response = self._to_response(message)
+        self.cassette.record("llm", request, response, time.perf_counter() - started)
+        return self._to_result(response)
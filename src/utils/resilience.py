@@ -0,0 +1,309 @@
+"""
+외부 호출 복원력 (Resilience)
+요청별 제한 시간, 지터가 있는 지수 백오프 재시도, 헤지(hedged) 요청, 서킷 브레이커를 제공합니다.
+
+재시도/타임아웃/헤지 횟수는 현재 실행의 메트릭(run_metrics)에 기록됩니다.
+"""
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from .run_metrics import incr
+
+T = TypeVar("T")
+
+# 제한 시간 초과로 포기한 호출은 스레드에서 끝까지 실행되므로 별도 풀을 사용
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="resilient-call")
+
+# 현재 시도의 마감 시각 (time.monotonic 기준)
+# 전송 계층이 attempt_time_left()로 읽어 HTTP 타임아웃으로 사용하므로,
+# 포기한 시도도 마감 시각에 끝나 작업 스레드를 오래 잡고 있지 않습니다.
+_attempt_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("attempt_deadline", default=None)
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷 브레이커가 열려 호출을 건너뛴 경우"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold에 도달하면 reset_timeout 동안 호출을 차단합니다.
+    차단 시간이 지나면 한 번의 시험 호출(half-open)을 허용하고, 성공하면 다시 닫힙니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """호출을 허용할지 여부"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """
+        상태를 바꾸지 않고 시험 호출만 끝냅니다.
+        (잘못된 요청처럼 백엔드 상태와 무관한 오류는 성공/실패로 세지 않음)
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> CircuitBreaker:
+    """이름별 프로세스 전역 서킷 브레이커를 반환합니다."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+            _breakers[name] = breaker
+        return breaker
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """지터가 있는 지수 백오프 (full jitter)"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def attempt_time_left(default: float) -> float:
+    """
+    call_with_resilience 안에서 실행 중이면 현재 시도의 남은 제한 시간(초)을, 아니면 default를 반환합니다.
+    """
+    deadline = _attempt_deadline.get()
+    if deadline is None:
+        return default
+    return max(deadline - time.monotonic(), 0.1)
+
+
+def _submit(fn: Callable[[], T], deadline: Optional[float]):
+    # 호출 스레드의 contextvar(현재 실행 메트릭 등)와 시도 마감 시각을 작업 스레드로 전달
+    context = contextvars.copy_context()
+    context.run(_attempt_deadline.set, deadline)
+    return _executor.submit(context.run, fn)
+
+
+def _call_once(fn: Callable[[], T], name: str, timeout: Optional[float], hedge_after: Optional[float],
+               rate_limiter=None) -> T:
+    """제한 시간과 헤지 요청을 적용한 단일 시도"""
+    # 속도 제한 대기는 제한 시간에 포함하지 않음 (한도 초과 시 실패 대신 대기)
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+
+    if not timeout and not hedge_after:
+        return fn()
+
+    deadline = time.monotonic() + timeout if timeout else None
+    futures = [_submit(fn, deadline)]
+
+    if hedge_after and (deadline is None or hedge_after < timeout):
+        done, _ = wait(futures, timeout=hedge_after)
+        # 헤지 요청은 속도 제한 토큰이 바로 있을 때만 보냄 (429 유발 방지)
+        if not done and (rate_limiter is None or rate_limiter.acquire(blocking=False)):
+            incr(f"{name}.hedges")
+            futures.append(_submit(fn, deadline))
+
+    errors = []
+    while futures:
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        done, pending = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+
+        if not done:
+            raise TimeoutError(f"{name}: {timeout}초 안에 응답이 없습니다.")
+
+        for future in done:
+            if future.exception() is None:
+                if len(futures) > 1 and future is not futures[0]:
+                    incr(f"{name}.hedge_wins")
+                return future.result()
+            errors.append(future.exception())
+
+        futures = list(pending)
+
+    raise errors[-1]
+
+
+def call_with_resilience(
+    fn: Callable[[], T],
+    name: str,
+    timeout: Optional[float] = None,
+    retries: int = 2,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    hedge_after: Optional[float] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    is_retryable: Callable[[BaseException], bool] = lambda e: True,
+    rate_limiter=None,
+) -> T:
+    """
+    fn을 제한 시간/재시도/헤지/서킷 브레이커를 적용해 호출합니다.
+
+    Args:
+        fn: 인자 없는 호출 함수
+        name: 메트릭 이름 접두어 (예: "search")
+        timeout: 시도별 제한 시간(초)
+        retries: 최대 재시도 횟수
+        hedge_after: 이 시간(초) 안에 응답이 없으면 같은 요청을 한 번 더 보냄
+        breaker: 서킷 브레이커
+        is_retryable: 재시도할 예외인지 판별하는 함수 (재시도하지 않는 예외는 서킷 브레이커 실패로 세지 않음)
+        rate_limiter: 시도마다 토큰을 얻을 토큰 버킷 (rate_limiter.TokenBucket)
+
+    Raises:
+        CircuitOpenError: 서킷 브레이커가 열려 있는 경우
+    """
+    for attempt in range(retries + 1):
+        if breaker is not None and not breaker.allow():
+            incr(f"{name}.circuit_open")
+            raise CircuitOpenError(f"{breaker.name} 서킷이 열려 있어 호출을 건너뜁니다.")
+
+        try:
+            result = _call_once(fn, name, timeout, hedge_after, rate_limiter)
+        except Exception as e:
+            timed_out = isinstance(e, TimeoutError)
+            if timed_out:
+                incr(f"{name}.timeouts")
+            if breaker is not None:
+                # 재시도할 가치가 있는 오류(네트워크, 429, 5xx 등)와 시간 초과만 장애로 집계
+                if timed_out or is_retryable(e):
+                    breaker.record_failure()
+                else:
+                    breaker.release()
+            if attempt >= retries or not is_retryable(e):
+                incr(f"{name}.failures")
+                raise
+            incr(f"{name}.retries")
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+            continue
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+
+async def _acall_once(factory: Callable[[], Awaitable[T]], name: str, timeout: Optional[float],
+                      hedge_after: Optional[float], rate_limiter=None) -> T:
+    """제한 시간과 헤지 요청을 적용한 단일 비동기 시도"""
+    if rate_limiter is not None:
+        await rate_limiter.aacquire()
+
+    tasks = [asyncio.ensure_future(factory())]
+    deadline = asyncio.get_running_loop().time() + timeout if timeout else None
+
+    try:
+        if hedge_after and (timeout is None or hedge_after < timeout):
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done and (rate_limiter is None or await rate_limiter.aacquire(blocking=False)):
+                incr(f"{name}.hedges")
+                tasks.append(asyncio.ensure_future(factory()))
+
+        pending = set(tasks)
+        errors = []
+        while pending:
+            remaining = None if deadline is None else max(deadline - asyncio.get_running_loop().time(), 0)
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                raise TimeoutError(f"{name}: {timeout}초 안에 응답이 없습니다.")
+
+            for task in done:
+                if task.exception() is None:
+                    if task is not tasks[0]:
+                        incr(f"{name}.hedge_wins")
+                    return task.result()
+                errors.append(task.exception())
+
+        raise errors[-1]
+
+    finally:
+        # 남은 요청(헤지의 패자, 시간 초과분) 취소
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def acall_with_resilience(
+    factory: Callable[[], Awaitable[T]],
+    name: str,
+    timeout: Optional[float] = None,
+    retries: int = 2,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    hedge_after: Optional[float] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    is_retryable: Callable[[BaseException], bool] = lambda e: True,
+    rate_limiter=None,
+) -> T:
+    """
+    call_with_resilience의 비동기 버전. factory는 호출할 때마다 새 코루틴을 반환해야 합니다.
+    """
+    for attempt in range(retries + 1):
+        if breaker is not None and not breaker.allow():
+            incr(f"{name}.circuit_open")
+            raise CircuitOpenError(f"{breaker.name} 서킷이 열려 있어 호출을 건너뜁니다.")
+
+        try:
+            result = await _acall_once(factory, name, timeout, hedge_after, rate_limiter)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            timed_out = isinstance(e, TimeoutError)
+            if timed_out:
+                incr(f"{name}.timeouts")
+            if breaker is not None:
+                # 재시도할 가치가 있는 오류(네트워크, 429, 5xx 등)와 시간 초과만 장애로 집계
+                if timed_out or is_retryable(e):
+                    breaker.record_failure()
+                else:
+                    breaker.release()
+            if attempt >= retries or not is_retryable(e):
+                incr(f"{name}.failures")
+                raise
+            incr(f"{name}.retries")
+            await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+            continue
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
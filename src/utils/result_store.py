@@ -0,0 +1,171 @@
+"""
+검색 결과 저장소
+반복 검색으로 누적되는 결과를 신뢰도 순으로 유지하는 리스트입니다.
+
+매 반복마다 전체 결과를 다시 합치고 정렬하는 대신, 새 결과만 이진 탐색으로
+제자리에 삽입합니다. canonical URL / SimHash 색인으로 중복을 걸러내며,
+list를 상속하므로 기존 코드(len, 슬라이싱, 반복)에서 그대로 사용할 수 있습니다.
+
+복잡도: 위치 탐색은 O(log n)이지만 list 삽입은 포인터 이동(memmove) O(n)이므로
+k개 추가는 O(k log n + k·n)입니다. reducer가 이전 상태를 보존하려고 저장소를 복사(O(n))하므로
+힙이나 블록 정렬 컨테이너를 써도 반복당 비용은 O(n) 아래로 내려가지 않고,
+수백 개 규모에서는 C 수준 memmove가 파이썬 수준 자료구조보다 빠릅니다.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+from .content_dedup import NearDuplicateIndex, fingerprint_result
+
+
+def _unsupported(name: str):
+    def method(self, *args, **kwargs):
+        raise TypeError(
+            f"ResultStore.{name}()는 지원하지 않습니다. "
+            "정렬과 중복 색인, version이 유지되도록 add / add_many로 추가하세요."
+        )
+    method.__name__ = name
+    return method
+
+
+class ResultStore(list):
+    """
+    trust_score 내림차순으로 정렬된 상태를 유지하는 검색 결과 리스트
+
+    삽입은 add / add_many로만 수행해야 정렬과 색인이 유지되므로,
+    list의 변경 메서드(append, sort, 인덱스 대입 등)는 TypeError를 발생시킵니다.
+    같은 점수끼리는 먼저 들어온 결과가 앞에 옵니다.
+    """
+
+    append = _unsupported("append")
+    extend = _unsupported("extend")
+    insert = _unsupported("insert")
+    remove = _unsupported("remove")
+    pop = _unsupported("pop")
+    clear = _unsupported("clear")
+    sort = _unsupported("sort")
+    reverse = _unsupported("reverse")
+    __setitem__ = _unsupported("__setitem__")
+    __delitem__ = _unsupported("__delitem__")
+    __iadd__ = _unsupported("__iadd__")
+    __imul__ = _unsupported("__imul__")
+
+    def __init__(self, results: Optional[Iterable[Dict]] = None):
+        super().__init__()
+        self._sort_keys: List[tuple] = []
+        self._key_by_seq: Dict[int, tuple] = {}
+        self._item_by_seq: Dict[int, Dict] = {}
+        self._next_seq = 0
+        self._index = NearDuplicateIndex()
+
+        # 결과가 바뀔 때마다 증가 (캐시 무효화용)
+        self.version = 0
+
+        # 이 결과로 만든 파생 값(프롬프트용 문자열 등) 캐시 - 키에 version을 포함해 사용
+        # (list 상속이라 해시할 수 없으므로 외부 dict 대신 저장소에 직접 둠)
+        self.derived_cache: Dict[tuple, object] = {}
+
+        if results:
+            self.add_many(results)
+
+    def _insert(self, result: Dict, seq: int) -> None:
+        sort_key = (-result.get("trust_score", 0), seq)
+        position = bisect_right(self._sort_keys, sort_key)
+        self._sort_keys.insert(position, sort_key)
+        list.insert(self, position, result)
+        self._key_by_seq[seq] = sort_key
+        self._item_by_seq[seq] = result
+
+    def _remove(self, seq: int) -> None:
+        sort_key = self._key_by_seq.pop(seq)
+        position = bisect_left(self._sort_keys, sort_key)
+        del self._sort_keys[position]
+        list.__delitem__(self, position)
+        del self._item_by_seq[seq]
+
+    def add(self, result: Dict) -> bool:
+        """
+        결과 하나를 추가합니다.
+        중복이면 신뢰도가 더 높을 때만 기존 사본을 교체합니다.
+
+        Returns:
+            저장소가 변경되었으면 True
+        """
+        fingerprint_result(result)
+        duplicate = self._index.find(result)
+
+        if duplicate is None:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._insert(result, seq)
+            self._index.add(result, seq)
+            self.version += 1
+            return True
+
+        existing = self._item_by_seq[duplicate]
+        if result.get("trust_score", 0) <= existing.get("trust_score", 0):
+            return False
+
+        self._remove(duplicate)
+        self._insert(result, duplicate)
+        self._index.add(result, duplicate)
+        self.version += 1
+        return True
+
+    def add_many(self, results: Iterable[Dict]) -> int:
+        """
+        여러 결과를 추가하고, 실제로 반영된 개수를 반환합니다.
+        """
+        return sum(1 for result in results if self.add(result))
+
+    def contains(self, result: Dict) -> bool:
+        """같은 문서(URL 변형/근접 중복 포함)가 이미 있는지 확인합니다."""
+        return self._index.find(fingerprint_result(result)) is not None
+
+    def find(self, result: Dict) -> Optional[Dict]:
+        """같은 문서의 기존 사본을 반환합니다. 없으면 None."""
+        duplicate = self._index.find(fingerprint_result(result))
+        return self._item_by_seq[duplicate] if duplicate is not None else None
+
+    def copy(self) -> "ResultStore":
+        """
+        같은 결과 dict를 공유하는 새 저장소를 반환합니다. (정렬 키, 색인, 파생 값 캐시 포함)
+        이후 어느 한쪽에 추가해도 다른 쪽은 바뀌지 않습니다.
+        """
+        clone = ResultStore()
+        list.extend(clone, self)
+        clone._sort_keys = list(self._sort_keys)
+        clone._key_by_seq = dict(self._key_by_seq)
+        clone._item_by_seq = dict(self._item_by_seq)
+        clone._next_seq = self._next_seq
+        clone._index = self._index.copy()
+        clone.version = self.version
+        clone.derived_cache = dict(self.derived_cache)
+        return clone
+
+    def __reduce__(self):
+        # pickle / copy.deepcopy는 list 항목을 append/extend로 복원하므로 add_many로 다시 만들도록 지정
+        return self.__class__, (list(self),)
+
+    def top_n(self, n: int) -> List[Dict]:
+        """신뢰도 상위 n개를 반환합니다. (정렬 없이 앞에서 잘라냄)"""
+        return list.__getitem__(self, slice(0, n))
+
+
+def merge_search_results(existing: Optional[List[Dict]], new: Optional[List[Dict]]) -> ResultStore:
+    """
+    ResearchState.search_results의 reducer
+
+    노드는 이번에 새로 수집한 결과만 반환하고, 누적/중복 제거/정렬은 여기서 처리합니다.
+    이전 상태(스트림 스냅샷, 체크포인트)가 바뀌지 않도록 기존 저장소는 수정하지 않고 복사본에 추가합니다.
+    """
+    if isinstance(existing, ResultStore):
+        if not new or new is existing:
+            return existing
+        store = existing.copy()
+    else:
+        store = ResultStore(existing or [])
+
+    if new:
+        store.add_many(new)
+    return store
@@ -0,0 +1,95 @@
+"""
+실행(run) 단위 메트릭
+리서치 실행 한 번 동안 발생한 카운터(재시도, 타임아웃 등)와 소요 시간을 모읍니다.
+
+현재 실행의 메트릭은 contextvar로 전달되므로, 직접 만든 스레드 풀에서
+기록하려면 contextvars.copy_context().run으로 작업을 제출해야 합니다.
+"""
+
+import math
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    nearest-rank 방식의 백분위수를 반환합니다. (q: 0~100)
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class RunMetrics:
+    """스레드 안전한 카운터/타이밍 수집기"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+        self.timings: Dict[str, List[float]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.timings.setdefault(name, []).append(seconds)
+
+    def summary(self) -> Dict:
+        """카운터와 타이밍 통계(횟수/합계/p50/p95/최대)를 dict로 반환합니다."""
+        with self._lock:
+            timings = {
+                name: {
+                    "count": len(values),
+                    "total": round(sum(values), 4),
+                    "p50": round(percentile(values, 50), 4),
+                    "p95": round(percentile(values, 95), 4),
+                    "max": round(max(values), 4),
+                }
+                for name, values in self.timings.items()
+                if values
+            }
+            return {"counters": dict(self.counters), "timings": timings}
+
+
+_current_metrics: ContextVar[Optional[RunMetrics]] = ContextVar("current_run_metrics", default=None)
+
+
+def get_run_metrics() -> Optional[RunMetrics]:
+    """현재 실행의 메트릭을 반환합니다. 실행 밖에서는 None."""
+    return _current_metrics.get()
+
+
+def incr(name: str, value: float = 1) -> None:
+    """현재 실행의 카운터를 증가시킵니다. (실행 밖에서는 무시)"""
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.incr(name, value)
+
+
+def observe(name: str, seconds: float) -> None:
+    """현재 실행의 소요 시간을 기록합니다. (실행 밖에서는 무시)"""
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.observe(name, seconds)
+
+
+@contextmanager
+def track_run_metrics(metrics: Optional[RunMetrics] = None) -> Iterator[RunMetrics]:
+    """
+    블록 안의 호출이 기록하는 메트릭을 모읍니다.
+
+    Example:
+        with track_run_metrics() as metrics:
+            app.invoke(initial_state)
+        print(metrics.summary())
+    """
+    metrics = metrics or RunMetrics()
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
@@ -0,0 +1,84 @@
+"""
+검색 결과 캐시
+동일한(정규화된) 쿼리와 검색 옵션에 대한 Tavily 응답을 디스크에 재사용합니다.
+
+캐시된 결과는 TTL 동안 갱신되지 않으므로, 최신 정보가 중요한 주제에서 사용자가 모르게
+오래된 결과를 받지 않도록 명시적으로 켠 경우에만 사용합니다. (반복 실험, 개발 중 재실행 등)
+
+환경 변수:
+    SEARCH_CACHE_ENABLED: "true"로 설정하면 캐시 활성화 (기본값: false)
+    SEARCH_CACHE_PATH: SQLite 파일 경로 (기본값: .cache/search_cache.sqlite3)
+    SEARCH_CACHE_TTL: 유효 시간(초) (기본값: 86400)
+    SEARCH_CACHE_MAX_ENTRIES: 최대 저장 항목 수 (기본값: 5000)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Iterable, Optional
+
+from dotenv import load_dotenv
+from .disk_cache import DiskCache
+from .replay import get_cassette
+
+load_dotenv()
+
+_cache: Optional[DiskCache] = None
+_cache_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """
+    대소문자, 유니코드 표기, 공백 차이를 제거한 쿼리 문자열을 반환합니다.
+    """
+    query = unicodedata.normalize("NFKC", query).lower()
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def make_search_cache_key(
+    query: str,
+    max_results: int,
+    search_depth: str,
+    exclude_domains: Optional[Iterable[str]] = None,
+    provider: str = "tavily",
+) -> str:
+    """
+    검색 요청을 식별하는 캐시 키를 생성합니다.
+    """
+    payload = {
+        "provider": provider,
+        "query": normalize_query(query),
+        "max_results": max_results,
+        "search_depth": search_depth,
+        "exclude_domains": sorted(exclude_domains or []),
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_search_cache() -> Optional[DiskCache]:
+    """
+    프로세스 전역 검색 캐시를 반환합니다. 비활성화된 경우 None을 반환합니다.
+
+    기록/재생 모드에서는 모든 검색이 카세트를 거치도록 캐시를 사용하지 않습니다.
+    """
+    global _cache
+
+    if os.getenv("SEARCH_CACHE_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return None
+
+    if get_cassette() is not None:
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DiskCache(
+                    path=os.getenv("SEARCH_CACHE_PATH", ".cache/search_cache.sqlite3"),
+                    ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL", "86400")),
+                    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000")),
+                )
+    return _cache
@@ -4,21 +4,85 @@ Tavily 검색 클라이언트
 """
 
 import os
+import json
+import time
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
 from dotenv import load_dotenv
-from tavily import TavilyClient
-from typing import List, Dict
+from typing import List, Dict, Optional
+from .tavily_pool import PooledTavilyClient, get_pooled_client, resize_pools, get_pool_stats
+from .replay import get_cassette, CassetteSearchClient, CassetteMissError
+from .rate_limiter import get_search_rate_limiter
+from .resilience import (
+    CircuitBreaker,
+    attempt_time_left,
+    get_circuit_breaker,
+    call_with_resilience,
+    acall_with_resilience,
+)
+from .run_metrics import incr, observe
+from tavily.errors import BadRequestError, ForbiddenError, InvalidAPIKeyError, MissingAPIKeyError
 
 # 환경 변수 로드
 load_dotenv()
 
+# 비동기 검색 전역 설정
+# - SEARCH_MAX_CONCURRENCY: 프로세스 전체에서 동시에 진행되는 검색 요청 수 상한 (동기/비동기 공통)
+# - SEARCH_TIMEOUT: 요청별 제한 시간(초)
+SEARCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_MAX_CONCURRENCY", "5"))
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "30"))
 
-def get_tavily_client() -> TavilyClient:
+# 검색 호출 복원력 설정
+# - SEARCH_RETRIES: 실패/시간 초과 시 최대 재시도 횟수 (지터가 있는 지수 백오프)
+# - SEARCH_RETRY_BASE_DELAY: 첫 재시도 대기 시간 상한(초)
+# - SEARCH_HEDGE_AFTER: 이 시간(초) 안에 응답이 없으면 같은 요청을 한 번 더 보냄 (0이면 비활성화)
+# - SEARCH_BREAKER_THRESHOLD / SEARCH_BREAKER_RESET: 연속 실패 몇 번에 몇 초간 호출을 차단할지
+SEARCH_RETRIES = int(os.getenv("SEARCH_RETRIES", "2"))
+SEARCH_RETRY_BASE_DELAY = float(os.getenv("SEARCH_RETRY_BASE_DELAY", "0.5"))
+SEARCH_HEDGE_AFTER = float(os.getenv("SEARCH_HEDGE_AFTER", "0"))
+SEARCH_BREAKER_THRESHOLD = int(os.getenv("SEARCH_BREAKER_THRESHOLD", "5"))
+SEARCH_BREAKER_RESET = float(os.getenv("SEARCH_BREAKER_RESET", "30"))
+
+# 재시도해도 결과가 달라지지 않는 오류 (잘못된 요청, 인증 실패, 카세트 누락)
+_NON_RETRYABLE_ERRORS = (
+    BadRequestError,
+    ForbiddenError,
+    InvalidAPIKeyError,
+    MissingAPIKeyError,
+    CassetteMissError,
+    ValueError,
+)
+
+# 프로세스 전역 Tavily 클라이언트의 keep-alive 연결 풀 크기
+TAVILY_POOL_MAXSIZE = int(os.getenv("TAVILY_POOL_MAXSIZE", "10"))
+
+# 프로세스 전역 검색 슬롯
+# asyncio.Semaphore는 이벤트 루프에 묶여 스레드별 asyncio.run 작업이나 동기 경로와 공유되지 않으므로
+# 스레드 세마포어 하나를 동기(search_web 스레드 풀)와 비동기(asearch) 경로가 함께 사용
+_search_slots = threading.BoundedSemaphore(SEARCH_MAX_CONCURRENCY)
+
+# 비동기 경로에서 슬롯이 빌 때까지 확인하는 간격(초)
+_SLOT_POLL_INTERVAL = 0.01
+_SLOT_POLL_MAX_INTERVAL = 0.05
+
+
+def get_tavily_client() -> PooledTavilyClient:
     """
-    Tavily 클라이언트를 반환합니다.
+    프로세스 전역 Tavily 클라이언트를 반환합니다.
+
+    매 호출마다 새 클라이언트를 만들지 않고, keep-alive 연결 풀을 공유하는
+    클라이언트를 재사용합니다. 스레드와 비동기 코드에서 모두 안전하게 사용할 수 있습니다.
+
+    기록/재생 모드가 활성화되어 있으면 카세트 래퍼를 반환합니다.
 
     Returns:
-        TavilyClient 인스턴스
+        PooledTavilyClient 인스턴스 (TavilyClient.search와 같은 인터페이스)
     """
+    cassette = get_cassette()
+    if cassette and cassette.mode == "replay":
+        return CassetteSearchClient(cassette)
+
     api_key = os.getenv("TAVILY_API_KEY")
 
     if not api_key:
@@ -27,7 +91,183 @@ def get_tavily_client() -> TavilyClient:
             ".env 파일에 TAVILY_API_KEY를 추가해주세요."
         )
 
-    return TavilyClient(api_key=api_key)
+    client = get_pooled_client(api_key, pool_maxsize=TAVILY_POOL_MAXSIZE)
+
+    if cassette:
+        return CassetteSearchClient(cassette, inner=client)
+
+    return client
+
+
+def resize_tavily_pool(pool_maxsize: int) -> None:
+    """
+    Tavily 연결 풀 크기를 변경합니다. (예: 배치 작업 시작 전 동시 실행 수에 맞춰 조정)
+    """
+    global TAVILY_POOL_MAXSIZE
+    TAVILY_POOL_MAXSIZE = pool_maxsize
+    resize_pools(pool_maxsize)
+
+
+def get_tavily_pool_stats() -> Dict:
+    """
+    연결 재사용률과 핸드셰이크 수 등 Tavily 연결 풀 통계를 반환합니다.
+    """
+    return get_pool_stats()
+
+
+@contextmanager
+def search_slot(timeout: Optional[float] = None):
+    """
+    프로세스 전역 검색 슬롯을 하나 잡습니다. (동기 경로)
+
+    Args:
+        timeout: 슬롯을 기다릴 최대 시간(초) (None이면 무기한)
+
+    Raises:
+        TimeoutError: timeout 안에 슬롯이 비지 않은 경우
+    """
+    if not _search_slots.acquire(timeout=timeout if timeout is not None else -1):
+        raise TimeoutError(f"검색 동시 실행 슬롯을 {timeout:.1f}초 안에 얻지 못했습니다.")
+    try:
+        yield
+    finally:
+        _search_slots.release()
+
+
+@asynccontextmanager
+async def asearch_slot():
+    """
+    search_slot의 비동기 버전
+
+    대기 중인 스레드가 취소 후에 슬롯을 잡아 새는 일이 없도록, 스레드에서 블로킹 대기하지 않고
+    이벤트 루프에서 논블로킹 획득을 짧은 간격으로 반복합니다.
+    (기본 스레드 풀을 대기 작업으로 채우면 to_thread를 쓰는 검색 제공자가 멈출 수 있음)
+    """
+    interval = _SLOT_POLL_INTERVAL
+    while not _search_slots.acquire(blocking=False):
+        await asyncio.sleep(interval)
+        interval = min(interval * 2, _SLOT_POLL_MAX_INTERVAL)
+    try:
+        yield
+    finally:
+        _search_slots.release()
+
+
+def is_retryable_search_error(error: BaseException) -> bool:
+    """재시도할 가치가 있는 검색 오류인지 판별합니다. (시간 초과, 네트워크 오류, 요청 한도 초과 등)"""
+    return not isinstance(error, _NON_RETRYABLE_ERRORS)
+
+
+def get_search_breaker(provider_name: str = "tavily") -> CircuitBreaker:
+    """검색 제공자별 서킷 브레이커를 반환합니다."""
+    return get_circuit_breaker(
+        f"search:{provider_name}",
+        failure_threshold=SEARCH_BREAKER_THRESHOLD,
+        reset_timeout=SEARCH_BREAKER_RESET,
+    )
+
+
+def _get_search_rate_limiter(provider_name: str):
+    """제공자별 토큰 버킷 (카세트 재생 중에는 실제 요청이 없으므로 제한하지 않음)"""
+    cassette = get_cassette()
+    if cassette and cassette.mode == "replay":
+        return None
+    return get_search_rate_limiter(provider_name)
+
+
+def _record_search(response: Dict, started: float) -> Dict:
+    """성공한 검색의 호출 수, 응답 크기(bytes), 소요 시간을 실행 메트릭에 기록"""
+    incr("search.calls")
+    incr("search.bytes", len(json.dumps(response, ensure_ascii=False).encode("utf-8")))
+    observe("search.latency", time.perf_counter() - started)
+    return response
+
+
+def search_with_resilience(query: str, client=None, timeout: Optional[float] = None, **kwargs) -> Dict:
+    """
+    요청별 제한 시간, 재시도, 헤지 요청, 서킷 브레이커를 적용하여 검색을 수행합니다.
+    동시에 진행되는 요청 수는 asearch와 같은 프로세스 전역 슬롯(SEARCH_MAX_CONCURRENCY)으로 제한합니다.
+    제공자별 속도 제한(토큰 버킷)을 넘으면 실패하지 않고 대기합니다.
+
+    Args:
+        query: 검색 쿼리
+        client: search 메서드를 가진 클라이언트 또는 검색 제공자 (기본값: Tavily 클라이언트)
+        timeout: 시도별 제한 시간(초) (기본값: SEARCH_TIMEOUT)
+        **kwargs: 검색 옵션 (max_results, search_depth, exclude_domains 등)
+
+    Returns:
+        Tavily 형식 응답 dict
+
+    Raises:
+        CircuitOpenError: 연속 실패로 해당 제공자 호출이 차단된 경우
+        TimeoutError: 재시도까지 모두 제한 시간을 넘긴 경우
+    """
+    client = client or get_tavily_client()
+    provider_name = getattr(client, "name", "tavily")
+    timeout = timeout if timeout is not None else SEARCH_TIMEOUT
+    started = time.perf_counter()
+
+    def attempt() -> Dict:
+        # 작업 스레드에서 실행되므로 슬롯 대기 시간도 시도별 제한 시간에 포함
+        # (제한 시간이 지나 포기한 시도가 나중에 슬롯을 잡아 요청을 보내지 않도록 남은 시간만큼만 대기)
+        with search_slot(attempt_time_left(timeout) if timeout else None):
+            return client.search(query=query, **kwargs)
+
+    response = call_with_resilience(
+        attempt,
+        name="search",
+        timeout=timeout,
+        retries=SEARCH_RETRIES,
+        base_delay=SEARCH_RETRY_BASE_DELAY,
+        hedge_after=SEARCH_HEDGE_AFTER or None,
+        breaker=get_search_breaker(provider_name),
+        is_retryable=is_retryable_search_error,
+        rate_limiter=_get_search_rate_limiter(provider_name),
+    )
+    return _record_search(response, started)
+
+
+async def asearch(query: str, client=None, timeout: Optional[float] = None, **kwargs) -> Dict:
+    """
+    전역 동시 실행 제한과 요청별 타임아웃을 적용하여 Tavily 검색을 비동기로 수행합니다.
+    실패하면 지터가 있는 지수 백오프로 재시도하고, 연속 실패 시 서킷 브레이커가 호출을 차단합니다.
+    제공자별 속도 제한(토큰 버킷)을 넘으면 실패하지 않고 대기합니다.
+
+    Args:
+        query: 검색 쿼리
+        client: asearch 메서드를 가진 클라이언트 또는 검색 제공자 (기본값: Tavily 클라이언트)
+        timeout: 시도별 제한 시간(초) (기본값: SEARCH_TIMEOUT)
+        **kwargs: Tavily search 옵션 (max_results, search_depth, exclude_domains 등)
+
+    Returns:
+        Tavily 원본 응답 dict
+
+    Raises:
+        asyncio.TimeoutError: 재시도까지 모두 제한 시간 내에 응답이 없는 경우
+        CircuitOpenError: 연속 실패로 해당 제공자 호출이 차단된 경우
+    """
+    client = client or get_tavily_client()
+    provider_name = getattr(client, "name", "tavily")
+    timeout = timeout if timeout is not None else SEARCH_TIMEOUT
+
+    async def attempt() -> Dict:
+        # 슬롯 대기 시간은 타임아웃에 포함하지 않음 (실제 요청 시간만 제한)
+        # 재시도 대기 중에는 슬롯을 잡고 있지 않도록 시도마다 획득
+        async with asearch_slot():
+            return await asyncio.wait_for(client.asearch(query=query, **kwargs), timeout=timeout)
+
+    started = time.perf_counter()
+    response = await acall_with_resilience(
+        attempt,
+        name="search",
+        retries=SEARCH_RETRIES,
+        base_delay=SEARCH_RETRY_BASE_DELAY,
+        hedge_after=SEARCH_HEDGE_AFTER or None,
+        breaker=get_search_breaker(provider_name),
+        is_retryable=is_retryable_search_error,
+        rate_limiter=_get_search_rate_limiter(provider_name),
+    )
+    return _record_search(response, started)
 
 
 def search_tavily(query: str, max_results: int = 5) -> List[Dict[str, str]]:
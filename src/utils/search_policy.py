@@ -0,0 +1,91 @@
+"""
+적응형 검색 정책
+반복 회차와 정보 평가 결과(missing_info)에 따라 쿼리별 검색 깊이와 결과 수를 정합니다.
+
+- 1차 검색: 빠른 "basic" 검색으로 전반적인 자료 수집
+- 2차 이후: missing_info / 추천 키워드를 겨냥한 쿼리만 "advanced"로 격상
+- 결과 수: 아직 부족한 고신뢰 출처 수에 비례하여 증가
+
+환경 변수:
+    SEARCH_ADAPTIVE: "false"이면 항상 advanced / 3개 (기존 동작)
+"""
+
+import os
+from typing import Dict, List, Optional, Union
+
+from .text_tokenizer import tokenize
+
+DEFAULT_MAX_RESULTS = 3
+MAX_RESULTS_CAP = 8
+
+# 리포트 작성에 필요한 고신뢰(0.7 이상) 출처 목표 수
+HIGH_TRUST_TARGET = 4
+
+# 쿼리 토큰 중 missing_info 토큰과 겹치는 비율이 이 값 이상이면 부족 정보를 겨냥한 쿼리로 판단
+MISSING_INFO_OVERLAP = 0.3
+
+
+def _as_text(value: Optional[Union[str, List[str]]]) -> str:
+    if not value:
+        return ""
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    return str(value)
+
+
+def targets_missing_info(query: str, missing_info, recommended_keywords=None) -> float:
+    """
+    쿼리가 부족한 정보를 겨냥하는 정도(쿼리 토큰 중 겹치는 비율)를 반환합니다.
+    """
+    query_tokens = set(tokenize(query))
+    gap_tokens = set(tokenize(f"{_as_text(missing_info)} {_as_text(recommended_keywords)}"))
+
+    if not query_tokens or not gap_tokens:
+        return 0.0
+    return len(query_tokens & gap_tokens) / len(query_tokens)
+
+
+def plan_search(query: str, state: Dict) -> Dict:
+    """
+    쿼리 하나에 대한 검색 계획을 반환합니다.
+
+    Returns:
+        {"query", "search_depth", "max_results", "reason"}
+    """
+    if os.getenv("SEARCH_ADAPTIVE", "true").lower() in ("0", "false", "no"):
+        return {
+            "query": query,
+            "search_depth": "advanced",
+            "max_results": DEFAULT_MAX_RESULTS,
+            "reason": "적응형 정책 비활성화",
+        }
+
+    iteration = state.get("iteration_count", 0)
+    results = state.get("search_results") or []
+    high_trust_count = sum(1 for r in results if r.get("trust_score", 0) >= 0.7)
+    lacking = max(HIGH_TRUST_TARGET - high_trust_count, 0)
+
+    # 부족한 고신뢰 출처 수만큼 결과 수 확대 (1차 검색은 기본값 유지)
+    if iteration <= 1:
+        max_results = DEFAULT_MAX_RESULTS
+    else:
+        max_results = min(DEFAULT_MAX_RESULTS + lacking, MAX_RESULTS_CAP)
+
+    overlap = targets_missing_info(query, state.get("missing_info"), state.get("recommended_keywords"))
+
+    if iteration <= 1:
+        depth, reason = "basic", "1차 검색은 basic으로 빠르게 수집"
+    elif overlap >= MISSING_INFO_OVERLAP:
+        depth, reason = "advanced", f"부족한 정보를 겨냥한 쿼리 (겹침 {overlap:.0%})"
+    else:
+        depth, reason = "basic", f"부족한 정보와 관련 낮음 (겹침 {overlap:.0%})"
+
+    if max_results > DEFAULT_MAX_RESULTS:
+        reason += f", 고신뢰 출처 {lacking}개 부족 → 결과 {max_results}개"
+
+    return {
+        "query": query,
+        "search_depth": depth,
+        "max_results": max_results,
+        "reason": reason,
+    }
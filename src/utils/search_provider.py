@@ -0,0 +1,238 @@
+"""
+검색 제공자 (Search Provider)
+웹 검색 백엔드를 교체할 수 있도록 공통 인터페이스를 정의합니다.
+
+- TavilySearchProvider: Tavily API (기본값)
+- LocalSearchProvider: 로컬 코퍼스(JSONL + 역색인) 기반 검색
+  부하 테스트, 오프라인 실행, 랭킹 변경 A/B 테스트용으로 요청 제한이나 비용 없이 사용합니다.
+
+환경 변수:
+    SEARCH_PROVIDER: "tavily" | "local" (기본값: tavily)
+    LOCAL_SEARCH_CORPUS: 로컬 코퍼스 JSONL 경로 (기본값: 저장소의 data/local_corpus.jsonl 샘플)
+        한 줄에 하나씩 {"title": "...", "url": "...", "content": "..."}
+"""
+
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+from .search_client import get_tavily_client
+from .text_tokenizer import tokenize
+
+load_dotenv()
+
+# 저장소에 함께 배포되는 샘플 코퍼스 (실행 위치와 관계없이 찾을 수 있도록 절대 경로)
+DEFAULT_LOCAL_CORPUS = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "local_corpus.jsonl")
+)
+
+
+class SearchProvider(ABC):
+    """
+    검색 백엔드 공통 인터페이스
+
+    search()는 Tavily 응답과 같은 형태의 dict를 반환해야 합니다.
+        {"query": str, "results": [{"title", "url", "content", "score"}, ...]}
+    """
+
+    name: str = "base"
+
+    # 디스크 검색 캐시(search_cache) 사용 여부
+    cacheable: bool = True
+
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        max_results: int = 5,
+        search_depth: str = "basic",
+        exclude_domains: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Dict:
+        ...
+
+    async def asearch(self, query: str, **kwargs) -> Dict:
+        """비동기 검색 (기본 구현: 스레드에서 search 실행)"""
+        return await asyncio.to_thread(self.search, query, **kwargs)
+
+
+class TavilySearchProvider(SearchProvider):
+    """Tavily API 검색 (연결 풀 및 기록/재생 카세트 적용)"""
+
+    name = "tavily"
+
+    def search(self, query: str, max_results: int = 5, search_depth: str = "basic",
+               exclude_domains: Optional[List[str]] = None, **kwargs) -> Dict:
+        return get_tavily_client().search(
+            query=query,
+            max_results=max_results,
+            search_depth=search_depth,
+            exclude_domains=exclude_domains,
+            **kwargs,
+        )
+
+    async def asearch(self, query: str, **kwargs) -> Dict:
+        return await get_tavily_client().asearch(query=query, **kwargs)
+
+
+class LocalSearchProvider(SearchProvider):
+    """
+    로컬 코퍼스 BM25 검색
+
+    코퍼스 옆에 역색인 파일(<corpus>.index.json)을 만들어 두고,
+    코퍼스가 바뀌지 않았으면 다시 만들지 않고 읽어옵니다.
+    score는 Tavily처럼 0~1 범위로 정규화합니다.
+    """
+
+    name = "local"
+    cacheable = False
+
+    K1 = 1.5
+    B = 0.75
+
+    # basic 검색은 Tavily처럼 짧은 스니펫만 반환
+    BASIC_CONTENT_CHARS = 500
+
+    def __init__(self, corpus_path: str):
+        self.corpus_path = corpus_path
+        self.documents: List[Dict] = []
+        self.postings: Dict[str, List[List[int]]] = {}
+        self.doc_lengths: List[int] = []
+        self.avg_doc_length = 0.0
+        self._load()
+
+    @property
+    def index_path(self) -> str:
+        return self.corpus_path + ".index.json"
+
+    def _load(self) -> None:
+        with open(self.corpus_path, encoding="utf-8") as f:
+            self.documents = [json.loads(line) for line in f if line.strip()]
+
+        corpus_mtime = os.path.getmtime(self.corpus_path)
+
+        if os.path.exists(self.index_path) and os.path.getmtime(self.index_path) >= corpus_mtime:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("document_count") == len(self.documents):
+                self.postings = index["postings"]
+                self.doc_lengths = index["doc_lengths"]
+                self.avg_doc_length = index["avg_doc_length"]
+                return
+
+        self._build_index()
+
+    def _build_index(self) -> None:
+        postings: Dict[str, List[List[int]]] = {}
+        doc_lengths = []
+
+        for doc_id, document in enumerate(self.documents):
+            tokens = tokenize(f"{document.get('title', '')} {document.get('content', '')}")
+            doc_lengths.append(len(tokens))
+            for term, frequency in Counter(tokens).items():
+                postings.setdefault(term, []).append([doc_id, frequency])
+
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.avg_doc_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "document_count": len(self.documents),
+                "postings": self.postings,
+                "doc_lengths": self.doc_lengths,
+                "avg_doc_length": self.avg_doc_length,
+            }, f, ensure_ascii=False)
+        os.replace(temp_path, self.index_path)
+
+    def _bm25(self, query: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        document_count = len(self.documents)
+
+        for term in set(tokenize(query)):
+            term_postings = self.postings.get(term)
+            if not term_postings:
+                continue
+
+            idf = math.log(1 + (document_count - len(term_postings) + 0.5) / (len(term_postings) + 0.5))
+            for doc_id, frequency in term_postings:
+                length_norm = 1 - self.B + self.B * self.doc_lengths[doc_id] / (self.avg_doc_length or 1)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.K1 + 1) / (frequency + self.K1 * length_norm)
+
+        return scores
+
+    def search(self, query: str, max_results: int = 5, search_depth: str = "basic",
+               exclude_domains: Optional[List[str]] = None, **kwargs) -> Dict:
+        started = time.perf_counter()
+        excluded = [domain.lower() for domain in exclude_domains or []]
+
+        scores = self._bm25(query)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        top_score = ranked[0][1] if ranked else 1.0
+
+        results = []
+        for doc_id, score in ranked:
+            document = self.documents[doc_id]
+            host = (urlparse(document.get("url", "")).hostname or "").lower()
+            if any(host == domain or host.endswith("." + domain) for domain in excluded):
+                continue
+
+            content = document.get("content", "")
+            if search_depth != "advanced":
+                content = content[:self.BASIC_CONTENT_CHARS]
+
+            results.append({
+                "title": document.get("title", ""),
+                "url": document.get("url", ""),
+                "content": content,
+                "score": round(score / top_score, 4),
+                "raw_content": None,
+            })
+            if len(results) >= max_results:
+                break
+
+        return {
+            "query": query,
+            "results": results,
+            "response_time": round(time.perf_counter() - started, 4),
+        }
+
+
+_providers: Dict[str, SearchProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_search_provider(name: Optional[str] = None) -> SearchProvider:
+    """
+    설정된 검색 제공자를 반환합니다. (프로세스 전역 재사용)
+
+    Args:
+        name: "tavily" 또는 "local" (기본값: SEARCH_PROVIDER 환경 변수)
+    """
+    name = (name or os.getenv("SEARCH_PROVIDER", "tavily")).lower()
+
+    provider = _providers.get(name)
+    if provider is not None:
+        return provider
+
+    with _providers_lock:
+        provider = _providers.get(name)
+        if provider is None:
+            if name == "tavily":
+                provider = TavilySearchProvider()
+            elif name == "local":
+                provider = LocalSearchProvider(os.getenv("LOCAL_SEARCH_CORPUS", DEFAULT_LOCAL_CORPUS))
+            else:
+                raise ValueError(f"지원하지 않는 검색 제공자입니다: {name}")
+            _providers[name] = provider
+
+    return provider
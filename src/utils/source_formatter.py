@@ -1,10 +1,161 @@
+"""
+검색 결과를 LLM이 읽을 수 있는 형태로 변환
+자료마다 앞부분을 잘라 넣는 대신, 호출 위치(writer/editor/evaluator)별 토큰 예산 안에서
+신뢰도와 질의 관련성이 높은 문단부터 채워 넣습니다.
+
+- 본문을 문장 단위로 나눈 뒤 PASSAGE_TOKENS 안팎의 문단으로 묶습니다.
+- 문단 점수 = 신뢰도 × (0.3 + 0.7 × 질의 용어 포함 비율), 같은 점수는 자료/문단 순서로 정렬 (결정적)
+- 자료의 첫 문단이 선택될 때 제목/URL 헤더 비용을 함께 계산합니다.
+- ResultStore는 (version, 호출 위치, 예산, 질의)별로 결과를 캐시합니다.
+
+환경 변수:
+    SOURCE_BUDGET_WRITER / SOURCE_BUDGET_EDITOR / SOURCE_BUDGET_EVALUATOR: 호출 위치별 토큰 예산
+"""
+
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from .text_tokenizer import tokenize, estimate_tokens
+
+load_dotenv()
+
+# 호출 위치별 토큰 예산 (editor는 이전 리포트도 함께 보내므로 더 작게)
+SOURCE_TOKEN_BUDGETS = {
+    "writer": int(os.getenv("SOURCE_BUDGET_WRITER", "6000")),
+    "editor": int(os.getenv("SOURCE_BUDGET_EDITOR", "3500")),
+    "evaluator": int(os.getenv("SOURCE_BUDGET_EVALUATOR", "1500")),
+}
+
+# 문단 하나의 목표 토큰 수
+PASSAGE_TOKENS = 80
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+_pack_cache_lock = threading.Lock()
+
+
+def split_passages(content: str, max_tokens: int = PASSAGE_TOKENS) -> List[str]:
+    """
+    본문을 문장 단위로 나누고, 연속된 문장을 max_tokens 안팎의 문단으로 묶습니다.
+    한 문장이 max_tokens를 넘으면 그대로 하나의 문단이 됩니다.
+    """
+    passages, current, current_tokens = [], [], 0
+
+    for sentence in _SENTENCE_SPLIT.split(content or ""):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        tokens = estimate_tokens(sentence)
+        if current and current_tokens + tokens > max_tokens:
+            passages.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += tokens
+
+    if current:
+        passages.append(" ".join(current))
+    return passages
+
+
+def _source_header(index: int, result: Dict) -> str:
+    return f"[{index}] {result.get('title', 'No Title')}\nURL: {result.get('url', 'N/A')}\n"
+
+
+def pack_sources(search_results: List[Dict], budget: int, query: Optional[str] = None,
+                 cover_all: bool = False) -> List[Tuple[Dict, List[str]]]:
+    """
+    토큰 예산 안에서 점수가 높은 문단부터 골라 담습니다.
+
+    Args:
+        search_results: 검색 결과 (신뢰도 순)
+        budget: 토큰 예산
+        query: 관련성 계산에 사용할 질의 (주제, 리뷰 피드백 등)
+        cover_all: True면 먼저 자료마다 가장 좋은 문단 하나씩을 담은 뒤 남은 예산을 채움
+
+    Returns:
+        [(결과, 선택된 문단 목록(본문 순서, 이어지는 문단은 하나로 합침))]
+        - 문단이 하나도 선택되지 않은 자료는 제외, 입력 순서 유지
+    """
+    query_terms = set(tokenize(query or ""))
+
+    # (점수, 자료 번호, 문단 번호, 토큰 수, 문단)
+    candidates = []
+    for source_index, result in enumerate(search_results):
+        trust = result.get("trust_score", 0.5)
+        for passage_index, passage in enumerate(split_passages(result.get("content", ""))):
+            relevance = len(query_terms & set(tokenize(passage))) / len(query_terms) if query_terms else 0.0
+            score = trust * (0.3 + 0.7 * relevance)
+            candidates.append((score, source_index, passage_index, estimate_tokens(passage), passage))
+
+    candidates.sort(key=lambda item: (-item[0], item[1], item[2]))
+
+    if cover_all:
+        best_per_source, rest, seen = [], [], set()
+        for candidate in candidates:
+            (rest if candidate[1] in seen else best_per_source).append(candidate)
+            seen.add(candidate[1])
+        candidates = best_per_source + rest
+
+    selected: Dict[int, List[Tuple[int, str]]] = {}
+    remaining = budget
+    for _, source_index, passage_index, tokens, passage in candidates:
+        cost = tokens + 2
+        if source_index not in selected:
+            cost += estimate_tokens(_source_header(source_index + 1, search_results[source_index]))
+        if cost > remaining:
+            continue
+        selected.setdefault(source_index, []).append((passage_index, passage))
+        remaining -= cost
+
+    packed = []
+    for source_index in sorted(selected):
+        passages, previous = [], None
+        for passage_index, passage in sorted(selected[source_index]):
+            if previous is not None and passage_index == previous + 1:
+                passages[-1] += " " + passage
+            else:
+                passages.append(passage)
+            previous = passage_index
+        packed.append((search_results[source_index], passages))
+    return packed
 
 
 # 검색 결과를 LLM이 읽을 수 있는 형태로 번역
-def format_sources(search_results: list[dict]) -> str:
-    return "\n\n".join([
-      f"[{i+1}] {result.get('title', 'No Title')}\n"
-      f"URL: {result.get('url', 'N/A')}\n"
-      f"{result.get('content', '')[:300]}..."
-      for i, result in enumerate(search_results)
-    ])
\ No newline at end of file
+def format_sources(search_results: list[dict], call_site: str = "writer", query: Optional[str] = None,
+                   budget: Optional[int] = None) -> str:
+    """
+    검색 결과를 토큰 예산에 맞춰 프롬프트용 문자열로 만듭니다.
+
+    Args:
+        search_results: 검색 결과 (ResultStore면 version 기준으로 캐시)
+        call_site: "writer", "editor", "evaluator" (예산 선택)
+        query: 관련성 계산에 사용할 질의
+        budget: 토큰 예산 (기본값: SOURCE_TOKEN_BUDGETS[call_site])
+    """
+    budget = budget if budget is not None else SOURCE_TOKEN_BUDGETS.get(call_site, SOURCE_TOKEN_BUDGETS["writer"])
+    cache = getattr(search_results, "derived_cache", None)
+    version = getattr(search_results, "version", None)
+    key = ("sources", version, call_site, budget, query)
+
+    if cache is not None:
+        with _pack_cache_lock:
+            cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    text = "\n\n".join(
+        _source_header(index + 1, result) + " … ".join(passages)
+        for index, (result, passages) in enumerate(pack_sources(search_results, budget, query))
+    )
+
+    if cache is not None:
+        with _pack_cache_lock:
+            # 저장소가 바뀌면 이전 버전 항목은 다시 쓰이지 않으므로 정리
+            for stale in [k for k in cache if k[0] == "sources" and k[1] != version]:
+                del cache[stale]
+            cache[key] = text
+
+    return text
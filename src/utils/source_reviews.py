@@ -0,0 +1,24 @@
+"""
+자료별 평가 저장소
+정보 평가 LLM이 자료마다 매긴 평가(relevance, quality, comment)를 canonical URL 기준으로 보관합니다.
+"""
+
+from typing import Dict, Optional
+
+from .content_dedup import fingerprint_result
+
+
+def review_key(result: Dict) -> str:
+    """검색 결과의 평가 키(canonical URL)를 반환합니다."""
+    return fingerprint_result(result)["canonical_url"]
+
+
+def merge_source_reviews(existing: Optional[Dict[str, Dict]], new: Optional[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """
+    ResearchState.source_reviews의 reducer
+
+    노드는 이번에 새로 평가한 자료만 반환하고, 같은 URL은 최신 평가로 덮어씁니다.
+    """
+    if not new:
+        return existing or {}
+    return {**(existing or {}), **new}
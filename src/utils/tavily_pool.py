@@ -0,0 +1,244 @@
+"""
+Tavily 연결 풀
+keep-alive 연결을 재사용하는 프로세스 전역 Tavily 클라이언트를 관리합니다.
+
+tavily-python의 TavilyClient / AsyncTavilyClient를 그대로 사용하되,
+연결 풀을 가진 requests.Session과 이벤트 루프별 httpx.AsyncClient를 주입하여
+매 검색마다 TCP/TLS 연결을 새로 맺지 않도록 합니다.
+(엔드포인트, 요청 헤더, 오류 변환은 SDK가 처리)
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from tavily import AsyncTavilyClient, TavilyClient
+
+from .resilience import attempt_time_left
+
+
+class _CountingTransport(httpx.AsyncHTTPTransport):
+    """요청마다 httpcore trace 확장을 붙여 요청 수와 새 연결 수를 집계하는 전송 계층"""
+
+    def __init__(self, owner: "PooledTavilyClient", **kwargs):
+        super().__init__(**kwargs)
+        self._owner = owner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._owner._count_async_request()
+        request.extensions = {**request.extensions, "trace": self._owner._trace}
+        return await super().handle_async_request(request)
+
+
+class PooledTavilyClient:
+    """
+    TavilyClient.search와 같은 인터페이스를 제공하는 연결 재사용 클라이언트
+
+    - 동기 호출: 스레드 간 공유되는 requests.Session (urllib3 연결 풀)을 주입한 TavilyClient
+    - 비동기 호출: 이벤트 루프별 httpx.AsyncClient(httpx는 루프에 묶임)를 주입한 AsyncTavilyClient
+    """
+
+    def __init__(self, api_key: str, pool_maxsize: int = 10, api_base_url: Optional[str] = None):
+        self.api_key = api_key
+        self.api_base_url = api_base_url
+        self.pool_maxsize = pool_maxsize
+
+        self._lock = threading.Lock()
+        # 루프 -> (SDK 클라이언트, 주입한 httpx 클라이언트) - 주입한 클라이언트는 SDK가 닫지 않으므로 직접 닫음
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_requests = 0
+        self._async_handshakes = 0
+
+        self._session = self._create_session(pool_maxsize)
+        self._client = TavilyClient(api_key=api_key, api_base_url=api_base_url, session=self._session)
+        self.base_url = self._client.base_url
+
+    @staticmethod
+    def _create_session(pool_maxsize: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def search(self, query: str, timeout: Optional[float] = None, **params) -> Dict:
+        """
+        Tavily /search 요청 (동기)
+
+        timeout을 지정하지 않으면 call_with_resilience의 현재 시도에 남은 시간(없으면 60초)을 사용합니다.
+
+        Returns:
+            Tavily 원본 응답 dict
+        """
+        timeout = attempt_time_left(60) if timeout is None else timeout
+        with self._lock:
+            client = self._client
+        return client.search(query=query, timeout=timeout, **params)
+
+    def _get_async_client(self) -> AsyncTavilyClient:
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            entry = self._async_clients.get(loop)
+            if entry is None:
+                http_client = httpx.AsyncClient(
+                    transport=_CountingTransport(
+                        self,
+                        limits=httpx.Limits(
+                            max_connections=self.pool_maxsize,
+                            max_keepalive_connections=self.pool_maxsize,
+                        ),
+                    ),
+                )
+                client = AsyncTavilyClient(api_key=self.api_key, api_base_url=self.api_base_url, client=http_client)
+                entry = self._async_clients[loop] = (client, http_client)
+        return entry[0]
+
+    def _count_async_request(self) -> None:
+        with self._lock:
+            self._async_requests += 1
+
+    async def _trace(self, event_name: str, info: Dict) -> None:
+        # httpcore trace 이벤트로 새 연결(TLS 핸드셰이크) 수를 집계
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._async_handshakes += 1
+
+    async def asearch(self, query: str, timeout: float = 60, **params) -> Dict:
+        """
+        Tavily /search 요청 (비동기)
+
+        Returns:
+            Tavily 원본 응답 dict
+        """
+        return await self._get_async_client().search(query=query, timeout=timeout, **params)
+
+    def resize(self, pool_maxsize: int) -> None:
+        """
+        연결 풀 크기를 변경합니다. (배치 작업 시작 전처럼 요청이 없을 때 호출)
+
+        기존 세션은 닫히고, 이후 요청부터 새 풀을 사용합니다.
+        기존 비동기 클라이언트는 각자의 이벤트 루프에서 닫고(aclose), 다음 요청 시 새 크기로 다시 생성됩니다.
+        """
+        with self._lock:
+            old_session = self._session
+            old_async_clients = list(self._async_clients.items())
+            self.pool_maxsize = pool_maxsize
+            self._session = self._create_session(pool_maxsize)
+            self._client = TavilyClient(api_key=self.api_key, api_base_url=self.api_base_url, session=self._session)
+            self._async_clients = weakref.WeakKeyDictionary()
+
+        old_session.close()
+        for loop, (_, http_client) in old_async_clients:
+            _close_on_loop(loop, http_client)
+
+    def _sync_pool_counters(self) -> tuple:
+        connections = 0
+        request_count = 0
+
+        adapter = self._session.get_adapter(self.base_url)
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += getattr(pool, "num_connections", 0)
+            request_count += getattr(pool, "num_requests", 0)
+
+        return connections, request_count
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        연결 재사용 통계를 반환합니다.
+
+        handshakes는 새로 맺은 연결 수(= TLS 핸드셰이크 수)이며,
+        connection_reuse_rate는 기존 연결로 처리된 요청의 비율입니다.
+        """
+        sync_connections, sync_requests = self._sync_pool_counters()
+
+        with self._lock:
+            total_requests = sync_requests + self._async_requests
+            handshakes = sync_connections + self._async_handshakes
+
+        reused = max(total_requests - handshakes, 0)
+        return {
+            "pool_maxsize": self.pool_maxsize,
+            "requests": total_requests,
+            "handshakes": handshakes,
+            "connection_reuse_rate": reused / total_requests if total_requests else 0.0,
+        }
+
+    def close(self) -> None:
+        """동기 세션과 비동기 클라이언트를 닫습니다."""
+        with self._lock:
+            old_async_clients = list(self._async_clients.items())
+            self._async_clients = weakref.WeakKeyDictionary()
+        self._session.close()
+        for loop, (_, http_client) in old_async_clients:
+            _close_on_loop(loop, http_client)
+
+
+def _close_on_loop(loop: asyncio.AbstractEventLoop, http_client: httpx.AsyncClient) -> None:
+    """
+    httpx 클라이언트를 자신이 속한 이벤트 루프에서 닫습니다. (다른 루프에서는 닫을 수 없음)
+    루프가 이미 닫혔으면 연결도 함께 정리된 상태이므로 건너뜁니다.
+    """
+    if loop.is_closed():
+        return
+    if loop.is_running():
+        loop.call_soon_threadsafe(lambda: loop.create_task(http_client.aclose()))
+    else:
+        loop.run_until_complete(http_client.aclose())
+
+
+_clients: Dict[str, PooledTavilyClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_pooled_client(api_key: str, pool_maxsize: int = 10) -> PooledTavilyClient:
+    """
+    API 키별 프로세스 전역 클라이언트를 반환합니다. (스레드 안전)
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                client = PooledTavilyClient(api_key, pool_maxsize=pool_maxsize)
+                _clients[api_key] = client
+    return client
+
+
+def resize_pools(pool_maxsize: int) -> None:
+    """등록된 모든 클라이언트의 연결 풀 크기를 변경합니다."""
+    with _clients_lock:
+        clients = list(_clients.values())
+    for client in clients:
+        client.resize(pool_maxsize)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """등록된 클라이언트들의 연결 재사용 통계를 합산하여 반환합니다."""
+    with _clients_lock:
+        clients = list(_clients.values())
+
+    requests_total = 0
+    handshakes = 0
+    for client in clients:
+        stats = client.stats()
+        requests_total += stats["requests"]
+        handshakes += stats["handshakes"]
+
+    reused = max(requests_total - handshakes, 0)
+    return {
+        "clients": len(clients),
+        "requests": requests_total,
+        "handshakes": handshakes,
+        "connection_reuse_rate": reused / requests_total if requests_total else 0.0,
+    }
@@ -0,0 +1,41 @@
+"""
+검색/색인용 토크나이저
+한국어와 영어가 섞인 텍스트를 간단한 규칙으로 토큰화합니다.
+"""
+
+import math
+import re
+from typing import List
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_HANGUL_PATTERN = re.compile(r"[가-힣]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    소문자 단어 토큰을 반환합니다.
+
+    한국어는 조사/어미가 붙어 단어 단위 일치가 어렵기 때문에
+    3글자 이상 한글 단어는 글자 2-gram도 함께 추가합니다.
+    (예: "인공지능을" → "인공지능을", "인공", "공지", "지능", "능을")
+    """
+    tokens = []
+
+    for word in _WORD_PATTERN.findall((text or "").lower()):
+        tokens.append(word)
+        if len(word) > 2 and _HANGUL_PATTERN.search(word):
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+
+    return tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    LLM 토큰 수를 로컬에서 추정합니다. (토크나이저 호출 없이 프롬프트 예산 계산용)
+
+    한글은 약 1.5자당 1토큰, 그 외 문자(영문, 숫자, 기호, 공백)는 약 4자당 1토큰으로 계산합니다.
+    """
+    if not text:
+        return 0
+    hangul = len(_HANGUL_PATTERN.findall(text))
+    return math.ceil(hangul / 1.5 + (len(text) - hangul) / 4)
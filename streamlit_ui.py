@@ -4,10 +4,24 @@ Research Agent를 웹 인터페이스로 실행합니다.
 """
 
 import streamlit as st
-from src.research_agent_workflow import create_research_workflow
+from src.research_agent_workflow import create_research_workflow, create_initial_state
 from src.research_state import ResearchState
+from src.utils.llm_config import warm_llm_clients
 import os
 
+
+@st.cache_resource
+def _warm_llm_clients() -> int:
+    """
+    세션마다 다시 실행되는 스크립트에서 LLM 클라이언트를 한 번만 미리 생성
+    """
+    try:
+        return warm_llm_clients()
+    except Exception as e:
+        print(f"⚠️ LLM 클라이언트 사전 생성 실패: {e}")
+        return 0
+
+
 def main():
     """
     Streamlit 앱 메인 함수
@@ -20,6 +34,8 @@ def main():
         layout="wide",
     )
 
+    _warm_llm_clients()
+
     # 제목
     st.title("🔍 Research Agent")
     st.markdown("자동 리서치 및 문서 생성 시스템 (LangGraph 기반)")
@@ -117,6 +133,10 @@ def main():
         # 메인 영역에 현재 단계 상세 정보 표시할 placeholder
         main_detail_placeholder = st.empty()
 
+        # 리포트 작성 중 실시간 본문 표시할 placeholder
+        report_stream_placeholder = st.empty()
+        report_stream_buffer = []
+
         # 헬퍼 함수들
         def add_step_log(step_name, status, title, details):
             """단계 로그 추가"""
@@ -177,32 +197,31 @@ def main():
                         st.markdown("")
 
         try:
-            initial_state: ResearchState = {
-                "topic": topic,
-                "author": author,
-                "search_scope": None,
-                "report_language": "en" if report_language_check == "English" else "ko",
-                "search_queries": [],
-                "search_results": [],
-                "evaluation": None,
-                "evaluation_reason": None,
-                "iteration_count": 0,
-                "final_report": None,
-                "output_path": None,
-                "missing_info": None,
-                "recommended_keywords": None,
-                "review_feedback": None,
-                "review_status": None,
-                "revision_count": 0,
-            }
-            # 워크플로우 생성
-            workflow = create_research_workflow()
+            initial_state: ResearchState = create_initial_state(
+                topic,
+                author,
+                "en" if report_language_check == "English" else "ko",
+            )
+            # 워크플로우 생성 (노드별 진행 상황을 표시하므로 search / evaluate를 분리한 구조 사용)
+            workflow = create_research_workflow(pipelined=False)
             app = workflow.compile()
 
             result = None
 
-            # Stream으로 실시간 추적
-            for event in app.stream(initial_state):
+            # Stream으로 실시간 추적 (updates: 노드 결과, custom: 리포트 작성 조각)
+            for stream_mode, event in app.stream(initial_state, stream_mode=["updates", "custom"]):
+                if stream_mode == "custom":
+                    if event.get("event") == "report_start":
+                        report_stream_buffer.clear()
+                        title = "리포트 작성" if event.get("mode") == "write" else "리포트 수정"
+                        report_stream_placeholder.info(f"✍️ {title} 중 (v{event.get('version', 1)})...")
+                    elif event.get("event") == "report_chunk":
+                        report_stream_buffer.append(event.get("delta", ""))
+                        with report_stream_placeholder.container():
+                            st.markdown("### ✍️ 작성 중인 리포트")
+                            st.markdown("".join(report_stream_buffer))
+                    continue
+
                 node_name = list(event.keys())[0]
                 current_state = event[node_name]
 
@@ -264,6 +283,8 @@ def main():
                     queries = current_state.get("search_queries", [])
                     results = current_state.get("search_results", [])
                     iteration = current_state.get("iteration_count", 0)
+                    skipped_log = current_state.get("skipped_queries") or []
+                    skipped_count = skipped_log[-1]["skipped_count"] if skipped_log else 0
 
                     # 에이전트의 사고 과정
                     thinking = f"생성된 {len(queries)}개의 검색 키워드로 웹 검색을 수행합니다. "
@@ -279,7 +300,8 @@ def main():
                         "🤔 에이전트의 판단": thinking,
                         "⚙️ 실행 내용": [
                             f"검색 쿼리 수: {len(queries)}개",
-                            f"수집된 결과: {len(results)}개",
+                            f"중복으로 제외된 쿼리: {skipped_count}개",
+                            f"새로 수집된 결과: {len(results)}개",
                             f"평균 검색 결과/쿼리: {len(results) // max(len(queries), 1)}개"
                         ],
                         "🔍 사용된 검색 쿼리": queries,
@@ -356,6 +378,9 @@ def main():
                         st.success("🎉 정보 수집 완료! 리포트 생성을 시작합니다.")
 
                 elif node_name == "generate_report_content":
+                    # 작성이 끝났으므로 실시간 본문은 단계 상세 정보(미리보기)로 대체
+                    report_stream_placeholder.empty()
+
                     # 이전 단계 완료 처리
                     if st.session_state.steps_log:
                         st.session_state.steps_log[-1]["status"] = "완료"
@@ -0,0 +1,144 @@
+"""
+노드 테스트 공용 픽스처 (네트워크 없이 동작하는 가짜 검색 제공자와 채팅 모델)
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from typing import Any, Callable, List
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+from src.nodes import search_evaluator, web_searcher
+from src.utils import search_client
+from src.utils.search_provider import SearchProvider
+
+
+class FakeSearchProvider(SearchProvider):
+    """
+    쿼리별로 정해 둔 결과를 돌려주는 검색 제공자
+
+    Args:
+        responses: {쿼리: 결과 목록 또는 던질 예외}
+        delays: {쿼리: 응답까지 걸리는 시간(초)}
+    """
+
+    name = "fake"
+    cacheable = False
+
+    def __init__(self, responses=None, delays=None):
+        self.responses = responses or {}
+        self.delays = delays or {}
+        self.lock = threading.Lock()
+        self.started = []
+        self.finished = []
+
+    def _respond(self, query, max_results):
+        response = self.responses.get(query, [])
+        if isinstance(response, BaseException):
+            raise response
+        return {"query": query, "results": response[:max_results]}
+
+    def search(self, query, max_results=5, search_depth="basic", exclude_domains=None, **kwargs):
+        with self.lock:
+            self.started.append(query)
+        time.sleep(self.delays.get(query, 0))
+        with self.lock:
+            self.finished.append(query)
+        return self._respond(query, max_results)
+
+    async def asearch(self, query, max_results=5, search_depth="basic", exclude_domains=None, **kwargs):
+        with self.lock:
+            self.started.append(query)
+        await asyncio.sleep(self.delays.get(query, 0))
+        with self.lock:
+            self.finished.append(query)
+        return self._respond(query, max_results)
+
+
+def make_result(url, title=None, content=None):
+    """Tavily 응답 형식의 결과 항목 (신뢰도는 URL 도메인으로 계산됨)"""
+    return {"title": title or url, "url": url, "content": content or f"{url} 에 대한 본문입니다."}
+
+
+@pytest.fixture
+def use_provider(monkeypatch):
+    """노드가 사용할 검색 제공자를 가짜 제공자로 바꾸는 함수 (재시도 없이 바로 실패 처리)"""
+    monkeypatch.setattr(search_client, "SEARCH_RETRIES", 0)
+    monkeypatch.setenv("SEARCH_ADAPTIVE", "true")
+
+    def install(provider):
+        monkeypatch.setattr(web_searcher, "get_search_provider", lambda: provider)
+        monkeypatch.setattr(search_evaluator, "get_search_provider", lambda: provider)
+        return provider
+
+    return install
+
+
+def default_respond(prompt: str) -> str:
+    """
+    정보 평가 프롬프트에 맞춰 답하는 기본 응답
+    - map(자료별 평가): 프롬프트의 자료 번호마다 high/high 평가
+    - reduce(충분성 판단): 충분
+    """
+    if "individual_reviews" in prompt:
+        indexes = re.findall(r"^\s*\[(\d+)\] \[신뢰도", prompt, re.MULTILINE)
+        return json.dumps({"individual_reviews": [
+            {"index": int(index), "relevance": "high", "quality": "high", "comment": f"자료 {index}"}
+            for index in indexes
+        ]})
+    return json.dumps({
+        "is_sufficient": True,
+        "reason": "충분합니다.",
+        "missing_info": "",
+        "recommended_keywords": [],
+    })
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    프롬프트를 기록하고 respond(프롬프트)의 반환값으로 답하는 채팅 모델
+    respond가 예외를 던지면 호출이 실패합니다.
+
+    ChatGoogleGenerativeAI 대신 생성될 수 있도록 같은 생성자 인자를 받습니다.
+    """
+
+    respond: Callable[[str], str] = default_respond
+    prompts: List[str] = Field(default_factory=list)
+    model: str = "fake"
+    temperature: float = 0.0
+    google_api_key: Any = None
+    client: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        self.prompts.append(prompt)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.respond(prompt)))])
+
+    def map_prompts(self) -> List[str]:
+        return [prompt for prompt in self.prompts if "individual_reviews" in prompt]
+
+    def reduce_prompts(self) -> List[str]:
+        return [prompt for prompt in self.prompts if "is_sufficient" in prompt]
+
+
+@pytest.fixture
+def use_llm(monkeypatch):
+    """정보 평가 노드가 사용할 채팅 모델을 가짜 모델로 바꾸는 함수"""
+    from src.nodes import info_evaluator
+
+    def install(llm):
+        monkeypatch.setattr(info_evaluator, "get_llm", lambda *args, **kwargs: llm)
+        return llm
+
+    return install
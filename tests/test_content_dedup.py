@@ -0,0 +1,86 @@
+"""
+URL 정규화와 SimHash 근접 중복 제거 테스트
+"""
+
+from src.utils.content_dedup import (
+    NearDuplicateIndex,
+    canonicalize_url,
+    dedupe_results,
+    fingerprint_result,
+    hamming_distance,
+    simhash,
+)
+
+ARTICLE = (
+    "정부는 오늘 인공지능 산업 육성을 위한 새로운 지원 방안을 발표했다. "
+    "이번 방안에는 반도체 연구 개발 예산 확대와 데이터 센터 구축 지원, "
+    "전문 인력 양성 프로그램 신설이 포함되었으며 내년부터 단계적으로 시행된다. "
+    "업계는 이번 발표가 국내 기업의 경쟁력 강화에 도움이 될 것으로 기대하고 있다."
+)
+
+
+def test_url_variants_share_one_canonical_form():
+    expected = canonicalize_url("https://news.example.com/article/1")
+
+    assert canonicalize_url("http://www.news.example.com/article/1/") == expected
+    assert canonicalize_url("https://m.news.example.com/article/1?utm_source=x&fbclid=y") == expected
+    assert canonicalize_url("HTTPS://NEWS.EXAMPLE.COM/article/1#comments") == expected
+
+
+def test_canonical_url_keeps_meaningful_parts():
+    assert canonicalize_url("https://example.com/a?id=2&page=1") == canonicalize_url("https://example.com/a?page=1&id=2")
+    assert canonicalize_url("https://example.com/a?id=1") != canonicalize_url("https://example.com/a?id=2")
+    assert canonicalize_url("https://example.com:8080/a") != canonicalize_url("https://example.com/a")
+    assert canonicalize_url("https://example.com/view?id=1&source=news") != \
+           canonicalize_url("https://example.com/view?id=1&source=blog")
+    assert canonicalize_url("https://example.com/list?from=2024&ref=main") != canonicalize_url("https://example.com/list")
+    assert canonicalize_url("https://example.com/a?gclid=1&_ga=2&yclid=3") == canonicalize_url("https://example.com/a")
+    assert canonicalize_url("https://m.com/") == "https://m.com/"
+    assert canonicalize_url("") == ""
+
+
+def test_simhash_is_close_for_small_edits_and_far_for_different_text():
+    original = simhash(ARTICLE)
+    edited = simhash(ARTICLE.replace("오늘", "어제"))
+    different = simhash("파이썬 비동기 프로그래밍에서 이벤트 루프와 코루틴, 태스크의 동작 방식을 예제로 설명합니다.")
+
+    assert hamming_distance(original, simhash(ARTICLE)) == 0
+    assert hamming_distance(original, edited) < hamming_distance(original, different)
+    assert simhash("너무 짧은 글") is None
+
+
+def test_index_finds_candidates_by_url_and_fingerprint():
+    index = NearDuplicateIndex()
+    stored = fingerprint_result({"url": "https://a.com/news/1", "content": ARTICLE})
+    index.add(stored, "first")
+
+    same_url = fingerprint_result({"url": "https://www.a.com/news/1/", "content": ""})
+    mirror = fingerprint_result({"url": "https://mirror.org/copy", "content": ARTICLE})
+    other = fingerprint_result({"url": "https://b.com/x", "content": "전혀 다른 주제에 대한 충분히 긴 본문으로 비교 대상이 되는 문서입니다."})
+
+    assert index.find(same_url) == "first"
+    assert index.find(mirror) == "first"
+    assert index.find(other) is None
+
+
+def test_index_copy_is_independent():
+    index = NearDuplicateIndex()
+    index.add(fingerprint_result({"url": "https://a.com/1", "content": ARTICLE}), 0)
+    clone = index.copy()
+    clone.add(fingerprint_result({"url": "https://b.com/2", "content": ""}), 1)
+
+    assert clone.find(fingerprint_result({"url": "https://b.com/2", "content": ""})) == 1
+    assert index.find(fingerprint_result({"url": "https://b.com/2", "content": ""})) is None
+
+
+def test_dedupe_keeps_higher_trust_copy_in_input_order():
+    results = [
+        {"url": "https://mirror.org/copy", "content": ARTICLE, "trust_score": 0.4},
+        {"url": "https://other.com/x", "content": "", "trust_score": 0.5},
+        {"url": "https://news.go.kr/original", "content": ARTICLE, "trust_score": 0.9},
+        {"url": "http://www.other.com/x/?utm_medium=feed", "content": "", "trust_score": 0.3},
+    ]
+
+    kept = dedupe_results(results)
+
+    assert [result["url"] for result in kept] == ["https://news.go.kr/original", "https://other.com/x"]
@@ -0,0 +1,65 @@
+"""
+BM25 커버리지 사전 판정 테스트
+"""
+
+from src.utils.coverage import ASPECTS, describe_gaps, score_coverage
+
+TOPIC = "electric vehicle battery"
+
+ASPECT_TEXTS = [
+    "Electric vehicle battery overview: definition, background and the basic concept of lithium cells.",
+    "Electric vehicle battery market statistics and data: market size, growth trend and share in percent, billion dollars.",
+    "Electric vehicle battery case study: company adoption, deployment and implementation example at a large automaker.",
+    "Electric vehicle battery outlook and forecast: future challenges, strategy, risk and implications for the industry.",
+]
+
+
+def _results(texts, trust=0.9):
+    return [{"title": f"source {i}", "content": text, "trust_score": trust} for i, text in enumerate(texts)]
+
+
+def test_no_results_is_insufficient():
+    coverage = score_coverage(TOPIC, [])
+
+    assert coverage["decision"] == "insufficient"
+    assert coverage["weak_aspects"] == list(ASPECTS)
+
+
+def test_rich_on_topic_results_are_sufficient():
+    coverage = score_coverage(TOPIC, _results(ASPECT_TEXTS * 3))
+
+    assert coverage["decision"] == "sufficient"
+    assert coverage["weak_aspects"] == []
+    assert coverage["on_topic_sources"] == 12
+
+
+def test_off_topic_results_do_not_count():
+    off_topic = [text.replace("Electric vehicle battery", "Coffee brewing") for text in ASPECT_TEXTS * 3]
+    coverage = score_coverage(TOPIC, _results(off_topic))
+
+    assert coverage["decision"] == "insufficient"
+    assert coverage["on_topic_sources"] == 0
+    assert all(value == 0 for value in coverage["aspects"].values())
+
+
+def test_missing_aspect_is_reported_as_weak():
+    coverage = score_coverage(TOPIC, _results(ASPECT_TEXTS[:3] * 3))
+
+    assert coverage["decision"] != "sufficient"
+    assert coverage["weak_aspects"] == ["outlook"]
+
+
+def test_low_trust_lowers_coverage():
+    trusted = score_coverage(TOPIC, _results(ASPECT_TEXTS, trust=0.9))
+    untrusted = score_coverage(TOPIC, _results(ASPECT_TEXTS, trust=0.3))
+
+    assert untrusted["score"] < trusted["score"]
+
+
+def test_describe_gaps_builds_keywords_for_weak_aspects():
+    missing_info, keywords = describe_gaps(TOPIC, ["data", "outlook"])
+
+    assert ASPECTS["data"]["label"] in missing_info
+    assert ASPECTS["outlook"]["label"] in missing_info
+    assert keywords == [f"{TOPIC} {ASPECTS['data']['keyword']}", f"{TOPIC} {ASPECTS['outlook']['keyword']}"]
+    assert len(describe_gaps(TOPIC, [])[1]) == len(ASPECTS)
@@ -0,0 +1,72 @@
+"""
+DiskCache(TTL/LRU)와 검색 캐시 키 정규화 테스트
+"""
+
+import time
+
+from src.utils import search_cache
+from src.utils.disk_cache import DiskCache
+from src.utils.search_cache import get_search_cache, make_search_cache_key
+
+
+def test_set_and_get_roundtrip(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("key", [{"title": "제목", "score": 0.9}])
+
+    assert cache.get("key") == [{"title": "제목", "score": 0.9}]
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=10)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache.set("key", "value")
+
+    monkeypatch.setattr(time, "time", lambda: now + 5)
+    assert cache.get("key") == "value"
+
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("key") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a가 b보다 최근에 사용됨
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_are_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    DiskCache(path).set("key", {"value": 1})
+
+    assert DiskCache(path).get("key") == {"value": 1}
+
+
+def test_cache_key_ignores_case_whitespace_and_domain_order():
+    base = make_search_cache_key("AI  트렌드 2025", 5, "advanced", ["b.com", "a.com"])
+
+    assert make_search_cache_key(" ai 트렌드\t2025 ", 5, "advanced", ["a.com", "b.com"]) == base
+    assert make_search_cache_key("AI 트렌드 2025", 10, "advanced", ["a.com", "b.com"]) != base
+    assert make_search_cache_key("AI 트렌드 2025", 5, "basic", ["a.com", "b.com"]) != base
+    assert make_search_cache_key("AI 트렌드 2025", 5, "advanced", ["a.com", "b.com"], provider="other") != base
+
+
+def test_search_cache_is_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("SEARCH_CACHE_ENABLED", raising=False)
+    monkeypatch.setattr(search_cache, "_cache", None)
+
+    assert get_search_cache() is None
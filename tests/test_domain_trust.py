@@ -0,0 +1,143 @@
+"""
+도메인 신뢰도 색인(트라이/스냅샷) 테스트
+"""
+
+import json
+
+import pytest
+
+from src.nodes.web_searcher import _parse_response
+from src.utils import domain_feedback
+from src.utils.domain_rules import load_snapshot
+from src.utils.domain_trust import (
+    AD_KEYWORDS,
+    DEFAULT_SCORE,
+    DOMAIN_SCORES,
+    DomainTrustIndex,
+    get_domain_score,
+    score_urls,
+)
+
+URLS = [
+    "https://www.gov.kr/portal/main",
+    "https://kids.gov.kr/",
+    "https://blog.naver.com/korea_gov/220793688261",
+    "https://news.naver.com/main/read",
+    "https://newsstand.naver.com/?pcode=0014&list=ct4",
+    "https://m.blog.naver.com/healthy_foodist/223482488706",
+    "https://kmong.com/gig/508399",
+    "https://seo.goover.ai/report/202510/go-public-report-ko",
+    "https://coupang.com/np/search?component=&q=",
+    "https://smartstore.naver.com/example",
+    "https://cs.stanford.edu/people",
+    "https://en.wikipedia.org/wiki/Trie",
+    "https://ko.wikipedia.org/wiki/트라이",
+    "https://example.org/about",
+    "https://notnature.com/",
+    "https://example.com/",
+    "not a url",
+    "",
+]
+
+
+def _all_urls():
+    # 규칙마다 정확히 일치, 하위 도메인, 비슷하지만 다른 도메인을 함께 검사
+    urls = list(URLS)
+    for rule in DOMAIN_SCORES:
+        host = rule.lstrip(".")
+        urls += [f"https://{host}/", f"https://sub.{host}/page", f"https://x{host}/", f"https://{host}.example/"]
+    return urls
+
+
+@pytest.fixture
+def trie_index():
+    return DomainTrustIndex(DOMAIN_SCORES, AD_KEYWORDS)
+
+
+@pytest.fixture
+def snapshot_index(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(json.dumps({"domain_scores": DOMAIN_SCORES, "ad_keywords": AD_KEYWORDS}), encoding="utf-8")
+    return DomainTrustIndex.from_snapshot(load_snapshot(str(rules_path)))
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://news.naver.com/main", 0.8),        # 더 깊은 접미사 규칙 우선
+    ("https://naver.com/", 0.6),
+    ("https://blog.naver.com/x", 0.3),           # 더 깊은 라벨의 키워드 우선
+    ("https://cs.stanford.edu/", 0.9),
+    ("https://unknown.edu/", 1.0),
+    ("https://notnature.com/", DEFAULT_SCORE),   # 라벨 단위로만 일치
+    ("https://example.com/", DEFAULT_SCORE),
+    ("https://kmong.com/gig/1", 0.2 * 0.5),      # 광고성 URL 감점
+])
+def test_rule_precedence(trie_index, url, expected):
+    assert trie_index.score(url) == pytest.approx(expected)
+
+
+def test_rule_order_does_not_change_scores(trie_index):
+    reversed_index = DomainTrustIndex(dict(reversed(list(DOMAIN_SCORES.items()))), list(reversed(AD_KEYWORDS)))
+
+    for url in _all_urls():
+        assert reversed_index.score(url) == trie_index.score(url), url
+
+
+def test_snapshot_lookup_matches_trie_lookup(trie_index, snapshot_index):
+    for url in _all_urls():
+        assert snapshot_index.score(url) == trie_index.score(url), url
+        assert snapshot_index.is_ad(url) == trie_index.is_ad(url), url
+
+
+def test_snapshot_is_reused_until_rules_change(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(json.dumps({"domain_scores": {"example.com": 0.9}}), encoding="utf-8")
+    first = load_snapshot(str(rules_path))
+
+    assert load_snapshot(str(rules_path)).matches(rules_path.stat())
+
+    rules_path.write_text(json.dumps({"domain_scores": {"example.com": 0.1, "other.org": 0.7}}), encoding="utf-8")
+    second = load_snapshot(str(rules_path))
+
+    assert not first.matches(rules_path.stat())
+    assert DomainTrustIndex.from_snapshot(second).score("https://example.com/") == 0.1
+
+
+def test_batch_scores_match_single_url_scores(trie_index):
+    urls = _all_urls()
+    scores, is_ad = trie_index.score_many(urls)
+
+    assert scores.tolist() == [trie_index.score(url) for url in urls]
+    assert is_ad.tolist() == [trie_index.is_ad(url) for url in urls]
+
+    empty_scores, empty_ads = trie_index.score_many([])
+    assert len(empty_scores) == 0 and len(empty_ads) == 0
+
+
+@pytest.mark.parametrize("feedback_enabled", [False, True])
+def test_score_urls_matches_get_domain_score(tmp_path, monkeypatch, feedback_enabled):
+    monkeypatch.delenv("DOMAIN_TRUST_RULES", raising=False)
+    monkeypatch.setattr(domain_feedback, "_store", None)
+    monkeypatch.setenv("DOMAIN_FEEDBACK_ENABLED", "true" if feedback_enabled else "false")
+    monkeypatch.setenv("DOMAIN_FEEDBACK_PATH", str(tmp_path / "feedback.sqlite3"))
+    if feedback_enabled:
+        domain_feedback.get_domain_feedback_store().record_many([("naver.com", 1.0), ("example.com", 0.0)])
+
+    urls = _all_urls()
+    scores, _ = score_urls(urls)
+
+    assert scores.tolist() == [get_domain_score(url) for url in urls]
+    assert (get_domain_score("https://example.com/") != DEFAULT_SCORE) == feedback_enabled
+
+
+def test_search_response_is_filtered_by_batch_scores():
+    response = {"results": [
+        {"title": "정부", "url": "https://www.gov.kr/portal", "content": "본문"},
+        {"title": "광고", "url": "https://coupang.com/np/search?q=x", "content": "본문"},
+        {"title": "블로그", "url": "https://blog.naver.com/post", "content": "본문"},
+    ]}
+
+    results, filtered_count = _parse_response(response)
+
+    assert [result["title"] for result in results] == ["정부", "블로그"]
+    assert [result["trust_score"] for result in results] == [1.0, 0.3]
+    assert filtered_count == 1
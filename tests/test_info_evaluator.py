@@ -0,0 +1,201 @@
+"""
+정보 평가 map-reduce 테스트 (묶음 나누기, 부분 실패 처리, reduce 폴백, 반복 간 평가 재사용)
+"""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from conftest import FakeChatModel, default_respond, make_result
+from src.nodes import info_evaluator
+from src.nodes.info_evaluator import (
+    EvidenceStats,
+    _collect_reviews,
+    _finish_evaluation,
+    _map_inputs,
+    aevaluate_with_llm,
+    evaluate_information,
+    evaluate_with_llm,
+)
+from src.utils.result_store import merge_search_results
+from src.utils.source_reviews import merge_source_reviews, review_key
+
+
+@pytest.fixture(autouse=True)
+def chunk_size(monkeypatch):
+    monkeypatch.setattr(info_evaluator, "EVALUATION_CHUNK_SIZE", 8)
+
+
+def _results(count, trust_score=0.9):
+    return [
+        {**make_result(f"https://www.nature.com/articles/{i:02d}", f"자료-{i:02d}"), "trust_score": trust_score}
+        for i in range(count)
+    ]
+
+
+def _state(iteration=2):
+    return {"topic": "AI 반도체 시장", "search_scope": "global", "iteration_count": iteration}
+
+
+def _reviews(*indexes):
+    return AIMessage(content=json.dumps({"individual_reviews": [
+        {"index": index, "relevance": "high", "quality": "medium", "comment": f"자료 {index}"}
+        for index in indexes
+    ]}))
+
+
+def test_map_inputs_splits_results_into_numbered_chunks():
+    results = _results(20)
+
+    chunks, inputs = _map_inputs(_state(), results)
+
+    assert [len(chunk) for chunk in chunks] == [8, 8, 4]
+    assert [result for chunk in chunks for result in chunk] == results
+    for chunk, prompt_input in zip(chunks, inputs):
+        summary = prompt_input["results_summary"]
+        assert prompt_input["topic"] == "AI 반도체 시장"
+        # 번호는 묶음마다 1부터 시작하고 모든 자료가 들어감
+        for index, result in enumerate(chunk, start=1):
+            assert f"[{index}] [신뢰도: 0.90] {result['title']}" in summary
+        assert f"[{len(chunk) + 1}]" not in summary
+
+
+def test_map_inputs_without_results_makes_no_chunks():
+    assert _map_inputs(_state(), []) == ([], [])
+
+
+def test_collect_reviews_skips_failed_and_malformed_chunks():
+    chunks = [_results(3), _results(11)[3:6], _results(11)[6:9]]
+
+    reviews = _collect_reviews(_state(), chunks, [
+        _reviews(1, 3, 0, 4, "x"),
+        RuntimeError("rate limited"),
+        AIMessage(content="JSON이 아닌 응답"),
+    ])
+
+    assert set(reviews) == {review_key(chunks[0][0]), review_key(chunks[0][2])}
+    review = reviews[review_key(chunks[0][2])]
+    assert review["title"] == "자료-02"
+    assert review["quality"] == "medium"
+    assert review["iteration"] == 2
+
+
+def test_collect_reviews_reads_fenced_json():
+    chunk = _results(2)
+    response = AIMessage(content="```json\n" + _reviews(2).content + "\n```")
+
+    assert list(_collect_reviews(_state(), [chunk], [response])) == [review_key(chunk[1])]
+
+
+def test_finish_evaluation_parses_response_and_normalizes_keywords():
+    response = AIMessage(content=json.dumps({
+        "is_sufficient": False,
+        "reason": "시장 규모 자료가 없습니다.",
+        "missing_info": "시장 규모",
+        "recommended_keywords": "시장 규모, HBM 점유율 ,",
+    }))
+
+    decision = _finish_evaluation(_state(), response, {"k": {}}, EvidenceStats.from_results(_results(6)))
+
+    assert decision == {
+        "evaluation": "insufficient",
+        "evaluation_reason": "시장 규모 자료가 없습니다.",
+        "missing_info": "시장 규모",
+        "recommended_keywords": ["시장 규모", "HBM 점유율"],
+        "source_reviews": {"k": {}},
+    }
+
+
+@pytest.mark.parametrize("response", [RuntimeError("timeout"), AIMessage(content="not json")], ids=["error", "bad_json"])
+@pytest.mark.parametrize("count, iteration, expected", [
+    (6, 2, "sufficient"),
+    (3, 2, "insufficient"),
+    (3, 3, "sufficient"),
+])
+def test_finish_evaluation_falls_back_to_basic_conditions(response, count, iteration, expected):
+    reviews = {"k": {"quality": "high"}}
+
+    decision = _finish_evaluation(_state(iteration), response, reviews, EvidenceStats.from_results(_results(count)))
+
+    assert decision["evaluation"] == expected
+    assert decision["evaluation_reason"] == ("기본 조건 충족" if expected == "sufficient" else "자료 부족")
+    # 폴백이어도 map 단계에서 받은 자료별 평가는 유지
+    assert decision["source_reviews"] == reviews
+
+
+def _fail_second_chunk(prompt):
+    if "individual_reviews" in prompt and "자료-10" in prompt:
+        raise RuntimeError("chunk failed")
+    return default_respond(prompt)
+
+
+@pytest.mark.parametrize("evaluate", [
+    evaluate_with_llm,
+    lambda *args: asyncio.run(aevaluate_with_llm(*args)),
+], ids=["sync", "async"])
+def test_failed_chunk_keeps_reviews_from_other_chunks(use_llm, evaluate):
+    llm = use_llm(FakeChatModel(respond=_fail_second_chunk))
+    results = _results(20)
+
+    decision = evaluate(_state(), results, EvidenceStats.from_results(results))
+
+    assert len(llm.map_prompts()) == 3
+    assert decision["evaluation"] == "sufficient"
+    expected = results[:8] + results[16:]
+    assert set(decision["source_reviews"]) == {review_key(result) for result in expected}
+
+    # reduce에는 평가를 받은 자료만 들어감
+    (reduce_prompt,) = llm.reduce_prompts()
+    assert "평가된 자료 12개" in reduce_prompt
+    assert "자료-10" not in reduce_prompt
+
+
+@pytest.mark.parametrize("evaluate", [
+    evaluate_with_llm,
+    lambda *args: asyncio.run(aevaluate_with_llm(*args)),
+], ids=["sync", "async"])
+def test_reduce_failure_falls_back_with_map_reviews(use_llm, evaluate):
+    def fail_reduce(prompt):
+        if "individual_reviews" in prompt:
+            return default_respond(prompt)
+        raise RuntimeError("reduce failed")
+
+    use_llm(FakeChatModel(respond=fail_reduce))
+    results = _results(7)
+
+    decision = evaluate(_state(), results, EvidenceStats.from_results(results))
+
+    assert decision["evaluation"] == "sufficient"
+    assert decision["evaluation_reason"] == "기본 조건 충족"
+    assert len(decision["source_reviews"]) == 7
+
+
+def test_second_iteration_reviews_only_new_sources(use_llm, monkeypatch):
+    monkeypatch.setattr(info_evaluator, "COVERAGE_PRECHECK", False)
+    llm = use_llm(FakeChatModel())
+    results = _results(12)
+    first_results, second_results = results[:8], results[4:]
+
+    state = {**_state(2), "search_results": merge_search_results(None, first_results), "source_reviews": {}}
+    first = evaluate_information(state)
+    state = {
+        **state,
+        "iteration_count": 3,
+        "search_results": merge_search_results(state["search_results"], second_results),
+        "source_reviews": merge_source_reviews(state["source_reviews"], first["source_reviews"]),
+    }
+    first_map_count = len(llm.map_prompts())
+    second = evaluate_information(state)
+
+    # 두 번째 평가의 map 묶음에는 이번 반복에 새로 들어온 자료만 포함
+    (second_map,) = llm.map_prompts()[first_map_count:]
+    for result in results[8:]:
+        assert result["title"] in second_map
+    for result in first_results:
+        assert result["title"] not in second_map
+    assert set(second["source_reviews"]) == {review_key(result) for result in results[8:]}
+
+    # reduce는 재사용한 평가까지 합쳐 전체 자료를 봄
+    assert "평가된 자료 12개" in llm.reduce_prompts()[-1]
@@ -0,0 +1,106 @@
+"""
+문단 색인(PassageIndex)과 섹션별 근거(format_evidence) 테스트
+"""
+
+import pytest
+
+from src.utils.passage_index import PassageIndex, format_evidence, get_passage_index
+from src.utils.result_store import merge_search_results
+from src.utils.text_tokenizer import estimate_tokens
+
+QUERIES = ["배터리 재활용 시장", "battery recycling cost", "정책 지원", "전망", "없는 단어 zzz"]
+
+
+def _result(url, trust, sentences):
+    return {"title": url, "url": url, "content": " ".join(sentences), "trust_score": trust}
+
+
+FIRST = [
+    _result("https://a.com/1", 0.9, ["배터리 재활용 시장은 빠르게 성장하고 있다.", "Battery recycling cost fell by 20 percent."] * 4),
+    _result("https://b.com/2", 0.6, ["정부는 배터리 재활용 기업에 대한 정책 지원을 확대했다.", "지원 규모는 내년에 두 배가 된다."] * 3),
+]
+SECOND = [
+    _result("https://c.com/3", 0.8, ["전문가들은 배터리 재활용 시장의 전망을 밝게 본다.", "Recycling plants are expanding in Europe."] * 3),
+    _result("https://d.com/4", 0.4, ["여행지 추천과 맛집 정보를 정리했다."] * 5),
+]
+
+
+def _ranking(index, query):
+    # 같은 점수끼리의 순서는 색인 순서에 따르므로 비교할 때는 정렬
+    return sorted((item["result"]["url"], item["position"], item["passage"], item["score"])
+                  for item in index.search(query, k=100))
+
+
+@pytest.mark.parametrize("hashing", [False, True])
+def test_incremental_sync_matches_rebuild(hashing):
+    store = merge_search_results(None, FIRST)
+    index = PassageIndex(hashing=hashing)
+    index.sync(store)
+    index.search("배터리")  # 해시 행렬을 만든 뒤에도 추가가 반영되는지 확인
+
+    merged = merge_search_results(store, SECOND)
+    assert index.sync(merged) == len(SECOND)
+
+    rebuilt = PassageIndex(hashing=hashing)
+    rebuilt.sync(merged)
+
+    assert len(index) == len(rebuilt)
+    for query in QUERIES:
+        assert _ranking(index, query) == _ranking(rebuilt, query)
+
+
+def test_replaced_results_are_removed_from_index():
+    store = merge_search_results(None, FIRST)
+    index = get_passage_index(store)
+    stale = store[0]
+
+    better = dict(stale, url="https://www.a.com/1/", trust_score=1.0)
+    merged = merge_search_results(store, [better])
+    index = get_passage_index(merged)
+
+    rebuilt = PassageIndex()
+    rebuilt.sync(merged)
+    urls = {item["result"]["url"] for item in index.search("배터리 재활용", k=100)}
+
+    assert stale["url"] not in urls
+    assert better["url"] in urls
+    assert len(index) == len(rebuilt)
+
+
+def test_index_is_cached_on_store_and_skips_unchanged_versions():
+    store = merge_search_results(None, FIRST)
+    index = get_passage_index(store)
+
+    assert get_passage_index(store) is index
+    assert index.sync(store) == 0
+
+
+def test_search_ranks_relevant_passages_first():
+    index = PassageIndex()
+    index.sync(FIRST + SECOND)
+
+    top = index.search("battery recycling cost", k=3)
+
+    assert top[0]["result"]["url"] == "https://a.com/1"
+    assert [item["score"] for item in top] == sorted((item["score"] for item in top), reverse=True)
+    assert index.search("없는 단어 zzz") == []
+    assert index.search("") == []
+
+
+def test_format_evidence_uses_store_numbers_and_budget():
+    store = merge_search_results(None, FIRST + SECOND)
+    index = get_passage_index(store)
+    groups = [("시장 전망", index.search("배터리 재활용 시장 전망", k=5)),
+              ("정책", index.search("정책 지원", k=5)),
+              ("없음", [])]
+
+    evidence = format_evidence(store, groups, budget=200)
+    body, sources = evidence.split("[Sources]")
+
+    assert evidence.startswith("[Evidence]")
+    assert "### 없음" not in evidence
+    assert estimate_tokens(body) <= 200 + 10  # "[Evidence]" 머리말과 묶음 사이 줄바꿈
+    for number, result in enumerate(store, 1):
+        cited = f"[{number}] {result['title']} - {result['url']}" in sources
+        assert cited == (f"- [{number}] " in body)
+    assert format_evidence(store, [("없음", [])], budget=200) == ""
@@ -0,0 +1,104 @@
+"""
+반복 간 중복 쿼리 제외와 쿼리 기록 테스트
+"""
+
+import asyncio
+
+from conftest import FakeSearchProvider, make_result
+from src.nodes.web_searcher import asearch_web, search_web
+from src.utils.query_dedup import filter_redundant_queries, jaccard, query_shingles
+
+
+def test_queries_similar_to_history_are_skipped():
+    kept, skipped = filter_redundant_queries(
+        ["AI 반도체 시장 전망", "ai반도체  시장전망", "전기차 배터리 재활용"],
+        ["AI 반도체 시장 전망 "],
+    )
+
+    assert kept == ["전기차 배터리 재활용"]
+    assert [item["query"] for item in skipped] == ["AI 반도체 시장 전망", "ai반도체  시장전망"]
+    assert all(item["similar_to"] == "AI 반도체 시장 전망 " for item in skipped)
+    assert all(item["similarity"] == 1.0 for item in skipped)
+
+
+def test_near_duplicates_within_one_batch_are_skipped():
+    kept, skipped = filter_redundant_queries(
+        ["electric vehicle battery recycling", "Electric-vehicle battery recycling!", "solid state battery"],
+        [],
+    )
+
+    assert kept == ["electric vehicle battery recycling", "solid state battery"]
+    assert skipped[0]["similar_to"] == "electric vehicle battery recycling"
+
+
+def test_threshold_controls_what_counts_as_duplicate():
+    query, previous = "AI 반도체 시장 전망 2025", "AI 반도체 시장 전망"
+    similarity = jaccard(query_shingles(query), query_shingles(previous))
+
+    assert filter_redundant_queries([query], [previous], threshold=similarity)[0] == []
+    assert filter_redundant_queries([query], [previous], threshold=similarity + 0.01)[0] == [query]
+
+
+def _state(queries, history=None):
+    return {
+        "topic": "테스트",
+        "search_queries": queries,
+        "search_results": [],
+        "iteration_count": 1,
+        "query_history": history or [],
+        "skipped_queries": [],
+    }
+
+
+def test_only_searched_queries_enter_history(use_provider):
+    use_provider(FakeSearchProvider({
+        "ok query": [make_result("https://www.nature.com/a")],
+        "empty query": [],
+        "fail query": ValueError("bad request"),
+        "timeout query": TimeoutError("slow"),
+    }))
+
+    update = search_web(_state(["ok query", "empty query", "fail query", "timeout query"], ["old query"]))
+
+    assert update["query_history"] == ["old query", "ok query", "empty query"]
+
+    # 실패한 쿼리는 다음 반복에서 다시 검색됨
+    kept, _ = filter_redundant_queries(["fail query", "ok query"], update["query_history"])
+    assert kept == ["fail query"]
+
+
+def test_async_search_records_only_searched_queries(use_provider):
+    use_provider(FakeSearchProvider({
+        "ok query": [make_result("https://www.nature.com/a")],
+        "fail query": ValueError("bad request"),
+    }))
+
+    update = asyncio.run(asearch_web(_state(["ok query", "fail query"])))
+
+    assert update["query_history"] == ["ok query"]
+
+
+def test_skipped_queries_are_logged_per_iteration(use_provider):
+    provider = use_provider(FakeSearchProvider())
+    state = _state(["AI 반도체 시장 전망", "AI반도체 시장전망", "새 쿼리"], ["ai 반도체 시장 전망"])
+    state["iteration_count"] = 2
+    state["skipped_queries"] = [{"iteration": 1, "skipped_count": 0, "skipped": []}]
+
+    update = search_web(state)
+
+    assert provider.started == ["새 쿼리"]
+    log = update["skipped_queries"]
+    assert log[0] == {"iteration": 1, "skipped_count": 0, "skipped": []}
+    assert log[1]["iteration"] == 2
+    assert log[1]["skipped_count"] == 2
+    assert {item["query"] for item in log[1]["skipped"]} == {"AI 반도체 시장 전망", "AI반도체 시장전망"}
+
+
+def test_all_duplicate_queries_skip_search(use_provider):
+    provider = use_provider(FakeSearchProvider())
+
+    update = search_web(_state(["AI 반도체"], ["ai 반도체"]))
+
+    assert provider.started == []
+    assert "search_results" not in update
+    assert update["skipped_queries"][-1]["skipped_count"] == 1
@@ -0,0 +1,91 @@
+"""
+토큰 버킷 속도 제한 테스트
+"""
+
+import asyncio
+import time
+
+from src.utils import rate_limiter
+from src.utils.rate_limiter import (
+    SQLiteTokenBucket,
+    TokenBucket,
+    get_llm_rate_limiter,
+    get_search_rate_limiter,
+)
+
+
+def test_burst_up_to_capacity_then_refuses_without_blocking():
+    bucket = TokenBucket("test", rate=0.01, capacity=3)
+
+    assert [bucket.acquire(blocking=False) for _ in range(4)] == [True, True, True, False]
+    assert bucket.stats()["acquired"] == 3
+
+
+def test_blocking_acquire_waits_for_refill():
+    bucket = TokenBucket("test", rate=20, capacity=1)
+    bucket.acquire()
+
+    started = time.monotonic()
+    assert bucket.acquire() is True
+    waited = time.monotonic() - started
+
+    assert 0.03 < waited < 0.5
+    assert bucket.stats()["throttled"] == 1
+
+
+def test_async_acquire_waits_without_blocking_the_loop():
+    bucket = TokenBucket("test", rate=20, capacity=1)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        assert await bucket.aacquire() is True
+        assert await bucket.aacquire() is True
+        assert await bucket.aacquire(blocking=False) is False
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(scenario()) > 3
+
+
+def test_sqlite_buckets_share_one_limit(tmp_path):
+    path = str(tmp_path / "limits.sqlite3")
+    first = SQLiteTokenBucket("search.tavily", rate=0.01, capacity=2, path=path)
+    second = SQLiteTokenBucket("search.tavily", rate=0.01, capacity=2, path=path)
+    other = SQLiteTokenBucket("llm.model", rate=0.01, capacity=2, path=path)
+
+    assert first.acquire(blocking=False) is True
+    assert second.acquire(blocking=False) is True
+    assert first.acquire(blocking=False) is False
+    assert asyncio.run(second.aacquire(blocking=False)) is False
+    assert other.acquire(blocking=False) is True
+
+
+def test_limits_are_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_buckets", {})
+    for name in ("RATE_LIMIT_TAVILY_RPM", "RATE_LIMIT_LLM_RPM", "RATE_LIMIT_LLM_RPM__TEST_MODEL"):
+        monkeypatch.delenv(name, raising=False)
+
+    assert get_search_rate_limiter("tavily") is None
+    assert get_llm_rate_limiter("test-model") is None
+
+
+def test_configured_limits_return_shared_buckets(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_buckets", {})
+    monkeypatch.delenv("RATE_LIMIT_STORE", raising=False)
+    monkeypatch.setenv("RATE_LIMIT_TAVILY_RPM", "120")
+    monkeypatch.setenv("RATE_LIMIT_LLM_RPM", "60")
+    monkeypatch.setenv("RATE_LIMIT_LLM_RPM__TEST_MODEL", "30")
+
+    bucket = get_search_rate_limiter("tavily")
+    assert bucket is get_search_rate_limiter("tavily")
+    assert bucket.rate == 2
+    assert get_llm_rate_limiter("test-model").bucket.rate == 0.5
+    assert get_llm_rate_limiter("other-model").bucket.rate == 1
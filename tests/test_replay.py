@@ -0,0 +1,79 @@
+"""
+기록(record) → 재생(replay) 왕복 테스트
+검색 완료 순서가 기록 때와 달라도 같은 프롬프트가 만들어져 카세트에서 응답을 찾아야 합니다.
+"""
+
+import time
+
+import pytest
+
+from conftest import FakeChatModel, FakeSearchProvider, make_result
+from src.nodes import info_evaluator
+from src.nodes.info_evaluator import evaluate_information
+from src.nodes.web_searcher import search_web
+from src.utils import llm_config, search_client
+from src.utils.replay import Cassette, use_cassette
+from src.utils.result_store import merge_search_results
+
+QUERIES = ["first query", "second query", "third query"]
+
+
+@pytest.fixture
+def offline_backends(monkeypatch):
+    """기록 모드에서 실제 Tavily/Gemini 대신 가짜 클라이언트를 감싸도록 설정"""
+    monkeypatch.setenv("TAVILY_API_KEY", "test-key")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.delenv("SEARCH_PROVIDER", raising=False)
+    monkeypatch.delenv("SEARCH_CACHE_ENABLED", raising=False)
+    monkeypatch.setattr(info_evaluator, "COVERAGE_PRECHECK", False)
+    monkeypatch.setattr(llm_config, "ChatGoogleGenerativeAI", FakeChatModel)
+
+    # 같은 신뢰도(nature.com)의 결과만 돌려주므로 순서는 병합 순서로만 정해짐
+    inner = FakeSearchProvider(
+        {query: [make_result(f"https://www.nature.com/{i}/{j}", f"{query} {j}") for j in range(3)]
+         for i, query in enumerate(QUERIES)},
+        # 기록 때는 첫 쿼리가 가장 늦게 끝남
+        delays={query: 0.03 * (len(QUERIES) - i) for i, query in enumerate(QUERIES)},
+    )
+    monkeypatch.setattr(search_client, "get_pooled_client", lambda *args, **kwargs: inner)
+    return monkeypatch
+
+
+def _run():
+    state = {
+        "topic": "테스트 주제",
+        "search_scope": "global",
+        "search_queries": QUERIES,
+        "search_results": [],
+        "iteration_count": 2,
+        "query_history": [],
+        "skipped_queries": [],
+    }
+    update = search_web(state)
+    state = {**state, **update, "search_results": merge_search_results(None, update["search_results"])}
+    return [result["url"] for result in state["search_results"]], evaluate_information(state)
+
+
+def test_replay_reproduces_recorded_run_regardless_of_completion_order(offline_backends, tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+
+    with use_cassette("record", path):
+        recorded_urls, recorded = _run()
+
+    # 재생 때는 반대로 첫 쿼리가 가장 먼저 끝나도록 지연
+    def sleep_for(self, entry):
+        request = entry["request"]
+        if entry["kind"] == "search":
+            time.sleep(0.03 * (QUERIES.index(request["query"]) + 1))
+
+    offline_backends.setattr(Cassette, "sleep_for", sleep_for)
+
+    with use_cassette("replay", path, latency="0") as cassette:
+        replayed_urls, replayed = _run()
+
+    assert recorded["evaluation"] == "sufficient"
+    assert recorded["evaluation_reason"] == "충분합니다."
+    assert len(recorded["source_reviews"]) == 9
+    assert replayed_urls == recorded_urls
+    assert replayed == recorded
+    assert sum(len(entries) for entries in cassette._entries.values()) == len(QUERIES) + 3  # 검색 3 + map 2 + reduce 1
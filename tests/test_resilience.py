@@ -0,0 +1,176 @@
+"""
+제한 시간/재시도/헤지/서킷 브레이커 테스트
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    acall_with_resilience,
+    attempt_time_left,
+    call_with_resilience,
+)
+
+
+class Flaky:
+    """처음 failures번은 예외를 던지고 이후에는 "ok"를 반환하는 호출"""
+
+    def __init__(self, failures, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("boom")
+        return "ok"
+
+
+def _fail(breaker, error=ConnectionError):
+    with pytest.raises(error):
+        call_with_resilience(Flaky(1, error), "test", retries=0, breaker=breaker,
+                             is_retryable=lambda e: isinstance(e, ConnectionError))
+
+
+def test_breaker_opens_after_threshold_and_closes_after_successful_trial():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+
+    _fail(breaker)
+    assert breaker.state == "closed"
+    _fail(breaker)
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        call_with_resilience(lambda: "ok", "test", breaker=breaker)
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert call_with_resilience(lambda: "ok", "test", breaker=breaker) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_failed_trial_reopens_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    _fail(breaker)
+    time.sleep(0.06)
+
+    _fail(breaker)
+
+    assert breaker.state == "open"
+
+
+def test_half_open_allows_a_single_trial():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.release()
+    assert breaker.allow() is True
+
+
+def test_non_retryable_errors_do_not_trip_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+
+    for _ in range(3):
+        _fail(breaker, ValueError)
+
+    assert breaker.state == "closed"
+
+
+def test_non_retryable_trial_releases_half_open_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    _fail(breaker, ValueError)
+
+    assert breaker.state == "half_open"
+    assert breaker.allow() is True
+
+
+def test_retries_until_success():
+    flaky = Flaky(2)
+
+    assert call_with_resilience(flaky, "test", retries=2, base_delay=0) == "ok"
+    assert flaky.calls == 3
+
+
+def test_gives_up_after_retries_and_skips_non_retryable():
+    flaky = Flaky(5)
+    with pytest.raises(ConnectionError):
+        call_with_resilience(flaky, "test", retries=2, base_delay=0)
+    assert flaky.calls == 3
+
+    invalid = Flaky(5, ValueError)
+    with pytest.raises(ValueError):
+        call_with_resilience(invalid, "test", retries=2, base_delay=0,
+                             is_retryable=lambda e: not isinstance(e, ValueError))
+    assert invalid.calls == 1
+
+
+def test_timeout_raises_and_exposes_attempt_deadline():
+    seen = []
+    release = threading.Event()
+
+    def slow():
+        seen.append(attempt_time_left(60))
+        release.wait(1)
+        return "late"
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        call_with_resilience(slow, "test", timeout=0.1, retries=0)
+    release.set()
+
+    assert time.monotonic() - started < 0.5
+    assert 0 < seen[0] <= 0.1
+    assert attempt_time_left(60) == 60
+
+
+def test_hedge_returns_first_response():
+    calls = []
+
+    def sometimes_slow():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    assert call_with_resilience(sometimes_slow, "test", timeout=2, hedge_after=0.05, retries=0) == "fast"
+    assert len(calls) == 2
+
+
+def test_async_retries_timeout_and_hedge():
+    async def scenario():
+        flaky = Flaky(1)
+
+        async def attempt():
+            return flaky()
+
+        assert await acall_with_resilience(attempt, "test", retries=1, base_delay=0) == "ok"
+
+        async def hang():
+            await asyncio.sleep(1)
+
+        with pytest.raises(TimeoutError):
+            await acall_with_resilience(hang, "test", timeout=0.05, retries=0)
+
+        calls = []
+
+        async def sometimes_slow():
+            calls.append(None)
+            await asyncio.sleep(0.5 if len(calls) == 1 else 0)
+            return len(calls)
+
+        assert await acall_with_resilience(sometimes_slow, "test", timeout=2, hedge_after=0.05, retries=0) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,137 @@
+"""
+신뢰도 순 검색 결과 저장소와 reducer 테스트
+"""
+
+import copy
+import pickle
+
+import pytest
+
+from src.utils.result_store import ResultStore, merge_search_results
+
+
+def _result(url, trust, content=""):
+    return {"url": url, "title": url, "content": content, "trust_score": trust}
+
+
+def test_results_stay_sorted_by_trust_with_ties_in_insertion_order():
+    store = ResultStore()
+    store.add_many([
+        _result("https://a.com/1", 0.5),
+        _result("https://b.com/1", 0.9),
+        _result("https://c.com/1", 0.5),
+        _result("https://d.com/1", 0.7),
+    ])
+
+    assert [result["url"] for result in store] == [
+        "https://b.com/1", "https://d.com/1", "https://a.com/1", "https://c.com/1",
+    ]
+    assert store.top_n(2) == [store[0], store[1]]
+
+
+def test_incremental_adds_match_a_full_sort():
+    trusts = [0.3, 0.8, 0.5, 0.8, 0.1, 0.5, 0.95, 0.3]
+    results = [_result(f"https://site{i}.com/", trust) for i, trust in enumerate(trusts)]
+
+    store = ResultStore()
+    for result in results:
+        store.add(result)
+
+    assert list(store) == sorted(results, key=lambda result: -result["trust_score"])
+
+
+def test_duplicate_replaces_only_when_trust_is_higher():
+    store = ResultStore([_result("https://a.com/page", 0.6)])
+    version = store.version
+
+    assert store.add(_result("http://www.a.com/page/", 0.4)) is False
+    assert store.version == version
+    assert store[0]["trust_score"] == 0.6
+
+    better = _result("https://m.a.com/page?utm_source=feed", 0.9)
+    assert store.add(better) is True
+    assert store.version == version + 1
+    assert len(store) == 1
+    assert store[0] is better
+    assert store.find(_result("https://a.com/page", 0)) is better
+    assert store.contains(_result("https://a.com/other", 0)) is False
+
+
+def test_copy_is_independent():
+    store = ResultStore([_result("https://a.com/", 0.5)])
+    clone = store.copy()
+    clone.add(_result("https://b.com/", 0.9))
+
+    assert len(store) == 1
+    assert [result["url"] for result in clone] == ["https://b.com/", "https://a.com/"]
+    assert clone.version == store.version + 1
+
+
+def test_reducer_does_not_mutate_previous_state():
+    previous = merge_search_results(None, [_result("https://a.com/", 0.5)])
+    snapshot = list(previous)
+    version = previous.version
+
+    merged = merge_search_results(previous, [_result("https://b.com/", 0.9), _result("https://www.a.com/", 0.7)])
+
+    assert merged is not previous
+    assert list(previous) == snapshot
+    assert previous.version == version
+    assert [result["url"] for result in merged] == ["https://b.com/", "https://www.a.com/"]
+
+
+def test_reducer_accepts_plain_lists_and_empty_updates():
+    previous = merge_search_results([_result("https://a.com/", 0.5)], None)
+
+    assert isinstance(previous, ResultStore)
+    assert merge_search_results(previous, []) is previous
+    assert merge_search_results(previous, previous) is previous
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda store: store.append(_result("https://x.com/", 0.1)),
+    lambda store: store.extend([_result("https://x.com/", 0.1)]),
+    lambda store: store.insert(0, _result("https://x.com/", 0.1)),
+    lambda store: store.remove(store[0]),
+    lambda store: store.pop(),
+    lambda store: store.clear(),
+    lambda store: store.sort(key=lambda result: result["url"]),
+    lambda store: store.reverse(),
+    lambda store: store.__setitem__(0, _result("https://x.com/", 0.1)),
+    lambda store: store.__delitem__(0),
+    lambda store: store.__iadd__([_result("https://x.com/", 0.1)]),
+    lambda store: store.__imul__(2),
+])
+def test_list_mutation_is_rejected(mutate):
+    store = ResultStore([_result("https://a.com/", 0.5), _result("https://b.com/", 0.9)])
+    before, version = list(store), store.version
+
+    with pytest.raises(TypeError, match="add"):
+        mutate(store)
+
+    assert list(store) == before
+    assert store.version == version
+
+
+def test_augmented_assignment_is_rejected():
+    store = ResultStore([_result("https://a.com/", 0.5)])
+
+    with pytest.raises(TypeError):
+        store += [_result("https://b.com/", 0.9)]
+
+
+def test_read_only_list_operations_still_work():
+    store = ResultStore([_result("https://a.com/", 0.5), _result("https://b.com/", 0.9)])
+
+    assert [result["url"] for result in store[:1]] == ["https://b.com/"]
+    assert len(store + [_result("https://c.com/", 0.1)]) == 3
+    assert store.index(store[1]) == 1
+
+
+def test_deepcopy_and_pickle_rebuild_the_store():
+    store = ResultStore([_result("https://a.com/", 0.5), _result("https://b.com/", 0.9)])
+
+    for clone in (copy.deepcopy(store), pickle.loads(pickle.dumps(store))):
+        assert isinstance(clone, ResultStore)
+        assert [result["url"] for result in clone] == [result["url"] for result in store]
+        assert clone.add(_result("http://www.a.com/", 0.4)) is False
@@ -0,0 +1,119 @@
+"""
+검색 클라이언트의 프로세스 전역 동시 실행 제한 테스트
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils import search_client
+from src.utils.search_client import asearch, search_with_resilience
+
+
+class CountingClient:
+    """동시에 진행 중인 요청 수의 최댓값을 기록하는 가짜 검색 클라이언트"""
+
+    name = "counting"
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    def _enter(self):
+        with self.lock:
+            self.active += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.active)
+
+    def _exit(self):
+        with self.lock:
+            self.active -= 1
+
+    def search(self, query, **kwargs):
+        self._enter()
+        try:
+            time.sleep(self.delay)
+            return {"query": query, "results": []}
+        finally:
+            self._exit()
+
+    async def asearch(self, query, **kwargs):
+        self._enter()
+        try:
+            await asyncio.sleep(self.delay)
+            return {"query": query, "results": []}
+        finally:
+            self._exit()
+
+
+@pytest.fixture
+def two_slots(monkeypatch):
+    monkeypatch.setattr(search_client, "_search_slots", threading.BoundedSemaphore(2))
+
+
+def _run_loop(client, count):
+    async def job():
+        await asyncio.gather(*(asearch(f"async {i}", client=client) for i in range(count)))
+    asyncio.run(job())
+
+
+def test_sync_and_async_callers_share_one_limit(two_slots):
+    client = CountingClient()
+
+    # 스레드별 이벤트 루프 2개 + 동기 호출 스레드들을 동시에 실행
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(_run_loop, client, 4) for _ in range(2)]
+        futures += [executor.submit(search_with_resilience, f"sync {i}", client=client) for i in range(4)]
+        for future in futures:
+            future.result()
+
+    assert client.calls == 12
+    assert client.peak == 2
+
+
+def test_slot_is_released_after_failure(two_slots):
+    class FailingClient(CountingClient):
+        def search(self, query, **kwargs):
+            raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        search_with_resilience("q", client=FailingClient())
+
+    assert search_client._search_slots.acquire(blocking=False)
+    assert search_client._search_slots.acquire(blocking=False)
+
+
+def test_cancelled_async_waiter_does_not_leak_slot(two_slots):
+    client = CountingClient(delay=0.2)
+
+    async def scenario():
+        holders = [asyncio.ensure_future(asearch(f"hold {i}", client=client)) for i in range(2)]
+        await asyncio.sleep(0.02)
+        waiter = asyncio.ensure_future(asearch("waiter", client=client))
+        await asyncio.sleep(0.02)
+        waiter.cancel()
+        await asyncio.gather(*holders)
+
+    asyncio.run(scenario())
+
+    assert client.calls == 2
+    assert search_client._search_slots.acquire(blocking=False)
+    assert search_client._search_slots.acquire(blocking=False)
+
+
+def test_sync_slot_wait_counts_toward_attempt_timeout(two_slots):
+    search_client._search_slots.acquire()
+    search_client._search_slots.acquire()
+    try:
+        with pytest.raises(TimeoutError):
+            with search_client.search_slot(timeout=0.05):
+                pass
+    finally:
+        search_client._search_slots.release()
+        search_client._search_slots.release()
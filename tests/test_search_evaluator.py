@@ -0,0 +1,169 @@
+"""
+파이프라인 검색/평가 노드 테스트 (조기 판정, 선행 평가 재사용/재평가, 취소된 쿼리 기록)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from conftest import FakeChatModel, FakeSearchProvider, default_respond, make_result
+from src.nodes import info_evaluator, search_evaluator
+from src.nodes.search_evaluator import asearch_and_evaluate, search_and_evaluate
+from src.utils import search_policy
+from src.utils.result_store import merge_search_results
+
+
+RUNNERS = pytest.mark.parametrize("run", [
+    search_and_evaluate,
+    lambda state: asyncio.run(asearch_and_evaluate(state)),
+], ids=["sync", "async"])
+
+
+def respond_insufficient(prompt: str) -> str:
+    """자료별 평가는 기본 응답, 충분성 판단은 부족"""
+    if "individual_reviews" in prompt:
+        return default_respond(prompt)
+    return json.dumps({
+        "is_sufficient": False,
+        "reason": "부족합니다.",
+        "missing_info": "시장 규모",
+        "recommended_keywords": ["시장 규모"],
+    })
+
+
+@pytest.fixture
+def pipeline(use_provider, use_llm, monkeypatch):
+    """가짜 검색 제공자/채팅 모델로 노드를 실행 (커버리지 사전 판정 없이 항상 LLM 경로)"""
+    monkeypatch.setattr(info_evaluator, "COVERAGE_PRECHECK", False)
+    monkeypatch.setenv("SEARCH_ADAPTIVE", "false")
+
+    def install(responses, delays=None, respond=default_respond):
+        provider = use_provider(FakeSearchProvider(responses, delays))
+        llm = use_llm(FakeChatModel(respond=respond))
+        return provider, llm
+
+    return install
+
+
+def _state(queries, iteration, results=()):
+    return {
+        "topic": "AI 반도체 시장",
+        "search_scope": "global",
+        "search_queries": queries,
+        "search_results": merge_search_results(None, list(results)),
+        "iteration_count": iteration,
+        "query_history": [],
+        "skipped_queries": [],
+    }
+
+
+def _trusted(url, title, trust_score):
+    return {**make_result(url, title), "trust_score": trust_score}
+
+
+def _existing_results():
+    """저비용 조건을 모두 통과하는 기존 결과 6개"""
+    return [
+        _trusted(f"https://www.nature.com/existing/{i}", f"기존 자료 {i}", 0.9) for i in range(3)
+    ] + [
+        _trusted(f"https://news.naver.com/existing/{i}", f"기존 뉴스 {i}", 0.8) for i in range(3)
+    ]
+
+
+def _urls(update):
+    return [result["url"] for result in update["search_results"]]
+
+
+@RUNNERS
+def test_early_verdict_cancels_only_unstarted_searches(pipeline, monkeypatch, run):
+    # 노드별 동시 검색 1개, 쿼리당 결과 1개 → 첫 쿼리가 비면 남은 결과로도 결과 수 조건을 채울 수 없음
+    monkeypatch.setattr(search_evaluator, "PARALLEL_SEARCHES", 1)
+    monkeypatch.setattr(search_policy, "DEFAULT_MAX_RESULTS", 1)
+    queries = ["AI 반도체 시장", "전기차 배터리 재활용", "의료 영상 진단", "스마트 팩토리 사례"]
+    provider, llm = pipeline(
+        {queries[1]: [make_result("https://www.nature.com/battery", "배터리 재활용")]},
+        delays={queries[1]: 0.2, queries[2]: 0.2, queries[3]: 0.2},
+    )
+
+    update = run(_state(queries, iteration=2))
+
+    assert update["evaluation"] == "insufficient"
+    assert update["evaluation_decision"]["path"] == "cheap_gate"
+    assert llm.prompts == []
+
+    # 실행 중이던 검색은 끝까지 기다려 결과를 반영하고, 시작 전인 검색은 취소
+    assert sorted(provider.finished) == sorted(provider.started)
+    assert queries[3] not in provider.started
+    assert "https://www.nature.com/battery" in _urls(update)
+
+    # 취소된 쿼리는 다음 반복에서 다시 검색할 수 있도록 기록하지 않음
+    assert update["query_history"] == [query for query in queries if query in provider.finished]
+
+
+@RUNNERS
+def test_iteration_gate_does_not_abandon_pending_searches(pipeline, run):
+    queries = ["AI 반도체 시장", "전기차 배터리 재활용"]
+    provider, llm = pipeline(
+        {
+            queries[0]: [make_result(f"https://www.nature.com/chip/{i}", f"반도체 {i}") for i in range(3)],
+            queries[1]: [make_result(f"https://news.naver.com/battery/{i}", f"배터리 {i}") for i in range(3)],
+        },
+        delays={queries[1]: 0.2},
+    )
+
+    update = run(_state(queries, iteration=1))
+
+    assert update["evaluation"] == "insufficient"
+    assert update["evaluation_reason"] == "반복 횟수가 부족합니다."
+    assert llm.prompts == []
+    assert sorted(provider.finished) == sorted(queries)
+    assert update["query_history"] == queries
+    assert len(_urls(update)) == 6
+
+
+@RUNNERS
+def test_speculative_evaluation_is_reused_when_window_is_unchanged(pipeline, run):
+    queries = ["AI 반도체 시장", "전기차 배터리 재활용"]
+    provider, llm = pipeline(
+        {queries[0]: [make_result("https://www.nature.com/new", "새 자료")], queries[1]: []},
+        delays={queries[1]: 0.2},
+        respond=respond_insufficient,
+    )
+
+    update = run(_state(queries, iteration=2, results=_existing_results()))
+
+    assert update["evaluation"] == "insufficient"
+    assert update["evaluation_decision"]["path"] == "llm_speculative"
+    assert len(llm.map_prompts()) == 1
+    assert len(llm.reduce_prompts()) == 1
+    assert sorted(provider.finished) == sorted(queries)
+    assert update["query_history"] == queries
+
+
+@RUNNERS
+def test_speculative_evaluation_is_redone_for_new_sources_only(pipeline, run):
+    queries = ["AI 반도체 시장", "전기차 배터리 재활용"]
+    provider, llm = pipeline(
+        {
+            queries[0]: [make_result("https://www.nature.com/new", "먼저 온 자료")],
+            queries[1]: [make_result("https://ieeexplore.ieee.org/late", "늦게 온 자료")],
+        },
+        delays={queries[1]: 0.2},
+        respond=respond_insufficient,
+    )
+
+    update = run(_state(queries, iteration=2, results=_existing_results()))
+
+    assert update["evaluation_decision"]["path"] == "llm"
+    map_prompts = llm.map_prompts()
+    assert len(map_prompts) == 2
+    assert "먼저 온 자료" in map_prompts[0] and "늦게 온 자료" not in map_prompts[0]
+    # 다시 평가할 때는 선행 평가에서 받은 자료별 평가를 재사용하므로 새 자료만 보냄
+    assert "늦게 온 자료" in map_prompts[1]
+    assert "먼저 온 자료" not in map_prompts[1] and "기존 자료" not in map_prompts[1]
+    assert len(llm.reduce_prompts()) == 2
+
+    # 두 평가의 자료별 평가가 모두 다음 반복으로 전달됨
+    assert len(update["source_reviews"]) == 8
+    assert "https://ieeexplore.ieee.org/late" in _urls(update)
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from src.utils import search_provider
+from src.utils.search_provider import DEFAULT_LOCAL_CORPUS, LocalSearchProvider
+
+
+DOCUMENTS = [
+    {"title": "AI 반도체 시장 전망", "url": "https://www.nature.com/ai-chip",
+     "content": "AI 반도체 시장은 HBM 메모리와 AI 가속기 수요로 성장하고 있다. " * 30},
+    {"title": "HBM 공급 부족", "url": "https://news.naver.com/hbm",
+     "content": "HBM 메모리 공급이 AI 서버 수요를 따라가지 못하고 있다."},
+    {"title": "반도체 블로그", "url": "https://blog.naver.com/chip",
+     "content": "AI 반도체 용어 정리."},
+    {"title": "전기차 배터리 재활용", "url": "https://www.reuters.com/battery",
+     "content": "전기차 배터리 재활용 산업이 성장하고 있다."},
+]
+
+
+def write_corpus(path, documents):
+    with open(path, "w", encoding="utf-8") as f:
+        for document in documents:
+            f.write(json.dumps(document, ensure_ascii=False) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    return write_corpus(tmp_path / "corpus.jsonl", DOCUMENTS)
+
+
+def urls(response):
+    return [result["url"] for result in response["results"]]
+
+
+def test_ranks_relevant_documents_first_with_normalized_scores(corpus):
+    provider = LocalSearchProvider(corpus)
+
+    response = provider.search("HBM 메모리 공급", max_results=5)
+
+    assert urls(response)[0] == "https://news.naver.com/hbm"
+    assert "https://www.reuters.com/battery" not in urls(response)
+    scores = [result["score"] for result in response["results"]]
+    assert scores[0] == 1.0
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 < score <= 1.0 for score in scores)
+
+
+def test_max_results_limits_response(corpus):
+    provider = LocalSearchProvider(corpus)
+
+    assert len(provider.search("AI 반도체", max_results=1)["results"]) == 1
+
+
+def test_unmatched_query_returns_no_results(corpus):
+    provider = LocalSearchProvider(corpus)
+
+    assert provider.search("양자 컴퓨팅")["results"] == []
+
+
+def test_exclude_domains_covers_subdomains(corpus):
+    provider = LocalSearchProvider(corpus)
+
+    response = provider.search("AI 반도체", max_results=5, exclude_domains=["Naver.com"])
+
+    assert urls(response) == ["https://www.nature.com/ai-chip"]
+
+
+def test_exclude_domains_does_not_match_suffix_of_other_host(tmp_path):
+    corpus = write_corpus(tmp_path / "corpus.jsonl", [
+        {"title": "반도체", "url": "https://notnaver.com/a", "content": "반도체"},
+    ])
+    provider = LocalSearchProvider(corpus)
+
+    assert urls(provider.search("반도체", exclude_domains=["naver.com"])) == ["https://notnaver.com/a"]
+
+
+def test_basic_depth_truncates_content_and_advanced_returns_full_text(corpus):
+    provider = LocalSearchProvider(corpus)
+    full_content = DOCUMENTS[0]["content"]
+
+    basic = provider.search("AI 가속기", max_results=1, search_depth="basic")["results"][0]
+    advanced = provider.search("AI 가속기", max_results=1, search_depth="advanced")["results"][0]
+
+    assert len(full_content) > LocalSearchProvider.BASIC_CONTENT_CHARS
+    assert basic["content"] == full_content[:LocalSearchProvider.BASIC_CONTENT_CHARS]
+    assert advanced["content"] == full_content
+
+
+def test_index_is_written_and_reused(corpus, monkeypatch):
+    first = LocalSearchProvider(corpus)
+    assert os.path.exists(first.index_path)
+
+    def fail_build(self):
+        raise AssertionError("인덱스를 다시 만들면 안 됩니다")
+
+    monkeypatch.setattr(LocalSearchProvider, "_build_index", fail_build)
+    second = LocalSearchProvider(corpus)
+
+    assert second.postings == first.postings
+    assert second.search("HBM 메모리 공급")["results"] == first.search("HBM 메모리 공급")["results"]
+
+
+def test_index_is_rebuilt_after_corpus_changes(corpus):
+    first = LocalSearchProvider(corpus)
+    index_mtime = os.path.getmtime(first.index_path)
+
+    write_corpus(corpus, DOCUMENTS + [
+        {"title": "양자 컴퓨팅", "url": "https://example.org/quantum", "content": "양자 컴퓨팅 기초"},
+    ])
+    os.utime(corpus, (index_mtime + 10, index_mtime + 10))
+
+    second = LocalSearchProvider(corpus)
+
+    assert urls(second.search("양자 컴퓨팅")) == ["https://example.org/quantum"]
+    with open(second.index_path, encoding="utf-8") as f:
+        assert json.load(f)["document_count"] == len(DOCUMENTS) + 1
+
+
+def test_asearch_matches_search(corpus):
+    provider = LocalSearchProvider(corpus)
+
+    response = asyncio.run(provider.asearch("HBM 메모리 공급"))
+
+    assert urls(response) == urls(provider.search("HBM 메모리 공급"))
+
+
+def test_bundled_sample_corpus_is_valid_jsonl():
+    with open(DEFAULT_LOCAL_CORPUS, encoding="utf-8") as f:
+        documents = [json.loads(line) for line in f if line.strip()]
+
+    assert len(documents) >= 10
+    for document in documents:
+        assert document["title"] and document["content"]
+        assert document["url"].startswith("https://")
+
+
+def test_get_search_provider_uses_configured_corpus(tmp_path, monkeypatch):
+    # 저장소 data/ 안에 인덱스 파일이 생기지 않도록 샘플을 복사해서 사용
+    corpus = tmp_path / "sample.jsonl"
+    with open(DEFAULT_LOCAL_CORPUS, encoding="utf-8") as f:
+        corpus.write_text(f.read(), encoding="utf-8")
+
+    monkeypatch.setattr(search_provider, "_providers", {})
+    monkeypatch.setenv("LOCAL_SEARCH_CORPUS", str(corpus))
+
+    provider = search_provider.get_search_provider("local")
+
+    assert isinstance(provider, LocalSearchProvider)
+    assert search_provider.get_search_provider("local") is provider
+    assert provider.search("AI 반도체 HBM", max_results=3)["results"]
@@ -0,0 +1,82 @@
+"""
+토큰 예산 기반 자료 묶음(format_sources) 테스트
+"""
+
+import pytest
+
+from src.utils.result_store import ResultStore
+from src.utils.source_formatter import format_sources, pack_sources, split_passages
+from src.utils.text_tokenizer import estimate_tokens
+
+
+def _content(topic, sentences=12):
+    return " ".join(
+        f"This is sentence {i} about {topic} with enough extra words to fill a realistic passage of text."
+        for i in range(sentences)
+    )
+
+
+def _results():
+    return [
+        {"title": "Battery report", "url": "https://a.com/1", "content": _content("battery recycling"), "trust_score": 0.9},
+        {"title": "Market news", "url": "https://b.com/2", "content": _content("market growth"), "trust_score": 0.8},
+        {"title": "Blog post", "url": "https://c.com/3", "content": _content("travel tips"), "trust_score": 0.4},
+        {"title": "Short note", "url": "https://d.com/4", "content": "Battery recycling rates rose.", "trust_score": 0.5},
+    ]
+
+
+def test_split_passages_respects_passage_size():
+    passages = split_passages(_content("batteries", 20), max_tokens=80)
+
+    assert len(passages) > 1
+    assert all(estimate_tokens(passage) <= 80 for passage in passages)
+    assert " ".join(passages) == " ".join(_content("batteries", 20).split())
+    assert split_passages("") == []
+
+
+@pytest.mark.parametrize("budget", [60, 150, 400, 1000])
+def test_output_stays_within_budget(budget):
+    text = format_sources(_results(), query="battery recycling", budget=budget)
+
+    assert estimate_tokens(text) <= budget
+
+
+def test_packing_is_deterministic_and_keeps_input_order():
+    first = pack_sources(_results(), 300, "battery recycling")
+    second = pack_sources(_results(), 300, "battery recycling")
+
+    assert [(result["url"], passages) for result, passages in first] == \
+           [(result["url"], passages) for result, passages in second]
+    urls = [result["url"] for result, _ in first]
+    assert urls == sorted(urls)
+
+
+def test_relevant_passages_are_preferred():
+    packed = pack_sources(_results(), 150, "battery recycling")
+
+    assert "https://a.com/1" in [result["url"] for result, _ in packed]
+    assert "https://c.com/3" not in [result["url"] for result, _ in packed]
+
+
+def test_cover_all_includes_every_source():
+    results = _results()
+
+    # 자료마다 가장 좋은 문단 하나씩은 들어가는 예산
+    assert len(pack_sources(results, 350, "battery recycling")) < len(results)
+    assert len(pack_sources(results, 350, "battery recycling", cover_all=True)) == len(results)
+
+
+def test_store_caches_by_version_and_invalidates_on_add():
+    store = ResultStore(_results())
+    text = format_sources(store, call_site="evaluator", query="battery")
+
+    assert format_sources(store, call_site="evaluator", query="battery") is text
+    assert format_sources(store, call_site="writer", query="battery") is not text
+
+    store.add({"title": "New paper", "url": "https://e.com/5", "content": _content("battery recycling"),
+               "trust_score": 1.0})
+    updated = format_sources(store, call_site="evaluator", query="battery")
+
+    assert updated != text
+    assert "https://e.com/5" in updated
+    assert all(key[1] == store.version for key in store.derived_cache if key[0] == "sources")